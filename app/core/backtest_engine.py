@@ -257,6 +257,16 @@ class BacktestEngine:
                     logger.debug(f"Skipping order {order_id} - submitted in current tick")
                 continue
             
+            # Resting limit orders outside this bar's range cannot fill, and
+            # most grid levels are out of range on most bars, so reject them
+            # here instead of walking the simulator's full fill path.
+            if order.order_type == OrderType.LIMIT and order.price is not None:
+                if order.action == OrderAction.BUY:
+                    if candle.low > order.price:
+                        continue
+                elif candle.high < order.price:
+                    continue
+
             # Attempt to fill order on this tick
             fill_event = self.order_simulator.simulate_execution(
                 order, candle
@@ -182,23 +182,19 @@ class MetricsCalculator:
         if not equity_curve:
             return 0.0, 0.0
         
-        peak = equity_curve[0].equity
-        max_drawdown_abs = 0.0
-        max_drawdown_pct = 0.0
-        
-        for point in equity_curve:
-            if point.equity > peak:
-                peak = point.equity
-            
-            drawdown_abs = peak - point.equity
-            drawdown_pct = (drawdown_abs / peak * 100) if peak > 0 else 0
-            
-            if drawdown_abs > max_drawdown_abs:
-                max_drawdown_abs = drawdown_abs
-            if drawdown_pct > max_drawdown_pct:
-                max_drawdown_pct = drawdown_pct
-        
-        return max_drawdown_abs, max_drawdown_pct
+        equity = np.fromiter(
+            (point.equity for point in equity_curve),
+            dtype=np.float64,
+            count=len(equity_curve)
+        )
+        peaks = np.maximum.accumulate(equity)
+        drawdowns = peaks - equity
+        # Drawdown percentage is only defined against a positive peak
+        drawdowns_pct = np.divide(
+            drawdowns, peaks, out=np.zeros_like(drawdowns), where=peaks > 0
+        ) * 100
+        
+        return max(float(drawdowns.max()), 0.0), max(float(drawdowns_pct.max()), 0.0)
     
     def _calculate_volatility(
         self,
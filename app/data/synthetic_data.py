@@ -7,6 +7,7 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import List, Optional
+from itertools import accumulate
 import random
 from ..models.market_data import Candle
 from ..utils.time_helpers import timeframe_to_seconds, generate_time_range
@@ -88,45 +89,26 @@ class SyntheticDataProvider:
         log_returns = np.cumsum(returns)
         prices = initial_price * np.exp(log_returns)
         
-        # Generate OHLC from prices
-        candles = []
+        # Generate OHLC from prices; each bar opens at the previous close.
+        # Row i of `draws` holds the four uniforms bar i used to take one
+        # at a time, so seeded output is unchanged.
+        draws = np.random.random((n_periods, 4))
+        close_price = prices
+        open_price = self._previous_closes(prices, initial_price)
         
-        for i, timestamp in enumerate(time_index):
-            if i == 0:
-                open_price = initial_price
-            else:
-                open_price = candles[i-1].close
-            
-            # Generate intrabar movement
-            close_price = prices[i]
-            
-            # Add some intrabar volatility
-            intrabar_range = abs(close_price - open_price) * 0.5 + open_price * adjusted_volatility * np.random.random()
-            
-            high_price = max(open_price, close_price) + intrabar_range * np.random.random()
-            low_price = min(open_price, close_price) - intrabar_range * np.random.random()
-            
-            # Ensure price constraints
-            high_price = max(high_price, open_price, close_price)
-            low_price = min(low_price, open_price, close_price)
-            
-            # Generate volume with some randomness
-            volume = volume_base * (0.5 + np.random.random()) * (1 + abs(returns[i]) * 10)
-            
-            candle = Candle(
-                timestamp=timestamp,
-                open=float(round(open_price, 2)),
-                high=float(round(high_price, 2)),
-                low=float(round(low_price, 2)),
-                close=float(round(close_price, 2)),
-                volume=int(round(volume)),
-                symbol=symbol,
-                exchange=exchange
-            )
-            
-            candles.append(candle)
+        # Add some intrabar volatility
+        intrabar_range = np.abs(close_price - open_price) * 0.5 + open_price * adjusted_volatility * draws[:, 0]
+        
+        high_price = np.maximum(open_price, close_price) + intrabar_range * draws[:, 1]
+        low_price = np.minimum(open_price, close_price) - intrabar_range * draws[:, 2]
+        
+        # Generate volume with some randomness
+        volume = volume_base * (0.5 + draws[:, 3]) * (1 + np.abs(returns) * 10)
         
-        return candles
+        return self._build_candles(
+            time_index, open_price, high_price, low_price, close_price, volume,
+            symbol, exchange
+        )
     
     def generate_trending_data(
         self,
@@ -206,16 +188,15 @@ class SyntheticDataProvider:
         
         # Generate mean-reverting series
         prices = [initial_price]
+        # Random component, drawn in one call (same stream as per-step draws)
+        random_changes = np.random.normal(0, volatility, n_periods - 1).tolist()
         
-        for i in range(1, n_periods):
+        for random_change in random_changes:
             current_price = prices[-1]
             
             # Mean reversion force
             mean_reversion = (center_price - current_price) / center_price * 0.1
             
-            # Random component
-            random_change = np.random.normal(0, volatility)
-            
             # Combine forces
             price_change = mean_reversion + random_change
             new_price = current_price * (1 + price_change)
@@ -225,41 +206,25 @@ class SyntheticDataProvider:
             prices.append(new_price)
         
         # Convert to OHLC
-        candles = []
+        draws = np.random.random((n_periods, 2))
+        close_price = np.array(prices)
+        open_price = self._previous_closes(close_price, initial_price)
         
-        for i, timestamp in enumerate(time_index):
-            if i == 0:
-                open_price = initial_price
-            else:
-                open_price = candles[i-1].close
-            
-            close_price = prices[i]
-            
-            # Generate OHLC with some randomness
-            price_range = abs(close_price - open_price) * 0.5
-            high_offset = price_range * np.random.random() * 0.5
-            low_offset = price_range * np.random.random() * 0.5
-            
-            high_price = max(open_price, close_price) + high_offset
-            low_price = min(open_price, close_price) - low_offset
-            
-            # Volume varies with price movement
-            volume = 50000 + abs(close_price - open_price) / open_price * 500000
-            
-            candle = Candle(
-                timestamp=timestamp,
-                open=round(open_price, 2),
-                high=round(high_price, 2),
-                low=round(low_price, 2),
-                close=round(close_price, 2),
-                volume=round(volume),
-                symbol=symbol,
-                exchange=exchange
-            )
-            
-            candles.append(candle)
+        # Generate OHLC with some randomness
+        price_range = np.abs(close_price - open_price) * 0.5
+        high_offset = price_range * draws[:, 0] * 0.5
+        low_offset = price_range * draws[:, 1] * 0.5
         
-        return candles
+        high_price = np.maximum(open_price, close_price) + high_offset
+        low_price = np.minimum(open_price, close_price) - low_offset
+        
+        # Volume varies with price movement
+        volume = 50000 + np.abs(close_price - open_price) / open_price * 500000
+        
+        return self._build_candles(
+            time_index, open_price, high_price, low_price, close_price, volume,
+            symbol, exchange
+        )
     
     def generate_volatile_data(
         self,
@@ -302,66 +267,95 @@ class SyntheticDataProvider:
             volatilities = [base_volatility] * n_periods
         
         # Generate returns with varying volatility
-        returns = []
-        for vol in volatilities:
-            returns.append(np.random.normal(0, vol))
+        returns = np.random.normal(0, volatilities)
         
         # Calculate prices
         log_returns = np.cumsum(returns)
         prices = initial_price * np.exp(log_returns)
         
         # Convert to OHLC
-        candles = []
+        draws = np.random.random((n_periods, 3))
+        close_price = prices
+        open_price = self._previous_closes(prices, initial_price)
         
-        for i, timestamp in enumerate(time_index):
-            if i == 0:
-                open_price = initial_price
-            else:
-                open_price = candles[i-1].close
-            
-            close_price = prices[i]
-            
-            # Generate wider OHLC ranges due to volatility
-            vol_multiplier = volatilities[i] / base_volatility
-            intrabar_range = abs(close_price - open_price) * vol_multiplier
-            
-            high_price = max(open_price, close_price) + intrabar_range * np.random.random()
-            low_price = min(open_price, close_price) - intrabar_range * np.random.random()
-            
-            # Higher volume during volatile periods
-            volume = 100000 * (1 + vol_multiplier * 2) * (0.5 + np.random.random())
-            
-            candle = Candle(
+        # Generate wider OHLC ranges due to volatility
+        vol_multiplier = np.asarray(volatilities) / base_volatility
+        intrabar_range = np.abs(close_price - open_price) * vol_multiplier
+        
+        high_price = np.maximum(open_price, close_price) + intrabar_range * draws[:, 0]
+        low_price = np.minimum(open_price, close_price) - intrabar_range * draws[:, 1]
+        
+        # Higher volume during volatile periods
+        volume = 100000 * (1 + vol_multiplier * 2) * (0.5 + draws[:, 2])
+        
+        return self._build_candles(
+            time_index, open_price, high_price, low_price, close_price, volume,
+            symbol, exchange
+        )
+    
+    def _previous_closes(self, closes: np.ndarray, initial_price: float) -> np.ndarray:
+        """Open prices for a close series: the first bar opens at
+        `initial_price`, every later bar at the previous rounded close."""
+        opens = np.empty(len(closes))
+        opens[0] = initial_price
+        opens[1:] = np.round(closes[:-1], 2)
+        return opens
+    
+    def _build_candles(
+        self,
+        time_index: pd.DatetimeIndex,
+        opens: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        closes: np.ndarray,
+        volumes: np.ndarray,
+        symbol: str,
+        exchange: str
+    ) -> List[Candle]:
+        """Round OHLCV columns in bulk and wrap each row in a Candle."""
+        # High/low must still bracket the open and close
+        highs = np.maximum(highs, np.maximum(opens, closes))
+        lows = np.minimum(lows, np.minimum(opens, closes))
+        return [
+            Candle(
                 timestamp=timestamp,
-                open=round(open_price, 2),
-                high=round(high_price, 2),
-                low=round(low_price, 2),
-                close=round(close_price, 2),
-                volume=round(volume),
+                open=open_price,
+                high=high_price,
+                low=low_price,
+                close=close_price,
+                volume=volume,
                 symbol=symbol,
                 exchange=exchange
             )
-            
-            candles.append(candle)
-        
-        return candles
+            for timestamp, open_price, high_price, low_price, close_price, volume in zip(
+                time_index,
+                np.round(opens, 2).tolist(),
+                np.round(highs, 2).tolist(),
+                np.round(lows, 2).tolist(),
+                np.round(closes, 2).tolist(),
+                np.round(volumes).tolist()
+            )
+        ]
     
     def _add_autocorrelation(self, series: np.ndarray, correlation: float) -> np.ndarray:
         """Add autocorrelation to a time series."""
         if correlation == 0:
             return series
         
-        result = np.copy(series)
-        for i in range(1, len(result)):
-            result[i] += correlation * result[i-1]
-        
-        return result
+        # y[i] = x[i] + c * y[i-1], folded over plain floats rather than
+        # indexing the array element by element
+        return np.fromiter(
+            accumulate(series.tolist(), lambda prev, value: value + correlation * prev),
+            dtype=np.float64,
+            count=len(series)
+        )
     
     def _generate_volatility_clusters(self, n_periods: int, base_vol: float) -> List[float]:
         """Generate volatility with clustering (GARCH-like behavior)."""
         volatilities = [base_vol]
+        shocks = np.random.normal(0, 0.1 * base_vol, n_periods - 1).tolist()
         
-        for i in range(1, n_periods):
+        for raw_shock in shocks:
             # Simple volatility clustering model
             prev_vol = volatilities[-1]
             
@@ -369,7 +363,7 @@ class SyntheticDataProvider:
             mean_reversion = 0.1 * (base_vol - prev_vol)
             
             # Shock component
-            shock = 0.3 * np.random.normal(0, 0.1 * base_vol)
+            shock = 0.3 * raw_shock
             
             # Persistence
             persistence = 0.6 * (prev_vol - base_vol)
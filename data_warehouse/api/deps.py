@@ -1,15 +1,15 @@
 from __future__ import annotations
 
-from pathlib import Path
 import os
-
+from pathlib import Path
 from typing import Protocol, cast
 
 from ..core.openalgo_client import OpenAlgoClient
-from ..db.db import get_connection, init_db
+from ..core.rate_limit import TokenBucket
+from ..db.db import ConnectionPool, get_connection, init_db
 from ..db.repository import WarehouseRepository
-from ..services.warehouse_service import JobStore, OpenAlgoProvider, WarehouseService
 from ..schemas.ohlcv_data import OHLCVCandle
+from ..services.warehouse_service import JobStore, OpenAlgoProvider, WarehouseService
 
 
 _service: WarehouseService | None = None
@@ -72,6 +72,45 @@ class _FakeOpenAlgoClient:
         ]
 
 
+def _provider_limiter() -> TokenBucket | None:
+    raw = os.getenv("DW_PROVIDER_RPS")
+    if not raw:
+        return None
+    try:
+        rate = float(raw)
+    except ValueError:
+        return None
+    if rate <= 0:
+        return None
+    return TokenBucket(rate=rate, burst=rate)
+
+
+def _max_fetch_workers() -> int:
+    raw = os.getenv("DW_FETCH_WORKERS")
+    if not raw:
+        return 4
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return 4
+
+
+def _db_pool_max() -> int:
+    raw = os.getenv("DW_DB_POOL_MAX")
+    if not raw:
+        return 4
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return 4
+
+
+def _job_writer_repository(db_path: str) -> WarehouseRepository | None:
+    if os.getenv("DW_ASYNC_JOB_WRITES", "1") == "0":
+        return None
+    return WarehouseRepository(get_connection(db_path))
+
+
 def get_service() -> WarehouseService:
     global _service, _service_db_path
     env_db_path = os.getenv("DW_DB_PATH")
@@ -82,12 +121,17 @@ def get_service() -> WarehouseService:
     if _service is None or _service_db_path != db_path:
         if _service is not None:
             try:
+                _service.job_store.close()
                 _service.repository.connection.close()
+                if _service.repository.pool is not None:
+                    _service.repository.pool.close()
             except Exception:
                 pass
         init_db(db_path)
         connection = get_connection(db_path)
-        repository = WarehouseRepository(connection)
+        repository = WarehouseRepository(
+            connection, pool=ConnectionPool(db_path, max_size=_db_pool_max())
+        )
         if os.getenv("DW_TESTING") == "1":
             provider: _OpenAlgoProvider = _FakeOpenAlgoClient()
         else:
@@ -95,7 +139,11 @@ def get_service() -> WarehouseService:
         _service = WarehouseService(
             repository=repository,
             provider=cast(OpenAlgoProvider, provider),
-            job_store=JobStore(repository),
+            job_store=JobStore(
+                repository, writer_repository=_job_writer_repository(db_path)
+            ),
+            provider_limiter=_provider_limiter(),
+            max_fetch_workers=_max_fetch_workers(),
         )
         _service_db_path = db_path
     return _service
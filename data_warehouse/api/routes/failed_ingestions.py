@@ -51,12 +51,15 @@ def retry_failed_ingestion(
         if failure is None:
             raise HTTPException(status_code=404, detail="Failed ingestion not found")
 
-        job = service.retry_failed_ingestion(
-            failed_id=failed_id,
-            ticker=failure["ticker"],
-            timeframe=failure["timeframe"],
-            start_epoch=start_epoch,
-            end_epoch=end_epoch,
+        job = service.enqueue_retry_failed(failed_id)
+        background_tasks.add_task(
+            service.process_retry_failed,
+            job["job_id"],
+            failed_id,
+            failure["ticker"],
+            failure["timeframe"],
+            start_epoch,
+            end_epoch,
         )
         return JSONResponse(status_code=202, content=job)
     except HTTPException:
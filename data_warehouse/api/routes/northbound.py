@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from datetime import datetime
 import re
+from datetime import date
+from typing import Iterable, Iterator
 
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
+from ...core.serialization import dumps
+from ...core.time_utils import date_to_epoch
 from ...schemas.requests import EpochRange, Timeframe
 from ...services.warehouse_service import WarehouseService
 from ..deps import get_service
@@ -14,33 +17,42 @@ from ..deps import get_service
 router = APIRouter(prefix="/api/data-warehouse", tags=["northbound"])
 
 
+_DATE_PATTERN = re.compile(r"\b(\d{2})-(\d{2})-(\d{4})\b")
+
+
+def _match_to_date(match: tuple[str, str, str]) -> date:
+    """Build a date from a `(dd, mm, yyyy)` match without re-parsing it."""
+    day, month, year = match
+    return date(int(year), int(month), int(day))
+
+
 def _parse_timerange(timerange: str | None, service: WarehouseService) -> EpochRange:
     if not timerange:
         return service.default_range()
 
-    matches = re.findall(r"\b\d{2}-\d{2}-\d{4}\b", timerange)
+    matches = _DATE_PATTERN.findall(timerange)
     if not matches:
         raise ValueError("timerange must include dd-mm-yyyy")
     if len(matches) > 2:
         raise ValueError("timerange must include at most two dates")
 
     try:
-        start_date = datetime.strptime(matches[0], "%d-%m-%Y").date()
+        start_date = _match_to_date(matches[0])
     except ValueError as exc:
         raise ValueError("timerange must use dd-mm-yyyy") from exc
 
     if len(matches) == 1:
-        start_epoch = int(datetime.combine(start_date, datetime.min.time()).timestamp())
+        start_epoch = date_to_epoch(start_date)
         end_epoch = service.clock()
         return EpochRange(start_epoch=start_epoch, end_epoch=end_epoch)
 
     try:
-        end_date = datetime.strptime(matches[1], "%d-%m-%Y").date()
+        end_date = _match_to_date(matches[1])
     except ValueError as exc:
         raise ValueError("timerange must use dd-mm-yyyy") from exc
 
-    start_epoch = int(datetime.combine(start_date, datetime.min.time()).timestamp())
-    end_epoch = int(datetime.combine(end_date, datetime.max.time()).timestamp())
+    start_epoch = date_to_epoch(start_date)
+    end_epoch = date_to_epoch(end_date, end_of_day=True)
     return EpochRange(start_epoch=start_epoch, end_epoch=end_epoch)
 
 
@@ -64,10 +76,18 @@ def get_ohlcv(
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
+def _json_array(items: Iterable[dict]) -> Iterator[str]:
+    """Encode `items` as one JSON array, a row at a time."""
+    yield "["
+    for index, item in enumerate(items):
+        yield ("," if index else "") + dumps(item)
+    yield "]"
+
+
 @router.get("/tickers")
 def list_tickers(service: WarehouseService = Depends(get_service)):
     try:
-        payload = service.list_tickers_with_timeframes()
-        return JSONResponse(status_code=200, content=payload)
+        payload = service.iter_tickers_with_timeframes()
+        return StreamingResponse(_json_array(payload), media_type="application/json")
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
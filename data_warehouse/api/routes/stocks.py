@@ -1,11 +1,21 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, UploadFile
-from fastapi import HTTPException
-from fastapi.responses import JSONResponse
 import csv
 import io
 
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    UploadFile,
+)
+from fastapi.responses import JSONResponse, Response
+
+from ...core.errors import RepositoryError
+from ...core.serialization import dumps_bytes
 from ...schemas.requests import (
     AddStockRequest,
     BulkAddRequest,
@@ -14,10 +24,9 @@ from ...schemas.requests import (
     GetStockRequest,
     SearchSymbolsRequest,
     UpdateAllRequest,
-    UpdateTickerMetadataRequest,
     UpdateStockRequest,
+    UpdateTickerMetadataRequest,
 )
-from ...core.errors import RepositoryError
 from ...services.warehouse_service import WarehouseService
 from ..deps import get_service
 
@@ -106,19 +115,36 @@ def get_stock_data(
     request: GetStockRequest,
     limit: int = 500,
     offset: int = 0,
+    columnar: bool = False,
+    before_epoch: int | None = None,
+    if_none_match: str | None = Header(default=None),
     service: WarehouseService = Depends(get_service),
 ):
+    page_args = dict(
+        request=request,
+        limit=limit,
+        offset=offset,
+        columnar=columnar,
+        before_epoch=before_epoch,
+    )
     try:
-        payload = service.get_stock_data_page(
-            request=request,
-            limit=limit,
-            offset=offset,
-        )
+        etag = service.get_stock_data_page_etag(**page_args)
+        if etag is not None and if_none_match == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        payload = service.get_stock_data_page(**page_args)
+        # Reading the page may have hydrated it, which bumps the version.
+        etag = service.get_stock_data_page_etag(**page_args)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except RepositoryError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
-    return JSONResponse(status_code=200, content=payload)
+    # Pages are the largest responses; encode them with orjson when present.
+    return Response(
+        content=dumps_bytes(payload),
+        status_code=200,
+        media_type="application/json",
+        headers={"ETag": etag} if etag is not None else None,
+    )
 
 
 @router.get("/stocks/export")
@@ -210,6 +236,23 @@ def get_job_status(job_id: str, service: WarehouseService = Depends(get_service)
     return JSONResponse(status_code=200, content=job)
 
 
+@router.get("/jobs/{job_id}/failures")
+def list_job_failures(
+    job_id: str,
+    limit: int = 100,
+    offset: int = 0,
+    service: WarehouseService = Depends(get_service),
+):
+    try:
+        failures = service.list_job_failures(job_id, limit=limit, offset=offset)
+        total = service.count_job_failures(job_id)
+    except RepositoryError as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return JSONResponse(
+        status_code=200, content={"failures": failures, "total": total}
+    )
+
+
 @router.get("/jobs")
 def list_jobs(
     status: str | None = None,
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from typing import Sequence
+
+import numpy as np
 
 
 TIMEFRAME_TO_SECONDS = {
@@ -54,40 +56,219 @@ def detect_missing_ranges(
         and never returned as missing ranges. If no gaps are found, the list
         is empty.
     """
+    gaps = missing_range_array(
+        start_epoch=start_epoch,
+        end_epoch=end_epoch,
+        existing_epochs=existing_epochs,
+        interval_seconds=interval_seconds,
+    )
+    return _to_range_list(gaps[:, 0], gaps[:, 1])
+
+
+def missing_range_array(
+    start_epoch: int,
+    end_epoch: int,
+    existing_epochs: Sequence[int] | np.ndarray,
+    interval_seconds: int,
+) -> np.ndarray:
+    """Vectorized core of `detect_missing_ranges`.
+
+    Builds every expected slot with `np.arange`, marks the weekday slots with
+    no stored candle, and finds the boundaries of each run of missing slots
+    from the edges of that mask.
+
+    Returns
+    -------
+    numpy.ndarray
+        An `(N, 2)` int64 array of inclusive `(missing_start, missing_end)`
+        rows, in ascending order.
+    """
+    if end_epoch < start_epoch or interval_seconds <= 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    slots = _slots(start_epoch, end_epoch, interval_seconds)
+    existing = np.asarray(existing_epochs, dtype=np.int64)
+    missing = _is_weekday(slots) & ~np.isin(slots, existing)
+
+    edges = np.diff(np.concatenate(([0], missing.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    return np.column_stack((slots[starts], slots[ends]))
+
+
+def missing_ranges_outside(
+    start_epoch: int,
+    end_epoch: int,
+    covered_ranges: Sequence[tuple[int, int]],
+    interval_seconds: int,
+) -> list[tuple[int, int]]:
+    """`detect_missing_ranges` for data given as runs of consecutive slots.
+
+    `covered_ranges` are sorted inclusive `(first, last)` runs of stored
+    candles on the `start_epoch` grid, so callers can pass a handful of runs
+    instead of every stored epoch.
+    """
     if end_epoch < start_epoch or interval_seconds <= 0:
         return []
+    slots = _slots(start_epoch, end_epoch, interval_seconds)
+    missing = _is_weekday(slots)
+    covered = _as_range_array(covered_ranges)
+    if covered.size:
+        run = np.searchsorted(covered[:, 0], slots, side="right") - 1
+        missing &= (run < 0) | (slots > covered[np.maximum(run, 0), 1])
+
+    edges = np.diff(np.concatenate(([0], missing.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    return _to_range_list(slots[starts], slots[ends])
+
+
+def expected_slot_count(
+    start_epoch: int, end_epoch: int, interval_seconds: int
+) -> int:
+    """Return how many weekday slots `detect_missing_ranges` would inspect.
+
+    A stored candle count at or above this value means the range is complete
+    without loading the stored epochs.
+    """
+    if end_epoch < start_epoch or interval_seconds <= 0:
+        return 0
+    slots = _slots(start_epoch, end_epoch, interval_seconds)
+    return int(np.count_nonzero(_is_weekday(slots)))
+
+
+def chunk_ranges(
+    ranges: Sequence[tuple[int, int]], max_span: int
+) -> list[tuple[int, int]]:
+    """Split inclusive ranges into consecutive pieces of at most `max_span`."""
+    array = _as_range_array(ranges)
+    if array.size == 0:
+        return []
+    starts = array[:, 0]
+    ends = array[:, 1]
+    counts = (ends - starts) // max_span + 1
+    if counts.max() == 1:
+        # Usual case: every gap already fits in one request.
+        return _to_range_list(starts, ends)
+    owners = np.repeat(np.arange(len(starts)), counts)
+    first_chunk = np.repeat(np.cumsum(counts) - counts, counts)
+    chunk_starts = starts[owners] + (np.arange(len(owners)) - first_chunk) * max_span
+    chunk_ends = np.minimum(chunk_starts + max_span - 1, ends[owners])
+    return _to_range_list(chunk_starts, chunk_ends)
+
+
+def coalesce_ranges(
+    ranges: Sequence[tuple[int, int]], tolerance: int
+) -> list[tuple[int, int]]:
+    """Merge inclusive ranges separated by at most `tolerance` seconds.
+
+    The result covers every input range, plus the (already stored) stretches
+    between ranges that were merged.
+    """
+    array = _as_range_array(ranges)
+    if array.size == 0:
+        return []
+    array = array[np.argsort(array[:, 0], kind="stable")]
+    starts = array[:, 0]
+    ends = np.maximum.accumulate(array[:, 1])
+    breaks = np.flatnonzero(starts[1:] - ends[:-1] > tolerance) + 1
+    first = np.concatenate(([0], breaks))
+    last = np.concatenate((breaks - 1, [len(array) - 1]))
+    return _to_range_list(starts[first], ends[last])
+
+
+def intersect_ranges(
+    primary: Sequence[tuple[int, int]],
+    secondary: Sequence[tuple[int, int]],
+) -> list[tuple[int, int]]:
+    """Intersect two sorted lists of disjoint inclusive ranges."""
+    return _to_range_list(
+        *_intersect_arrays(_as_range_array(primary), _as_range_array(secondary))
+    )
+
+
+def subtract_ranges(
+    source: Sequence[tuple[int, int]],
+    exclusions: Sequence[tuple[int, int]],
+) -> list[tuple[int, int]]:
+    """Remove `exclusions` from `source`; both sorted and disjoint."""
+    source_array = _as_range_array(source)
+    exclusion_array = _as_range_array(exclusions)
+    if source_array.size == 0 or exclusion_array.size == 0:
+        return _to_range_list(source_array[:, 0], source_array[:, 1])
+    # Subtracting is intersecting with the complement of the exclusions.
+    bounds = np.iinfo(np.int64)
+    kept_starts = np.concatenate(([bounds.min], exclusion_array[:, 1] + 1))
+    kept_ends = np.concatenate((exclusion_array[:, 0] - 1, [bounds.max]))
+    keep = kept_starts <= kept_ends
+    complement = np.column_stack((kept_starts[keep], kept_ends[keep]))
+    return _to_range_list(*_intersect_arrays(source_array, complement))
+
+
+def common_ranges(
+    range_lists: Sequence[Sequence[tuple[int, int]]],
+) -> list[tuple[int, int]]:
+    """Return the inclusive ranges covered by every list in `range_lists`.
+
+    Each list must hold disjoint ranges. Rather than folding pairwise
+    intersections, all boundaries are swept once: every range contributes +1
+    at its start and -1 just past its end, and the points where the running
+    coverage equals the number of lists are the common ranges.
+    """
+    if not range_lists:
+        return []
+    arrays = [_as_range_array(ranges) for ranges in range_lists]
+    if any(array.size == 0 for array in arrays):
+        return []
+    stacked = np.concatenate(arrays)
+    points = np.concatenate((stacked[:, 0], stacked[:, 1] + 1))
+    deltas = np.concatenate(
+        (
+            np.ones(len(stacked), dtype=np.int64),
+            np.full(len(stacked), -1, dtype=np.int64),
+        )
+    )
+    order = np.argsort(points, kind="stable")
+    points = points[order]
+    deltas = deltas[order]
+    unique_points, first_index = np.unique(points, return_index=True)
+    coverage = np.cumsum(np.add.reduceat(deltas, first_index))
+    # Coverage drops to zero after the last point, so `full` never selects it.
+    full = np.flatnonzero(coverage == len(arrays))
+    return _to_range_list(unique_points[full], unique_points[full + 1] - 1)
+
+
+def _intersect_arrays(
+    primary: np.ndarray, secondary: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    if primary.size == 0 or secondary.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    # For every primary range, locate the block of secondary ranges it overlaps.
+    first = np.searchsorted(secondary[:, 1], primary[:, 0], side="left")
+    last = np.searchsorted(secondary[:, 0], primary[:, 1], side="right")
+    counts = np.maximum(last - first, 0)
+    owners = np.repeat(np.arange(len(primary)), counts)
+    block_offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    partners = first[owners] + (np.arange(len(owners)) - block_offsets)
+    starts = np.maximum(primary[owners, 0], secondary[partners, 0])
+    ends = np.minimum(primary[owners, 1], secondary[partners, 1])
+    return starts, ends
+
+
+def _slots(start_epoch: int, end_epoch: int, interval_seconds: int) -> np.ndarray:
+    slot_count = (end_epoch - start_epoch) // interval_seconds + 1
+    return start_epoch + interval_seconds * np.arange(slot_count, dtype=np.int64)
+
+
+def _is_weekday(epochs: np.ndarray) -> np.ndarray:
+    # 1970-01-01 was a Thursday, so day index + 3 gives Monday == 0.
+    return (epochs // 86400 + 3) % 7 < 5
+
+
+def _as_range_array(ranges: Sequence[tuple[int, int]]) -> np.ndarray:
+    return np.asarray(ranges, dtype=np.int64).reshape(-1, 2)
+
 
-    existing_epoch_set = {
-        epoch
-        for epoch in existing_epochs
-        if start_epoch <= epoch <= end_epoch and not _is_weekend_epoch(epoch)
-    }
-    ranges: list[tuple[int, int]] = []
-    gap_start: int | None = None
-    previous_missing: int | None = None
-
-    epoch = start_epoch
-    while epoch <= end_epoch:
-        if not _is_weekend_epoch(epoch) and epoch not in existing_epoch_set:
-            if gap_start is None:
-                gap_start = epoch
-            elif previous_missing is not None and epoch != previous_missing + interval_seconds:
-                ranges.append((gap_start, previous_missing))
-                gap_start = epoch
-            previous_missing = epoch
-        elif gap_start is not None and previous_missing is not None:
-            ranges.append((gap_start, previous_missing))
-            gap_start = None
-            previous_missing = None
-
-        epoch += interval_seconds
-
-    if gap_start is not None and previous_missing is not None:
-        ranges.append((gap_start, previous_missing))
-
-    return ranges
-
-
-def _is_weekend_epoch(epoch: int) -> bool:
-    weekday = datetime.fromtimestamp(epoch, tz=timezone.utc).weekday()
-    return weekday >= 5
+def _to_range_list(starts: np.ndarray, ends: np.ndarray) -> list[tuple[int, int]]:
+    return list(zip(starts.tolist(), ends.tolist()))
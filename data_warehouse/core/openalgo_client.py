@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
 import logging
 import os
+import threading
 import time
+from datetime import datetime, timezone
+from typing import Iterator
 
 import httpx
 import pandas as pd
@@ -45,6 +47,7 @@ class OpenAlgoClient:
         self.backoff_base_seconds = max(0.1, backoff_base_seconds)
         self.last_request_time = 0.0
         self.request_count = 0
+        self._rate_lock = threading.Lock()
         self._logger = logging.getLogger(__name__)
         self.client = None
 
@@ -61,19 +64,22 @@ class OpenAlgoClient:
         self.client = openalgo_api(api_key=self.api_key, host=self.base_url)
 
     def _rate_limit(self) -> None:
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-
-        if (
-            self.request_count > 0
-            and self.request_count % self.batch_request_size == 0
-            and self.batch_pause_seconds > 0
-        ):
-            time.sleep(self.batch_pause_seconds)
-
-        self.last_request_time = time.time()
+        # Held while sleeping so concurrent fetches are spaced out rather
+        # than all observing the same last_request_time.
+        with self._rate_lock:
+            current_time = time.time()
+            elapsed = current_time - self.last_request_time
+            if elapsed < self.min_request_interval:
+                time.sleep(self.min_request_interval - elapsed)
+
+            if (
+                self.request_count > 0
+                and self.request_count % self.batch_request_size == 0
+                and self.batch_pause_seconds > 0
+            ):
+                time.sleep(self.batch_pause_seconds)
+
+            self.last_request_time = time.time()
 
     def fetch_ohlcv(
         self,
@@ -83,6 +89,49 @@ class OpenAlgoClient:
         end_epoch: int,
         exchange: str | None = None,
     ) -> list[OHLCVCandle]:
+        response = self._fetch_history(
+            ticker, timeframe, start_epoch, end_epoch, exchange
+        )
+        if response is None:
+            return []
+        return list(self._iter_candles(response))
+
+    def iter_ohlcv(
+        self,
+        ticker: str,
+        timeframe: str,
+        start_epoch: int,
+        end_epoch: int,
+        exchange: str | None = None,
+        page_size: int = 5000,
+    ) -> Iterator[list[OHLCVCandle]]:
+        """Yield candles for the range in pages of at most `page_size`.
+
+        The provider returns the whole range as one frame, but candle objects
+        are only built a page at a time so callers can persist and drop them.
+        """
+        response = self._fetch_history(
+            ticker, timeframe, start_epoch, end_epoch, exchange
+        )
+        if response is None:
+            return
+        page: list[OHLCVCandle] = []
+        for candle in self._iter_candles(response):
+            page.append(candle)
+            if len(page) >= page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def _fetch_history(
+        self,
+        ticker: str,
+        timeframe: str,
+        start_epoch: int,
+        end_epoch: int,
+        exchange: str | None = None,
+    ) -> pd.DataFrame | None:
         if self.client is None:
             raise RuntimeError("OpenAlgo client not configured; set OPENALGO_API_KEY.")
 
@@ -126,10 +175,11 @@ class OpenAlgoClient:
                 )
                 time.sleep(backoff_seconds)
             finally:
-                self.request_count += 1
+                with self._rate_lock:
+                    self.request_count += 1
 
         if response is None:
-            return []
+            return None
 
         if not isinstance(response, pd.DataFrame) or response.empty:
             self._logger.warning(
@@ -139,9 +189,10 @@ class OpenAlgoClient:
                 start_dt.date(),
                 end_dt.date(),
             )
-            return []
+            return None
+        return response
 
-        candles: list[OHLCVCandle] = []
+    def _iter_candles(self, response: pd.DataFrame) -> Iterator[OHLCVCandle]:
         for index, row in response.iterrows():
             timestamp = index
             if not isinstance(timestamp, datetime) and "date" in row:
@@ -163,20 +214,18 @@ class OpenAlgoClient:
                 low_value = float(row_data["low"])
                 close_value = float(row_data["close"])
                 volume_value = int(row_data["volume"])
-                candles.append(
-                    OHLCVCandle(
-                        epoch=int(timestamp.timestamp()),
-                        open=open_value,
-                        high=high_value,
-                        low=low_value,
-                        close=close_value,
-                        volume=volume_value,
-                    )
+                candle = OHLCVCandle(
+                    epoch=int(timestamp.timestamp()),
+                    open=open_value,
+                    high=high_value,
+                    low=low_value,
+                    close=close_value,
+                    volume=volume_value,
                 )
             except (KeyError, TypeError, ValueError) as exc:
                 self._logger.warning("Invalid candle row skipped: %s", exc)
-
-        return candles
+                continue
+            yield candle
 
     def search_symbols(self, query: str, exchange: str | None = None) -> list[dict]:
         if not self.api_key:
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def dumps(value: Any) -> str:
+    """Serialize `value` to a JSON string, using orjson when it is installed.
+
+    Falls back to the standard library for values orjson rejects (for example
+    non-string dict keys) so callers get the same output either way.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode()
+        except TypeError:
+            pass
+    return json.dumps(value)
+
+
+def loads(value: str | bytes) -> Any:
+    """Parse JSON text, using orjson when it is installed.
+
+    Both parsers raise a `ValueError` subclass on malformed input.
+    """
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
+
+def dumps_bytes(value: Any) -> bytes:
+    """Serialize `value` to compact UTF-8 JSON bytes for HTTP responses.
+
+    With orjson, NumPy arrays are encoded natively; the standard-library
+    fallback produces the same compact JSON.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass
+    return json.dumps(
+        value, separators=(",", ":"), ensure_ascii=False, default=_to_builtin
+    ).encode()
+
+
+def _to_builtin(value: Any) -> Any:
+    """`json.dumps` hook turning NumPy arrays and scalars into plain values."""
+    tolist = getattr(value, "tolist", None)
+    if tolist is None:
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
+    return tolist()
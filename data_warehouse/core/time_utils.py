@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Sequence
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+IST = ZoneInfo("Asia/Kolkata")
+UTC = timezone.utc
+# India has observed no DST since 1945, so IST is a constant UTC+05:30.
+# Shifting by the fixed offset skips the zone's transition lookup.
+IST_OFFSET_SECONDS = 19800
+IST_OFFSET = timezone(timedelta(seconds=IST_OFFSET_SECONDS))
+
+
+@lru_cache(maxsize=8192)
+def date_to_epoch(day: date, end_of_day: bool = False) -> int:
+    """Return the epoch for the start (or last second) of `day` in local time.
+
+    Matches `datetime.combine(day, time.min/max).timestamp()` exactly, so
+    results stay consistent with ranges stored before this helper existed.
+    Bulk jobs convert the same handful of dates for every row, so the
+    result is memoized.
+    """
+    moment = datetime.max.time() if end_of_day else datetime.min.time()
+    return int(datetime.combine(day, moment).timestamp())
+
+
+def epochs_to_ist_iso(epochs: Sequence[int]) -> list[str]:
+    """Format epoch seconds as IST ISO-8601 strings in one vectorized pass.
+
+    Output is identical to
+    `datetime.fromtimestamp(epoch, tz=timezone.utc).astimezone(IST).isoformat()`.
+    NumPy formats the whole array in C without building datetime objects;
+    shifting by the fixed offset first avoids a per-element zone lookup.
+    """
+    if not len(epochs):
+        return []
+    values = np.asarray(epochs, dtype=np.int64) + IST_OFFSET_SECONDS
+    formatted = np.datetime_as_string(values.astype("datetime64[s]"), unit="s")
+    return [text + "+05:30" for text in formatted.tolist()]
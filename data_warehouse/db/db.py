@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator
 
 
 SCHEMA_SQL = """
@@ -23,6 +27,7 @@ CREATE TABLE IF NOT EXISTS ticker_timeframes (
     last_updated_epoch INTEGER,
     current_range_start_epoch NUMERIC,
     current_range_end_epoch NUMERIC,
+    data_version INTEGER NOT NULL DEFAULT 0,
     UNIQUE (ticker_id, timeframe),
     FOREIGN KEY (ticker_id) REFERENCES tickers(id) ON DELETE CASCADE
 );
@@ -56,11 +61,19 @@ CREATE TABLE IF NOT EXISTS jobs (
     data TEXT
 );
 
-CREATE INDEX IF NOT EXISTS idx_jobs_status
-ON jobs (status);
+-- Job listings filter by status and/or type and page newest first; with
+-- created_at in each index SQLite walks it in order instead of sorting.
+DROP INDEX IF EXISTS idx_jobs_status;
+DROP INDEX IF EXISTS idx_jobs_type;
 
-CREATE INDEX IF NOT EXISTS idx_jobs_type
-ON jobs (job_type);
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at
+ON jobs (created_at);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created_at
+ON jobs (status, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_type_created_at
+ON jobs (job_type, created_at);
 
 CREATE TABLE IF NOT EXISTS failed_ingestions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -81,6 +94,16 @@ ON failed_ingestions (status);
 
 CREATE INDEX IF NOT EXISTS idx_failed_ingestions_ticker_timeframe
 ON failed_ingestions (ticker, timeframe);
+
+CREATE TABLE IF NOT EXISTS job_failures (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    row_index INTEGER NOT NULL,
+    error TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_failures_job_row
+ON job_failures (job_id, row_index);
 """
 
 
@@ -89,13 +112,101 @@ def get_connection(db_path: str) -> sqlite3.Connection:
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON;")
     conn.execute("PRAGMA journal_mode = WAL;")
+    # In WAL mode NORMAL only syncs at checkpoints and stays crash-safe;
+    # bulk ingests otherwise pay an fsync per committed batch.
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+    conn.execute("PRAGMA cache_size = -65536;")
     return conn
 
 
+# IST has been a fixed UTC+05:30 since 1945, so the offset is a constant.
+TIMESTAMP_IST_SQL = (
+    "strftime('%Y-%m-%dT%H:%M:%S', epoch + 19800, 'unixepoch') || '+05:30'"
+)
+
+
+def ensure_timestamp_column(conn: sqlite3.Connection) -> bool:
+    """Add the generated `ohlcv.timestamp_ist` column if it is missing.
+
+    The column is VIRTUAL (SQLite cannot add STORED columns to an existing
+    table), so it costs no space and is formatted by SQLite on read.
+    Returns False on SQLite builds without generated columns (< 3.31).
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(ohlcv)")}
+    if "timestamp_ist" in columns:
+        return True
+    try:
+        conn.execute(
+            "ALTER TABLE ohlcv ADD COLUMN timestamp_ist TEXT "
+            f"GENERATED ALWAYS AS ({TIMESTAMP_IST_SQL}) VIRTUAL"
+        )
+        conn.commit()
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def ensure_data_version_column(conn: sqlite3.Connection) -> None:
+    """Add `ticker_timeframes.data_version` to databases created without it.
+
+    The version changes on every write to a ticker/timeframe's candles, so
+    readers can tell whether a previously served page is still current.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(ticker_timeframes)")}
+    if "data_version" not in columns:
+        conn.execute(
+            "ALTER TABLE ticker_timeframes "
+            "ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0"
+        )
+        conn.commit()
+
+
 def init_db(db_path: str) -> None:
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(db_path)
     try:
         conn.executescript(SCHEMA_SQL)
+        ensure_timestamp_column(conn)
+        ensure_data_version_column(conn)
     finally:
         conn.close()
+
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections to a single database file.
+
+    Connections are opened lazily, up to `max_size`. `acquire` blocks while
+    every connection is checked out, which caps how many connections the
+    warehouse holds no matter how many job threads are running.
+    """
+
+    def __init__(self, db_path: str, max_size: int = 4):
+        self.db_path = db_path
+        self.max_size = max(1, max_size)
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._connections: list[sqlite3.Connection] = []
+
+    @contextmanager
+    def acquire(self) -> Iterator[sqlite3.Connection]:
+        with self._slots:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = get_connection(self.db_path)
+                with self._lock:
+                    self._connections.append(connection)
+            try:
+                yield connection
+            finally:
+                if connection.in_transaction:
+                    connection.rollback()
+                self._idle.put(connection)
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
@@ -3,14 +3,85 @@ from __future__ import annotations
 import json
 import logging
 import sqlite3
+import threading
 import time
-from typing import Iterable
+from contextlib import contextmanager
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable, Iterator
+
+import numpy as np
 
 from ..core.errors import RepositoryError
+from ..core.gap_detection import missing_ranges_outside
+from ..core.serialization import dumps
 from ..schemas.ohlcv_data import OHLCVCandle
+from .db import ConnectionPool
 
 logger = logging.getLogger(__name__)
 
+# Rows bound per executemany call; large enough to amortize statement
+# overhead while keeping each call's parameter list bounded.
+UPSERT_PAGE_SIZE = 10_000
+
+# Maximum values bound into a single IN (...) list.
+SQL_VARIABLE_CHUNK = 500
+
+# Fields set per json_set call; SQLite caps functions at 127 arguments.
+JSON_SET_CHUNK = 60
+
+OHLCV_COLUMNS = ("epoch", "open", "high", "low", "close", "volume")
+OHLCV_DTYPE = np.dtype(
+    [
+        ("epoch", np.int64),
+        ("open", np.float64),
+        ("high", np.float64),
+        ("low", np.float64),
+        ("close", np.float64),
+        ("volume", np.int64),
+    ]
+)
+
+
+def _rows_to_columns(
+    rows: list[sqlite3.Row], with_timestamp: bool = False
+) -> dict[str, list]:
+    """Pivot OHLCV rows into one list per column without per-row dicts.
+
+    With `with_timestamp`, the seventh selected column is `timestamp_ist`.
+    """
+    if not rows:
+        columns: dict[str, list] = {name: [] for name in OHLCV_COLUMNS}
+        if with_timestamp:
+            columns["timestamp_ist"] = []
+        return columns
+    values = list(zip(*rows))
+    epochs, opens, highs, lows, closes, volumes = values[:6]
+    columns = {
+        "epoch": list(map(int, epochs)),
+        "open": list(map(float, opens)),
+        "high": list(map(float, highs)),
+        "low": list(map(float, lows)),
+        "close": list(map(float, closes)),
+        "volume": list(map(int, volumes)),
+    }
+    if with_timestamp:
+        columns["timestamp_ist"] = list(values[6])
+    return columns
+
+
+def _json_set_sql(fields: dict) -> tuple[str, list[str]]:
+    """Build a `data` expression that sets each field, and its parameters."""
+    sql = "data"
+    params: list[str] = []
+    items = list(fields.items())
+    for offset in range(0, len(items), JSON_SET_CHUNK):
+        chunk = items[offset : offset + JSON_SET_CHUNK]
+        sql = f"json_set({sql}, {', '.join('?, json(?)' for _ in chunk)})"
+        for key, value in chunk:
+            params.extend((f'$."{key}"', dumps(value)))
+    return sql, params
+
 
 class WarehouseRepository:
     """Data access layer for ticker and OHLCV data.
@@ -22,15 +93,72 @@ class WarehouseRepository:
     SQL or database connections directly.
     """
 
-    def __init__(self, connection: sqlite3.Connection):
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        pool: ConnectionPool | None = None,
+    ):
         self.connection = connection
+        self.pool = pool
+        self._write_lock = threading.Lock()
+        self._has_timestamp_column: bool | None = None
+
+    def _timestamp_column(self) -> bool:
+        """Whether `ohlcv` exposes the generated `timestamp_ist` column."""
+        if self._has_timestamp_column is None:
+            try:
+                columns = self.connection.execute(
+                    "PRAGMA table_xinfo(ohlcv)"
+                ).fetchall()
+            except sqlite3.Error:
+                columns = []
+            self._has_timestamp_column = any(
+                row[1] == "timestamp_ist" for row in columns
+            )
+        return self._has_timestamp_column
+
+    @contextmanager
+    def reader(self) -> Iterator[WarehouseRepository]:
+        """Yield a repository on a pooled connection for read-heavy work.
+
+        Without a pool this yields `self`, so callers behave the same on the
+        single shared connection used in tests.
+        """
+        if self.pool is None:
+            yield self
+            return
+        with self.pool.acquire() as connection:
+            yield WarehouseRepository(connection)
+
+    @contextmanager
+    def writer(self) -> Iterator[WarehouseRepository]:
+        """Yield a repository on a pooled connection reserved for one writer.
+
+        SQLite allows a single writer at a time, so pooled writers are
+        serialized here instead of waiting on the database lock.
+        """
+        if self.pool is None:
+            yield self
+            return
+        with self._write_lock, self.pool.acquire() as connection:
+            yield WarehouseRepository(connection)
+
+    @contextmanager
+    def _write(self) -> Iterator[None]:
+        """Commit a standalone write, or join the caller's open transaction."""
+        if self.connection.in_transaction:
+            yield
+        else:
+            with self.connection:
+                yield
 
     def ensure_ticker(self, ticker: str) -> int:
         try:
-            cursor = self.connection.execute(
-                "INSERT OR IGNORE INTO tickers (ticker) VALUES (?)",
-                (ticker,),
-            )
+            with self._write():
+                cursor = self.connection.execute(
+                    "INSERT OR IGNORE INTO tickers (ticker) VALUES (?)",
+                    (ticker,),
+                )
             _ = cursor
             row = self.connection.execute(
                 "SELECT id FROM tickers WHERE ticker = ?",
@@ -91,6 +219,37 @@ class WarehouseRepository:
             logger.exception("Failed to list timeframes for %s", ticker)
             raise RepositoryError("Failed to list timeframes") from exc
 
+    def list_all_ticker_timeframes(self) -> dict[str, list[str]]:
+        """Return every ticker mapped to its stored timeframes in one query.
+
+        Tickers without candles map to an empty list.
+        """
+        return dict(self.iter_ticker_timeframes())
+
+    def iter_ticker_timeframes(self) -> Iterator[tuple[str, list[str]]]:
+        """Yield `(ticker, timeframes)` pairs in ticker order.
+
+        The query runs (and fails) eagerly; only the grouping is lazy, so
+        the shared connection is never left with an open cursor.
+        """
+        try:
+            rows = self.connection.execute(
+                """
+                SELECT t.ticker, o.timeframe
+                FROM tickers t
+                LEFT JOIN (SELECT DISTINCT ticker_id, timeframe FROM ohlcv) o
+                    ON o.ticker_id = t.id
+                ORDER BY t.ticker, o.timeframe
+                """
+            ).fetchall()
+        except sqlite3.Error as exc:
+            logger.exception("Failed to list ticker timeframes")
+            raise RepositoryError("Failed to list timeframes") from exc
+        return (
+            (ticker, [row[1] for row in group if row[1] is not None])
+            for ticker, group in groupby(rows, key=itemgetter(0))
+        )
+
     def list_ticker_metadata(self) -> list[dict]:
         try:
             rows = self.connection.execute(
@@ -169,12 +328,88 @@ class WarehouseRepository:
             raise RepositoryError("Failed to read epochs") from exc
         return [int(item["epoch"]) for item in rows]
 
+    def get_missing_ranges(
+        self,
+        ticker: str,
+        timeframe: str,
+        start_epoch: int,
+        end_epoch: int,
+        interval_seconds: int,
+    ) -> list[tuple[int, int]]:
+        """Return the weekday gaps in a range without loading every epoch."""
+        return self.get_missing_ranges_multi(
+            [ticker], timeframe, start_epoch, end_epoch, interval_seconds
+        )[ticker]
+
+    def get_missing_ranges_multi(
+        self,
+        tickers: list[str],
+        timeframe: str,
+        start_epoch: int,
+        end_epoch: int,
+        interval_seconds: int,
+    ) -> dict[str, list[tuple[int, int]]]:
+        """Return `get_missing_ranges` for each ticker, in one pass.
+
+        SQLite collapses each ticker's stored on-grid candles into runs of
+        consecutive slots (gaps-and-islands over ROW_NUMBER), so only one row
+        per run crosses into Python. Tickers are bound in chunks to stay under
+        SQLite's variable limit.
+        """
+        runs: dict[str, list[tuple[int, int]]] = {ticker: [] for ticker in tickers}
+        for offset in range(0, len(tickers), SQL_VARIABLE_CHUNK):
+            chunk = tickers[offset : offset + SQL_VARIABLE_CHUNK]
+            placeholders = ", ".join("?" for _ in chunk)
+            try:
+                rows = self.connection.execute(
+                    f"""
+                    SELECT ticker, MIN(epoch) AS first_epoch, MAX(epoch) AS last_epoch
+                    FROM (
+                        SELECT t.ticker, o.epoch,
+                               (o.epoch - ?) / ?
+                                   - ROW_NUMBER() OVER (
+                                       PARTITION BY o.ticker_id ORDER BY o.epoch
+                                   ) AS run
+                        FROM ohlcv o
+                        JOIN tickers t ON t.id = o.ticker_id
+                        WHERE t.ticker IN ({placeholders})
+                          AND o.timeframe = ?
+                          AND o.epoch BETWEEN ? AND ?
+                          AND (o.epoch - ?) % ? = 0
+                    )
+                    GROUP BY ticker, run
+                    ORDER BY ticker, first_epoch
+                    """,
+                    (
+                        start_epoch,
+                        interval_seconds,
+                        *chunk,
+                        timeframe,
+                        start_epoch,
+                        end_epoch,
+                        start_epoch,
+                        interval_seconds,
+                    ),
+                ).fetchall()
+            except sqlite3.Error as exc:
+                logger.exception("Failed to read gaps for %s tickers", len(chunk))
+                raise RepositoryError("Failed to read gaps") from exc
+            for ticker, group in groupby(rows, key=itemgetter(0)):
+                runs[ticker] = [(int(row[1]), int(row[2])) for row in group]
+        return {
+            ticker: missing_ranges_outside(
+                start_epoch, end_epoch, covered, interval_seconds
+            )
+            for ticker, covered in runs.items()
+        }
+
     def upsert_ohlcv_batch(
         self,
         ticker: str,
         timeframe: str,
         candles: Iterable[OHLCVCandle],
         use_transaction: bool = True,
+        page_size: int = UPSERT_PAGE_SIZE,
     ) -> int:
         ticker_id = self.ensure_ticker(ticker)
         candle_list = list(candles)
@@ -182,32 +417,33 @@ class WarehouseRepository:
             return 0
 
         def _execute() -> None:
-            self.connection.executemany(
-                """
-                INSERT INTO ohlcv (
-                    ticker_id, timeframe, epoch, open, high, low, close, volume
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(ticker_id, timeframe, epoch) DO UPDATE SET
-                    open = excluded.open,
-                    high = excluded.high,
-                    low = excluded.low,
-                    close = excluded.close,
-                    volume = excluded.volume
-                """,
-                [
-                    (
-                        ticker_id,
-                        timeframe,
-                        candle.epoch,
-                        candle.open,
-                        candle.high,
-                        candle.low,
-                        candle.close,
-                        candle.volume,
-                    )
-                    for candle in candle_list
-                ],
-            )
+            for offset in range(0, len(candle_list), page_size):
+                self.connection.executemany(
+                    """
+                    INSERT INTO ohlcv (
+                        ticker_id, timeframe, epoch, open, high, low, close, volume
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(ticker_id, timeframe, epoch) DO UPDATE SET
+                        open = excluded.open,
+                        high = excluded.high,
+                        low = excluded.low,
+                        close = excluded.close,
+                        volume = excluded.volume
+                    """,
+                    [
+                        (
+                            ticker_id,
+                            timeframe,
+                            candle.epoch,
+                            candle.open,
+                            candle.high,
+                            candle.low,
+                            candle.close,
+                            candle.volume,
+                        )
+                        for candle in candle_list[offset : offset + page_size]
+                    ],
+                )
 
             self.connection.execute(
                 """
@@ -216,12 +452,14 @@ class WarehouseRepository:
                     timeframe,
                     last_updated_epoch,
                     current_range_start_epoch,
-                    current_range_end_epoch
-                ) VALUES (?, ?, ?, ?, ?)
+                    current_range_end_epoch,
+                    data_version
+                ) VALUES (?, ?, ?, ?, ?, ?)
                 ON CONFLICT(ticker_id, timeframe) DO UPDATE SET
                     last_updated_epoch = excluded.last_updated_epoch,
                     current_range_start_epoch = MIN(ticker_timeframes.current_range_start_epoch, excluded.current_range_start_epoch),
-                    current_range_end_epoch = MAX(ticker_timeframes.current_range_end_epoch, excluded.current_range_end_epoch)
+                    current_range_end_epoch = MAX(ticker_timeframes.current_range_end_epoch, excluded.current_range_end_epoch),
+                    data_version = MAX(ticker_timeframes.data_version + 1, excluded.data_version)
                 """,
                 (
                     ticker_id,
@@ -229,6 +467,9 @@ class WarehouseRepository:
                     max(candle.epoch for candle in candle_list),
                     min(candle.epoch for candle in candle_list),
                     max(candle.epoch for candle in candle_list),
+                    # Clock-seeded so a pair deleted and re-added never
+                    # reuses a version served before.
+                    time.time_ns(),
                 ),
             )
 
@@ -244,6 +485,60 @@ class WarehouseRepository:
 
         return len(candle_list)
 
+    def upsert_ohlcv_multi(
+        self,
+        batches: Iterable[tuple[str, str, Iterable[OHLCVCandle]]],
+        page_size: int = UPSERT_PAGE_SIZE,
+    ) -> int:
+        """Upsert candles for several ticker/timeframe pairs in one transaction."""
+        inserted = 0
+        try:
+            with self.connection:
+                for ticker, timeframe, candles in batches:
+                    inserted += self.upsert_ohlcv_batch(
+                        ticker=ticker,
+                        timeframe=timeframe,
+                        candles=candles,
+                        use_transaction=False,
+                        page_size=page_size,
+                    )
+        except sqlite3.Error as exc:
+            logger.exception("Failed to upsert candle batches")
+            raise RepositoryError("Failed to upsert candles") from exc
+        return inserted
+
+    def get_ohlcv_array(
+        self,
+        ticker: str,
+        timeframe: str,
+        start_epoch: int,
+        end_epoch: int,
+    ) -> np.ndarray:
+        """Return candles in range as an `OHLCV_DTYPE` structured array.
+
+        Rows stream from the cursor straight into the array, so large
+        histories never materialize as per-row dicts.
+        """
+        cursor = self.connection.cursor()
+        cursor.row_factory = None
+        try:
+            cursor.execute(
+                """
+                SELECT o.epoch, o.open, o.high, o.low, o.close, o.volume
+                FROM ohlcv o
+                JOIN tickers t ON t.id = o.ticker_id
+                WHERE t.ticker = ? AND o.timeframe = ? AND o.epoch BETWEEN ? AND ?
+                ORDER BY o.epoch
+                """,
+                (ticker, timeframe, start_epoch, end_epoch),
+            )
+            return np.fromiter(cursor, dtype=OHLCV_DTYPE)
+        except sqlite3.Error as exc:
+            logger.exception("Failed to read candles for %s", ticker)
+            raise RepositoryError("Failed to read candles") from exc
+        finally:
+            cursor.close()
+
     def get_ohlcv(
         self,
         ticker: str,
@@ -296,7 +591,8 @@ class WarehouseRepository:
         end_epoch: int,
         limit: int,
         offset: int,
-    ) -> list[dict]:
+        columnar: bool = False,
+    ) -> list[dict] | dict[str, list]:
         try:
             row = self.connection.execute(
                 "SELECT id FROM tickers WHERE ticker = ?",
@@ -306,7 +602,7 @@ class WarehouseRepository:
             logger.exception("Failed to read candles for %s", ticker)
             raise RepositoryError("Failed to read candles") from exc
         if row is None:
-            return []
+            return _rows_to_columns([]) if columnar else []
         ticker_id = int(row["id"])
         try:
             rows = self.connection.execute(
@@ -323,6 +619,8 @@ class WarehouseRepository:
             logger.exception("Failed to read candles for %s", ticker)
             raise RepositoryError("Failed to read candles") from exc
 
+        if columnar:
+            return _rows_to_columns(rows)
         return [
             {
                 "epoch": int(item["epoch"]),
@@ -335,6 +633,114 @@ class WarehouseRepository:
             for item in rows
         ]
 
+    def get_ohlcv_page_with_count(
+        self,
+        ticker: str,
+        timeframe: str,
+        start_epoch: int,
+        end_epoch: int,
+        limit: int,
+        offset: int,
+        columnar: bool = False,
+        before_epoch: int | None = None,
+    ) -> tuple[list[dict] | dict[str, list], int]:
+        """Return one page of candles together with the total in range.
+
+        The total comes from `COUNT(*) OVER ()` on the page query itself, so
+        a populated page costs a single statement. Only a page past the end
+        of the data falls back to `get_ohlcv_count`.
+
+        Passing `before_epoch` switches to keyset pagination: the page holds
+        the newest candles strictly older than the cursor, `offset` is
+        ignored, and the cost no longer grows with the page depth.
+
+        When the database has the generated `timestamp_ist` column, each
+        candle (or the columnar result) carries it as well.
+        """
+        with_timestamp = self._timestamp_column()
+        extra = ", o.timestamp_ist" if with_timestamp else ""
+        try:
+            if before_epoch is None:
+                rows = self.connection.execute(
+                    f"""
+                    SELECT o.epoch, o.open, o.high, o.low, o.close, o.volume{extra},
+                           COUNT(*) OVER () AS total
+                    FROM ohlcv o
+                    JOIN tickers t ON t.id = o.ticker_id
+                    WHERE t.ticker = ? AND o.timeframe = ?
+                      AND o.epoch BETWEEN ? AND ?
+                    ORDER BY o.epoch DESC
+                    LIMIT ? OFFSET ?
+                    """,
+                    (ticker, timeframe, start_epoch, end_epoch, limit, offset),
+                ).fetchall()
+            else:
+                rows = self.connection.execute(
+                    f"""
+                    SELECT o.epoch, o.open, o.high, o.low, o.close, o.volume{extra}
+                    FROM ohlcv o
+                    JOIN tickers t ON t.id = o.ticker_id
+                    WHERE t.ticker = ? AND o.timeframe = ?
+                      AND o.epoch BETWEEN ? AND ? AND o.epoch < ?
+                    ORDER BY o.epoch DESC
+                    LIMIT ?
+                    """,
+                    (ticker, timeframe, start_epoch, end_epoch, before_epoch, limit),
+                ).fetchall()
+        except sqlite3.Error as exc:
+            logger.exception("Failed to read candles for %s", ticker)
+            raise RepositoryError("Failed to read candles") from exc
+
+        if rows and before_epoch is None:
+            total = int(rows[0]["total"])
+        elif offset > 0 or before_epoch is not None:
+            total = self.get_ohlcv_count(ticker, timeframe, start_epoch, end_epoch)
+        else:
+            total = 0
+        if columnar:
+            return _rows_to_columns(rows, with_timestamp), total
+        candles = [
+            {
+                "epoch": int(item["epoch"]),
+                "open": float(item["open"]),
+                "high": float(item["high"]),
+                "low": float(item["low"]),
+                "close": float(item["close"]),
+                "volume": int(item["volume"]),
+            }
+            for item in rows
+        ]
+        if with_timestamp:
+            for candle, item in zip(candles, rows):
+                candle["timestamp_ist"] = item["timestamp_ist"]
+        return candles, total
+
+    def ohlcv_exists_in_range(
+        self,
+        ticker: str,
+        timeframe: str,
+        start_epoch: int,
+        end_epoch: int,
+    ) -> bool:
+        """Whether any candle is stored in the range (a single index probe)."""
+        try:
+            row = self.connection.execute(
+                """
+                SELECT EXISTS (
+                    SELECT 1
+                    FROM ohlcv o
+                    JOIN tickers t ON t.id = o.ticker_id
+                    WHERE t.ticker = ? AND o.timeframe = ?
+                      AND o.epoch BETWEEN ? AND ?
+                )
+                """,
+                (ticker, timeframe, start_epoch, end_epoch),
+            ).fetchone()
+        except sqlite3.Error as exc:
+            logger.exception("Failed to count candles for %s", ticker)
+            raise RepositoryError("Failed to count candles") from exc
+        return bool(row[0])
+
     def get_ohlcv_count(
         self,
         ticker: str,
@@ -369,6 +775,23 @@ class WarehouseRepository:
             return 0
         return int(data["total"])
 
+    def get_data_version(self, ticker: str, timeframe: str) -> int | None:
+        """Return the pair's data version, or None if nothing was stored."""
+        try:
+            row = self.connection.execute(
+                """
+                SELECT tt.data_version
+                FROM ticker_timeframes tt
+                JOIN tickers t ON t.id = tt.ticker_id
+                WHERE t.ticker = ? AND tt.timeframe = ?
+                """,
+                (ticker, timeframe),
+            ).fetchone()
+        except sqlite3.Error as exc:
+            logger.exception("Failed to read data version for %s", ticker)
+            raise RepositoryError("Failed to read metadata") from exc
+        return None if row is None else int(row[0])
+
     def get_ticker_timeframe_meta(self, ticker: str, timeframe: str) -> dict | None:
         try:
             row = self.connection.execute(
@@ -417,6 +840,10 @@ class WarehouseRepository:
             raise RepositoryError("Failed to create job") from exc
 
     def update_job(self, job_id: str, status: str, data: dict) -> None:
+        self.update_job_raw(job_id, status, dumps(data))
+
+    def update_job_raw(self, job_id: str, status: str, data: str) -> None:
+        """Update a job with an already-serialized JSON payload."""
         try:
             now = int(time.time())
             with self.connection:
@@ -426,12 +853,80 @@ class WarehouseRepository:
                     SET status = ?, updated_at = ?, data = ?
                     WHERE job_id = ?
                     """,
-                    (status, now, json.dumps(data), job_id),
+                    (status, now, data, job_id),
                 )
         except sqlite3.Error as exc:
             logger.exception("Failed to update job %s", job_id)
             raise RepositoryError("Failed to update job") from exc
 
+    def merge_job(self, job_id: str, status: str | None, fields: dict) -> dict | None:
+        """Merge `fields` into a job's payload and return the stored job.
+
+        The merge runs inside SQLite (json_set ... RETURNING), so callers that
+        have no cached copy of the job avoid reading it before and after the
+        write. Returns None when the job does not exist.
+        """
+        data_sql, data_params = _json_set_sql(fields)
+        params = [status, int(time.time()), *data_params, job_id]
+        try:
+            with self.connection:
+                row = self.connection.execute(
+                    f"""
+                    UPDATE jobs
+                    SET status = COALESCE(?, status), updated_at = ?, data = {data_sql}
+                    WHERE job_id = ?
+                    RETURNING job_id, job_type, status, created_at, updated_at, data
+                    """,
+                    params,
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.exception("Failed to update job %s", job_id)
+            raise RepositoryError("Failed to update job") from exc
+        if row is None:
+            return None
+        return self._job_payload(row)
+
+    def patch_job(self, job_id: str, status: str, fields: dict) -> None:
+        """Write only the changed `fields` of a job's payload.
+
+        Only the changed values are serialized; SQLite splices them into the
+        stored JSON.
+        """
+        data_sql, data_params = _json_set_sql(fields)
+        try:
+            with self.connection:
+                self.connection.execute(
+                    f"""
+                    UPDATE jobs
+                    SET status = ?, updated_at = ?, data = {data_sql}
+                    WHERE job_id = ?
+                    """,
+                    (status, int(time.time()), *data_params, job_id),
+                )
+        except sqlite3.Error as exc:
+            logger.exception("Failed to update job %s", job_id)
+            raise RepositoryError("Failed to update job") from exc
+
+    def update_jobs_batch(self, entries: Iterable[tuple[str, str, dict]]) -> None:
+        """Apply several (job_id, status, data) updates in one transaction."""
+        now = int(time.time())
+        try:
+            with self.connection:
+                self.connection.executemany(
+                    """
+                    UPDATE jobs
+                    SET status = ?, updated_at = ?, data = ?
+                    WHERE job_id = ?
+                    """,
+                    [
+                        (status, now, dumps(data), job_id)
+                        for job_id, status, data in entries
+                    ],
+                )
+        except sqlite3.Error as exc:
+            logger.exception("Failed to update job batch")
+            raise RepositoryError("Failed to update jobs") from exc
+
     def get_job(self, job_id: str) -> dict | None:
         try:
             row = self.connection.execute(
@@ -443,6 +938,10 @@ class WarehouseRepository:
             raise RepositoryError("Failed to read job") from exc
         if row is None:
             return None
+        return self._job_payload(row)
+
+    @staticmethod
+    def _job_payload(row: sqlite3.Row) -> dict:
         payload = json.loads(row["data"]) if row["data"] else {}
         payload.update(
             {
@@ -455,6 +954,61 @@ class WarehouseRepository:
         )
         return payload
 
+    def append_job_failures(
+        self, job_id: str, failures: Iterable[tuple[int, str]]
+    ) -> None:
+        """Record failed rows for a job without rewriting its payload."""
+        try:
+            with self._write():
+                self.connection.executemany(
+                    """
+                    INSERT INTO job_failures (job_id, row_index, error)
+                    VALUES (?, ?, ?)
+                    """,
+                    [(job_id, row_index, error) for row_index, error in failures],
+                )
+        except sqlite3.Error as exc:
+            logger.exception("Failed to record failures for job %s", job_id)
+            raise RepositoryError("Failed to record job failures") from exc
+
+    def append_job_failure(self, job_id: str, row_index: int, error: str) -> None:
+        self.append_job_failures(job_id, [(row_index, error)])
+
+    def list_job_failures(
+        self,
+        job_id: str,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[dict]:
+        query = """
+            SELECT row_index, error FROM job_failures
+            WHERE job_id = ?
+            ORDER BY row_index, id
+        """
+        params: list = [job_id]
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset or 0])
+        try:
+            rows = self.connection.execute(query, params).fetchall()
+        except sqlite3.Error as exc:
+            logger.exception("Failed to list failures for job %s", job_id)
+            raise RepositoryError("Failed to list job failures") from exc
+        return [{"row": row["row_index"], "error": row["error"]} for row in rows]
+
+    def count_job_failures(self, job_id: str) -> int:
+        try:
+            row = self.connection.execute(
+                "SELECT COUNT(1) AS total FROM job_failures WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        except sqlite3.Error as exc:
+            logger.exception("Failed to count failures for job %s", job_id)
+            raise RepositoryError("Failed to count job failures") from exc
+        if row is None:
+            return 0
+        return int(row["total"])
+
     def list_jobs(
         self,
         status: str | None = None,
@@ -489,20 +1043,7 @@ class WarehouseRepository:
         except sqlite3.Error as exc:
             logger.exception("Failed to list jobs")
             raise RepositoryError("Failed to list jobs") from exc
-        jobs = []
-        for row in rows:
-            payload = json.loads(row["data"]) if row["data"] else {}
-            payload.update(
-                {
-                    "job_id": row["job_id"],
-                    "job_type": row["job_type"],
-                    "status": row["status"],
-                    "created_at": row["created_at"],
-                    "updated_at": row["updated_at"],
-                }
-            )
-            jobs.append(payload)
-        return jobs
+        return [self._job_payload(row) for row in rows]
 
     def count_jobs(self, status: str | None = None, job_type: str | None = None) -> int:
         clauses = []
@@ -593,6 +1134,8 @@ class WarehouseRepository:
         if timeframe is not None:
             clauses.append("timeframe = ?")
             params.append(timeframe)
+        pair_where = " AND ".join(clauses)
+        pair_params = tuple(params)
         if start_epoch is not None and end_epoch is not None:
             clauses.append("epoch BETWEEN ? AND ?")
             params.extend([start_epoch, end_epoch])
@@ -603,6 +1146,11 @@ class WarehouseRepository:
                     f"DELETE FROM ohlcv WHERE {' AND '.join(clauses)}",
                     tuple(params),
                 )
+                self.connection.execute(
+                    "UPDATE ticker_timeframes SET data_version = data_version + 1 "
+                    f"WHERE {pair_where}",
+                    pair_params,
+                )
 
             return int(deleted.rowcount)
         except sqlite3.Error as exc:
@@ -626,6 +1174,62 @@ class WarehouseRepository:
             return None
         return int(data["max_epoch"])
 
+    def get_range_coverage(
+        self, ticker: str, timeframe: str
+    ) -> tuple[int, int] | None:
+        """Return the first and last stored epochs, or None without candles.
+
+        MIN and MAX run as separate subqueries so each is a single index
+        seek rather than a scan of the pair's candles.
+        """
+        return self.get_range_coverage_bulk([(ticker, timeframe)])[
+            (ticker, timeframe)
+        ]
+
+    def get_range_coverage_bulk(
+        self, pairs: Iterable[tuple[str, str]]
+    ) -> dict[tuple[str, str], tuple[int, int] | None]:
+        """Return `get_range_coverage` for many (ticker, timeframe) pairs.
+
+        Pairs are bound as a VALUES list, in chunks under SQLite's variable
+        limit. Pairs without candles (or unknown tickers) map to None.
+        """
+        wanted = list(dict.fromkeys(pairs))
+        coverage: dict[tuple[str, str], tuple[int, int] | None] = dict.fromkeys(
+            wanted
+        )
+        step = SQL_VARIABLE_CHUNK // 2
+        for offset in range(0, len(wanted), step):
+            chunk = wanted[offset : offset + step]
+            values = ", ".join("(?, ?)" for _ in chunk)
+            try:
+                rows = self.connection.execute(
+                    f"""
+                    WITH wanted(ticker, timeframe) AS (VALUES {values})
+                    SELECT w.ticker, w.timeframe,
+                           (
+                               SELECT MIN(o.epoch)
+                               FROM ohlcv o
+                               WHERE o.ticker_id = t.id AND o.timeframe = w.timeframe
+                           ) AS min_epoch,
+                           (
+                               SELECT MAX(o.epoch)
+                               FROM ohlcv o
+                               WHERE o.ticker_id = t.id AND o.timeframe = w.timeframe
+                           ) AS max_epoch
+                    FROM wanted w
+                    JOIN tickers t ON t.ticker = w.ticker
+                    """,
+                    [value for pair in chunk for value in pair],
+                ).fetchall()
+            except sqlite3.Error as exc:
+                logger.exception("Failed to read coverage for %s pairs", len(chunk))
+                raise RepositoryError("Failed to read coverage") from exc
+            for ticker, timeframe, min_epoch, max_epoch in rows:
+                if max_epoch is not None:
+                    coverage[(ticker, timeframe)] = (int(min_epoch), int(max_epoch))
+        return coverage
+
     def create_failed_ingestion(
         self,
         ticker: str,
@@ -636,18 +1240,43 @@ class WarehouseRepository:
     ) -> None:
         try:
             now = int(time.time())
-            self.connection.execute(
-                """
-                INSERT INTO failed_ingestions
-                (ticker, timeframe, error_reason, requested_start_epoch, requested_end_epoch, attempted_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (ticker, timeframe, error_reason, start_epoch, end_epoch, now),
-            )
+            with self._write():
+                self.connection.execute(
+                    """
+                    INSERT INTO failed_ingestions
+                    (ticker, timeframe, error_reason, requested_start_epoch, requested_end_epoch, attempted_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (ticker, timeframe, error_reason, start_epoch, end_epoch, now),
+                )
         except sqlite3.Error as exc:
             logger.exception("Failed to create failed ingestion record for %s", ticker)
             raise RepositoryError("Failed to create failed ingestion record") from exc
 
+    def create_failed_ingestions_bulk(
+        self,
+        failures: Iterable[tuple[str, str, str, int | None, int | None]],
+    ) -> None:
+        """Record many `(ticker, timeframe, error_reason, start, end)` failures.
+
+        All rows share one `attempted_at` and are written in one transaction,
+        so only the first failure per ticker and timeframe is kept.
+        """
+        now = int(time.time())
+        try:
+            with self._write():
+                self.connection.executemany(
+                    """
+                    INSERT OR IGNORE INTO failed_ingestions
+                    (ticker, timeframe, error_reason, requested_start_epoch, requested_end_epoch, attempted_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    [(*failure, now) for failure in failures],
+                )
+        except sqlite3.Error as exc:
+            logger.exception("Failed to create failed ingestion records")
+            raise RepositoryError("Failed to create failed ingestion records") from exc
+
     def list_failed_ingestions(
         self,
         status: str = "failed",
@@ -700,27 +1329,21 @@ class WarehouseRepository:
             return 0
         return int(row["total"])
 
-    def mark_failed_ingestion_resolved(self, failed_id: int) -> None:
-        try:
-            self.connection.execute(
-                "UPDATE failed_ingestions SET status = 'resolved' WHERE id = ?",
-                (failed_id,),
-            )
-        except sqlite3.Error as exc:
-            logger.exception("Failed to mark ingestion as resolved")
-            raise RepositoryError("Failed to mark ingestion as resolved") from exc
-
-    def increment_failed_ingestion_retry(self, failed_id: int) -> None:
+    def finalize_failed_retry(self, failed_id: int, success: bool) -> None:
+        """Count a finished retry and resolve the failure if it succeeded."""
         try:
             now = int(time.time())
-            self.connection.execute(
-                """
-                UPDATE failed_ingestions
-                SET retry_count = retry_count + 1, last_retry_at = ?
-                WHERE id = ?
-                """,
-                (now, failed_id),
-            )
+            with self._write():
+                self.connection.execute(
+                    """
+                    UPDATE failed_ingestions
+                    SET retry_count = retry_count + 1,
+                        last_retry_at = ?,
+                        status = CASE WHEN ? THEN 'resolved' ELSE status END
+                    WHERE id = ?
+                    """,
+                    (now, success, failed_id),
+                )
         except sqlite3.Error as exc:
-            logger.exception("Failed to increment retry count")
-            raise RepositoryError("Failed to increment retry count") from exc
+            logger.exception("Failed to record retry for ingestion %s", failed_id)
+            raise RepositoryError("Failed to record retry") from exc
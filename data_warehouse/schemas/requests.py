@@ -5,6 +5,8 @@ from typing import Literal
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
+from ..core.serialization import loads
+
 
 Timeframe = Literal["1m", "5m", "15m", "1h", "4h", "1d", "1w", "1M"]
 
@@ -40,6 +42,25 @@ class AddStockRequest(BaseModel):
         return self
 
 
+class CsvAddStockRequest(AddStockRequest):
+    """An add request read from a bulk CSV row, where every cell is a string."""
+
+    @field_validator("range", mode="before")
+    @classmethod
+    def parse_range(cls, value: object) -> object:
+        # CSV uploads carry the range as a JSON string; blank means unset.
+        if isinstance(value, str):
+            return loads(value) if value.strip() else None
+        return value
+
+    @field_validator("start_date", "end_date", mode="before")
+    @classmethod
+    def blank_date_to_none(cls, value: object) -> object:
+        if isinstance(value, str) and not value.strip():
+            return None
+        return value
+
+
 class DeleteStockRequest(BaseModel):
     ticker: str = Field(..., min_length=1)
     timeframe: Timeframe | None = None
@@ -0,0 +1,161 @@
+"""Overlapped provider fetches and batched writes for bulk add jobs."""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Generic, TypeVar
+
+from ..db.repository import WarehouseRepository
+from ..schemas.ohlcv_data import OHLCVCandle
+
+RowT = TypeVar("RowT")
+
+
+class _BulkIngestPipeline(Generic[RowT]):
+    """Fetch bulk rows on a worker pool and write their candles in batches.
+
+    Each submitted row names one (ticker, timeframe) pair and the ranges to
+    fetch for it. Up to `max_workers` rows are in flight at once; rows
+    complete in submission order on the calling thread, which stays the only
+    writer. Fetched candles are buffered and written through
+    `repository.writer()` in multi-ticker transactions of about `flush_rows`
+    candles.
+
+    `on_complete(row, fetched)` runs once a row's candles are committed,
+    with one candle list per submitted range. A fetch exception, or a failed
+    write of the row's candles, is passed to `on_error(row, exc)` when given
+    and propagates otherwise. Rows are reported in submission order. Call
+    `close` when done, after `finish` on success.
+    """
+
+    def __init__(
+        self,
+        repository: WarehouseRepository,
+        fetch: Callable[..., list[OHLCVCandle]],
+        on_complete: Callable[[RowT, list[list[OHLCVCandle]]], None],
+        on_error: Callable[[RowT, Exception], None] | None = None,
+        max_workers: int = 1,
+        flush_rows: int = 10_000,
+        thread_name_prefix: str = "dw-bulk-fetch",
+    ) -> None:
+        self.repository = repository
+        self._fetch = fetch
+        self._on_complete = on_complete
+        self._on_error = on_error
+        self._max_workers = max(1, max_workers)
+        self._flush_rows = flush_rows
+        self._in_flight: deque[tuple[RowT, str, str, list[Future]]] = deque()
+        self._pending: list[tuple[str, str, list[OHLCVCandle]]] = []
+        self._pending_rows = 0
+        # Completed rows waiting for the flush that commits their candles.
+        self._unreported: list[
+            tuple[RowT, list[list[OHLCVCandle]], Exception | None]
+        ] = []
+        self._planned: set[tuple[str, str]] = set()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix=thread_name_prefix
+        )
+
+    def settle(self, ticker: str, timeframe: str) -> bool:
+        """Write every submitted row if this pair was submitted before.
+
+        Later rows must see candles stored for the same pair, so their gaps
+        are planned against the database. Returns True when rows were written.
+        """
+        pair = (ticker, timeframe)
+        settled = pair in self._planned
+        if settled:
+            self.finish()
+            self._planned.clear()
+        self._planned.add(pair)
+        return settled
+
+    def submit(
+        self,
+        row: RowT,
+        ticker: str,
+        timeframe: str,
+        ranges: list[tuple[int, int]],
+        **fetch_kwargs,
+    ) -> None:
+        futures = [
+            self._executor.submit(
+                self._fetch,
+                ticker=ticker,
+                timeframe=timeframe,
+                start_epoch=range_start,
+                end_epoch=range_end,
+                **fetch_kwargs,
+            )
+            for range_start, range_end in ranges
+        ]
+        self._in_flight.append((row, ticker, timeframe, futures))
+        # Complete rows whose fetches already finished, in row order.
+        while self._in_flight and all(
+            future.done() for future in self._in_flight[0][3]
+        ):
+            self._complete_next()
+        # Bound the fetched-but-unwritten rows so a slow writer holds back
+        # fetching instead of buffering every row's candles.
+        while len(self._in_flight) > self._max_workers:
+            self._complete_next()
+
+    def drain(self) -> None:
+        """Collect every in-flight row; buffered ones wait for `flush`."""
+        while self._in_flight:
+            self._complete_next()
+
+    def flush(self) -> None:
+        """Write the buffered candles, then report the rows they belong to.
+
+        With `on_error`, a failed write fails only the rows whose candles it
+        held; rows that fetched nothing still complete.
+        """
+        write_error: Exception | None = None
+        if self._pending:
+            try:
+                with self.repository.writer() as writer:
+                    writer.upsert_ohlcv_multi(self._pending)
+            except Exception as exc:
+                if self._on_error is None:
+                    raise
+                write_error = exc
+            finally:
+                self._pending.clear()
+                self._pending_rows = 0
+        unreported, self._unreported = self._unreported, []
+        for row, fetched, error in unreported:
+            if error is None and write_error is not None and any(fetched):
+                error = write_error
+            if error is None:
+                self._on_complete(row, fetched)
+            else:
+                assert self._on_error is not None
+                self._on_error(row, error)
+
+    def finish(self) -> None:
+        """Complete every in-flight row and write the buffered candles."""
+        self.drain()
+        self.flush()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _complete_next(self) -> None:
+        row, ticker, timeframe, futures = self._in_flight.popleft()
+        try:
+            fetched = [future.result() for future in futures]
+        except Exception as exc:
+            if self._on_error is None:
+                raise
+            self._unreported.append((row, [], exc))
+        else:
+            for candles in fetched:
+                if candles:
+                    self._pending.append((ticker, timeframe, candles))
+                    self._pending_rows += len(candles)
+            self._unreported.append((row, fetched, None))
+        # With nothing buffered the flush only reports the row.
+        if not self._pending or self._pending_rows >= self._flush_rows:
+            self.flush()
@@ -1,23 +1,39 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import queue
+import threading
 import time
-from datetime import datetime, timezone
-from zoneinfo import ZoneInfo
 import uuid
-from typing import Callable
-import json
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Iterable, Iterator, Protocol, cast
 
-from ..core.gap_detection import TIMEFRAME_TO_SECONDS, detect_missing_ranges
-from typing import Protocol
+import numpy as np
+from pydantic import TypeAdapter, ValidationError
 
-from ..core.openalgo_client import OpenAlgoClient
-from ..db.repository import WarehouseRepository
 from ..core.errors import ProviderError, RepositoryError
+from ..core.gap_detection import (
+    TIMEFRAME_TO_SECONDS,
+    chunk_ranges,
+    coalesce_ranges,
+    common_ranges,
+    expected_slot_count,
+    intersect_ranges,
+    missing_ranges_outside,
+    subtract_ranges,
+)
+from ..core.rate_limit import TokenBucket
+from ..core.serialization import dumps
+from ..core.time_utils import date_to_epoch, epochs_to_ist_iso
+from ..db.repository import WarehouseRepository
 from ..schemas.ohlcv_data import OHLCVCandle
 from ..schemas.requests import (
     AddStockRequest,
     BulkAddRequest,
+    CsvAddStockRequest,
     DeleteStockRequest,
     EpochRange,
     GapFillRequest,
@@ -26,50 +42,272 @@ from ..schemas.requests import (
     UpdateAllRequest,
     UpdateStockRequest,
 )
-from typing import cast
+from .bulk_ingest import _BulkIngestPipeline
+
+logger = logging.getLogger(__name__)
+
+# Validates a whole bulk CSV in one pydantic-core pass.
+_ADD_REQUEST_LIST = TypeAdapter(list[CsvAddStockRequest])
+
+# Buffered candle count at which bulk jobs flush to the database.
+BULK_FLUSH_ROWS = 10_000
+
+# A planned bulk add row: (row number, request, range, error if all empty).
+_BulkAddRow = tuple[int, AddStockRequest, EpochRange, str]
+
+# Candles built and upserted at a time when streaming a provider range.
+STREAM_PAGE_SIZE = 5_000
+
+# Read ranges remembered as already populated, and for how long.
+HYDRATED_CACHE_SIZE = 4096
+HYDRATED_TTL_SECONDS = 300.0
+
+# Minimum seconds between logged tracebacks for one ticker's failed gaps.
+ERROR_LOG_INTERVAL = 60.0
+
+# Timeframes whose ranges are re-fetched whole instead of gap by gap.
+COARSE_TIMEFRAMES = frozenset({"1d", "1w", "1M"})
+
+# Share of a stored daily range's weekday slots that may be missing (market
+# holidays) before the range counts as incomplete.
+DAILY_HOLIDAY_SHARE = 0.1
+
+# Gaps at most this many candles apart are fetched as one range.
+GAP_MERGE_SLOTS = 50
+
+# Longest range requested from the provider in one call, per intraday timeframe.
+GAP_CHUNK_SECONDS: dict[str, int] = {
+    "1m": 30 * 86400,
+    "5m": 30 * 86400,
+    "15m": 30 * 86400,
+    "1h": 120 * 86400,
+    "4h": 120 * 86400,
+}
+
+
+def _progress_pct(done: int, total: int, empty: int = 0) -> int:
+    """Integer percentage of `done` out of `total`, floored and capped at 100."""
+    if not total:
+        return empty
+    return min(100, (done * 100) // total)
 
 
 class JobStore:
-    """Persistent store for tracking asynchronous job state and lifecycle."""
+    """Persistent store for tracking asynchronous job state and lifecycle.
+
+    Jobs are only written through this store, so the last payload written for
+    each job is kept in a small write-through cache. Progress updates merge
+    into that copy instead of re-reading the row before and after every write.
+
+    When `writer_repository` is given, updates are queued and persisted by a
+    background thread through that repository (which should own a separate
+    connection) in batches, so job threads never block on progress writes.
+    Terminal statuses are flushed before `update` returns.
+
+    Without a background writer, `get` serves the cached payload for
+    `read_ttl` seconds before re-reading the row, so status polling does not
+    hit the database on every request.
+    """
+
+    _TERMINAL_STATUSES = frozenset({"completed", "failed"})
 
-    def __init__(self, repository: WarehouseRepository):
+    def __init__(
+        self,
+        repository: WarehouseRepository,
+        cache_size: int = 1024,
+        writer_repository: WarehouseRepository | None = None,
+        batch_size: int = 256,
+        flush_interval: float = 0.1,
+        read_ttl: float = 0.5,
+    ):
         self.repository = repository
+        self.cache_size = max(1, cache_size)
+        self.read_ttl = max(0.0, read_ttl)
+        self._cache: OrderedDict[str, dict] = OrderedDict()
+        self._cached_at: dict[str, float] = {}
+        # Cached jobs whose last write failed; their next update is written
+        # whole even if nothing changed.
+        self._unsynced: set[str] = set()
+        self._lock = threading.Lock()
+        self._writer_repository = writer_repository
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = max(0.0, flush_interval)
+        self._queue: queue.Queue[tuple[str, str, dict] | None] | None = None
+        self._writer: threading.Thread | None = None
+        if writer_repository is not None:
+            self._queue = queue.Queue(maxsize=10000)
+            self._writer = threading.Thread(
+                target=self._drain, name="dw-job-writer", daemon=True
+            )
+            self._writer.start()
+
+    def _remember(self, job_id: str, payload: dict) -> None:
+        self._cache[job_id] = payload
+        self._cache.move_to_end(job_id)
+        self._cached_at[job_id] = time.monotonic()
+        while len(self._cache) > self.cache_size:
+            evicted, _ = self._cache.popitem(last=False)
+            self._cached_at.pop(evicted, None)
+            self._unsynced.discard(evicted)
 
     def create(self, job_type: str) -> dict:
-        job_id = str(uuid.uuid4())
+        job_id = uuid.uuid4().hex
+        now = int(time.time())
+        payload = {
+            "job_id": job_id,
+            "job_type": job_type,
+            "status": "queued",
+            "created_at": now,
+            "updated_at": now,
+        }
         try:
             self.repository.create_job(job_id, job_type, "queued")
-            stored = self.repository.get_job(job_id)
-            if stored:
-                return stored
         except Exception:
-            pass
-        return {"job_id": job_id, "job_type": job_type, "status": "queued"}
+            return {"job_id": job_id, "job_type": job_type, "status": "queued"}
+        with self._lock:
+            self._remember(job_id, payload)
+        return dict(payload)
 
     def update(self, job_id: str, **kwargs) -> dict:
         status = kwargs.pop("status", None)
-        try:
-            payload = self.repository.get_job(job_id) or {}
-        except Exception:
-            payload = {}
-        payload.update(kwargs)
-        if status is None:
-            status = payload.get("status", "queued")
-        try:
-            self.repository.update_job(job_id, status, payload)
-            stored = self.repository.get_job(job_id)
-            if stored:
-                return stored
-        except Exception:
-            pass
-        payload["status"] = status
-        return payload
+        with self._lock:
+            cached = self._cache.get(job_id)
+            if cached is not None:
+                unchanged = (status is None or status == cached.get("status")) and all(
+                    key in cached and cached[key] == value
+                    for key, value in kwargs.items()
+                )
+                if unchanged and job_id not in self._unsynced:
+                    # Nothing changes; skip the write entirely.
+                    return dict(cached)
+                payload = dict(cached)
+            elif self._queue is None:
+                # Merge inside the database rather than read, merge and write.
+                try:
+                    merged = self.repository.merge_job(job_id, status, kwargs)
+                except Exception:
+                    logger.exception("Failed to update job %s", job_id)
+                    merged = None
+                if merged is None:
+                    return {"job_id": job_id, **kwargs, "status": status or "queued"}
+                self._remember(job_id, merged)
+                return dict(merged)
+            else:
+                try:
+                    payload = self.repository.get_job(job_id) or {}
+                except Exception:
+                    payload = {}
+            payload.update(kwargs)
+            if status is None:
+                status = payload.get("status", "queued")
+            payload["status"] = status
+            if self._queue is None:
+                try:
+                    if cached is not None and job_id not in self._unsynced:
+                        # The row already holds the cached payload; send the delta.
+                        self.repository.patch_job(job_id, status, kwargs)
+                    else:
+                        self.repository.update_job_raw(job_id, status, dumps(payload))
+                except Exception:
+                    logger.exception("Failed to update job %s", job_id)
+                    self._unsynced.add(job_id)
+                else:
+                    self._unsynced.discard(job_id)
+            payload["updated_at"] = int(time.time())
+            self._remember(job_id, payload)
+            result = dict(payload)
+            if self._queue is not None:
+                # Enqueue under the lock so writes reach the queue in order.
+                self._queue.put((job_id, status, result))
+        if self._queue is not None and status in self._TERMINAL_STATUSES:
+            self.flush()
+        return dict(result)
+
+    def flush(self) -> None:
+        """Block until every queued update has been written."""
+        if self._queue is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Flush pending updates and stop the background writer."""
+        if self._queue is None or self._writer is None:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._queue = None
+        self._writer = None
+
+    def _drain(self) -> None:
+        job_queue = self._queue
+        assert job_queue is not None and self._writer_repository is not None
+        stopping = False
+        while not stopping:
+            entries = [job_queue.get()]
+            deadline = time.monotonic() + self._flush_interval
+            while len(entries) < self._batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entries.append(job_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            # Only the newest payload per job needs to reach the database.
+            latest: dict[str, tuple[str, str, dict]] = {}
+            for entry in entries:
+                if entry is None:
+                    stopping = True
+                    continue
+                latest[entry[0]] = entry
+            try:
+                if latest:
+                    self._writer_repository.update_jobs_batch(latest.values())
+            except Exception:
+                logger.exception("Failed to persist %s job updates", len(latest))
+                self._persist_each(latest.values())
+            else:
+                # Set updates are atomic; taking `_lock` here could deadlock
+                # against `update` blocking on a full queue.
+                self._unsynced.difference_update(latest)
+            finally:
+                for _ in entries:
+                    job_queue.task_done()
+
+    def _persist_each(self, entries: Iterable[tuple[str, str, dict]]) -> None:
+        """Write entries one at a time after their batch failed.
+
+        Runs before the batch is marked done, so a terminal status is
+        retried before `flush` returns. Jobs still failing are marked unsynced.
+        """
+        assert self._writer_repository is not None
+        for entry in entries:
+            try:
+                self._writer_repository.update_jobs_batch([entry])
+            except Exception:
+                logger.exception("Failed to persist job %s", entry[0])
+                self._unsynced.add(entry[0])
+            else:
+                self._unsynced.discard(entry[0])
 
     def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            cached = self._cache.get(job_id)
+            if cached is not None and (
+                self._queue is not None
+                or time.monotonic() - self._cached_at[job_id] < self.read_ttl
+            ):
+                return dict(cached)
         try:
-            return self.repository.get_job(job_id)
+            payload = self.repository.get_job(job_id)
         except Exception:
             return None
+        if payload is not None:
+            with self._lock:
+                # Skip the refresh if an update replaced the entry meanwhile.
+                if self._cache.get(job_id) is cached:
+                    self._remember(job_id, payload)
+            return dict(payload)
+        return None
 
     def list(
         self,
@@ -86,6 +324,79 @@ class JobStore:
             return []
 
 
+class MemoryJobStore:
+    """Job store that keeps state in memory only.
+
+    Used for sub-jobs whose progress is reported through a parent job, so
+    they do not each create and update their own row.
+    """
+
+    def __init__(self) -> None:
+        self._jobs: dict[str, dict] = {}
+
+    def update(self, job_id: str, **kwargs) -> dict:
+        payload = self._jobs.setdefault(job_id, {"job_id": job_id})
+        payload.update(kwargs)
+        return dict(payload)
+
+    def get(self, job_id: str) -> dict | None:
+        payload = self._jobs.get(job_id)
+        return dict(payload) if payload is not None else None
+
+    def pop(self, job_id: str) -> dict:
+        return self._jobs.pop(job_id, {"job_id": job_id})
+
+
+class JobProgressBuffer:
+    """Coalesce frequent progress updates for one job into fewer writes.
+
+    Fields passed to `record` are merged (latest value wins) and written
+    with a single `job_store.update` once `max_pending` records have
+    accumulated or `max_interval` seconds have passed since the last write.
+    Call `flush` before changing the job status.
+
+    When `total` is set, `progress_pct` is derived from the latest
+    `processed_count` once per write rather than computed on every record.
+    """
+
+    def __init__(
+        self,
+        job_store: JobStore | MemoryJobStore,
+        job_id: str,
+        max_pending: int = 50,
+        max_interval: float = 1.0,
+        total: int | None = None,
+    ) -> None:
+        self.job_store = job_store
+        self.job_id = job_id
+        self.max_pending = max_pending
+        self.max_interval = max_interval
+        self.total = total
+        self._pending: dict = {}
+        self._records = 0
+        self._flushed_at = time.monotonic()
+
+    def record(self, **fields) -> None:
+        self._pending.update(fields)
+        self._records += 1
+        if (
+            self._records >= self.max_pending
+            or time.monotonic() - self._flushed_at >= self.max_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            if self.total is not None and "processed_count" in self._pending:
+                self._pending["progress_pct"] = _progress_pct(
+                    self._pending["processed_count"], self.total, empty=100
+                )
+            self.job_store.update(self.job_id, **self._pending)
+            self._pending = {}
+        self._records = 0
+        self._flushed_at = time.monotonic()
+
+
 class WarehouseService:
     def __init__(
         self,
@@ -93,16 +404,169 @@ class WarehouseService:
         provider: OpenAlgoProvider,
         job_store: JobStore,
         clock: Callable[[], int] | None = None,
+        provider_limiter: TokenBucket | None = None,
+        max_fetch_workers: int = 1,
     ):
         self.repository = repository
         self.provider = provider
         self.job_store = job_store
         self.clock = clock or (lambda: int(time.time()))
+        self.provider_limiter = provider_limiter
+        self.max_fetch_workers = max(1, max_fetch_workers)
+        # (ticker, timeframe, start, end) -> monotonic expiry of the marker.
+        self._hydrated: OrderedDict[tuple[str, str, int, int], float] = (
+            OrderedDict()
+        )
+        self._hydrated_lock = threading.Lock()
+        self._default_range: EpochRange | None = None
 
     def default_range(self) -> EpochRange:
+        """Return the trailing one-year range, reused within the same second."""
         end_epoch = self.clock()
-        start_epoch = end_epoch - 365 * 24 * 60 * 60
-        return EpochRange(start_epoch=start_epoch, end_epoch=end_epoch)
+        cached = self._default_range
+        if cached is not None and cached.end_epoch == end_epoch:
+            return cached
+        # The bounds are ordered by construction, so skip model validation.
+        cached = EpochRange.model_construct(
+            start_epoch=end_epoch - 365 * 24 * 60 * 60, end_epoch=end_epoch
+        )
+        self._default_range = cached
+        return cached
+
+    def _fetch_ohlcv(
+        self,
+        ticker: str,
+        timeframe: str,
+        start_epoch: int,
+        end_epoch: int,
+        exchange: str | None = None,
+    ) -> list[OHLCVCandle]:
+        if self.provider_limiter is not None:
+            self.provider_limiter.acquire()
+        return self.provider.fetch_ohlcv(
+            ticker=ticker,
+            timeframe=timeframe,
+            start_epoch=start_epoch,
+            end_epoch=end_epoch,
+            exchange=exchange,
+        )
+
+    def _iter_ohlcv(
+        self,
+        ticker: str,
+        timeframe: str,
+        start_epoch: int,
+        end_epoch: int,
+        exchange: str | None = None,
+    ) -> Iterator[list[OHLCVCandle]]:
+        """Yield provider candles in pages, streaming when the provider can."""
+        if self.provider_limiter is not None:
+            self.provider_limiter.acquire()
+        iter_pages = getattr(self.provider, "iter_ohlcv", None)
+        if iter_pages is not None:
+            yield from iter_pages(
+                ticker=ticker,
+                timeframe=timeframe,
+                start_epoch=start_epoch,
+                end_epoch=end_epoch,
+                exchange=exchange,
+                page_size=STREAM_PAGE_SIZE,
+            )
+            return
+        candles = self.provider.fetch_ohlcv(
+            ticker=ticker,
+            timeframe=timeframe,
+            start_epoch=start_epoch,
+            end_epoch=end_epoch,
+            exchange=exchange,
+        )
+        for offset in range(0, len(candles), STREAM_PAGE_SIZE):
+            yield candles[offset : offset + STREAM_PAGE_SIZE]
+
+    def _stream_ohlcv_into_store(
+        self,
+        ticker: str,
+        timeframe: str,
+        start_epoch: int,
+        end_epoch: int,
+        exchange: str | None = None,
+    ) -> tuple[int, int]:
+        """Fetch a range and upsert it page by page.
+
+        Returns `(fetched, inserted)`. Provider failures are raised as
+        `ProviderError`; repository failures propagate unchanged.
+        """
+        fetched = 0
+        inserted = 0
+        for page in self._provider_pages(
+            ticker=ticker,
+            timeframe=timeframe,
+            start_epoch=start_epoch,
+            end_epoch=end_epoch,
+            exchange=exchange,
+        ):
+            fetched += len(page)
+            inserted += self.repository.upsert_ohlcv_batch(
+                ticker=ticker,
+                timeframe=timeframe,
+                candles=page,
+            )
+        return fetched, inserted
+
+    def _fetch_range(
+        self,
+        ticker: str,
+        timeframe: str,
+        start_epoch: int,
+        end_epoch: int,
+        exchange: str | None = None,
+        log_errors: bool = True,
+    ) -> list[OHLCVCandle]:
+        """Fetch a whole range, raising provider failures as `ProviderError`."""
+        return [
+            candle
+            for page in self._provider_pages(
+                ticker=ticker,
+                timeframe=timeframe,
+                start_epoch=start_epoch,
+                end_epoch=end_epoch,
+                exchange=exchange,
+                log_errors=log_errors,
+            )
+            for candle in page
+        ]
+
+    def _provider_pages(
+        self,
+        ticker: str,
+        timeframe: str,
+        start_epoch: int,
+        end_epoch: int,
+        exchange: str | None = None,
+        log_errors: bool = True,
+    ) -> Iterator[list[OHLCVCandle]]:
+        """Wrap `_iter_ohlcv`, raising provider failures as `ProviderError`.
+
+        Callers that aggregate failures themselves pass `log_errors=False`
+        to skip formatting a traceback for every failed fetch.
+        """
+        pages = self._iter_ohlcv(
+            ticker=ticker,
+            timeframe=timeframe,
+            start_epoch=start_epoch,
+            end_epoch=end_epoch,
+            exchange=exchange,
+        )
+        while True:
+            try:
+                page = next(pages, None)
+            except Exception as exc:
+                if log_errors:
+                    logger.exception("Provider fetch failed")
+                raise ProviderError("Provider fetch failed") from exc
+            if page is None:
+                return
+            yield page
 
     def enqueue_add(self, request: AddStockRequest) -> dict:
         return self.job_store.create("add")
@@ -122,101 +586,75 @@ class WarehouseService:
     def enqueue_gap_fill(self, request: GapFillRequest) -> dict:
         return self.job_store.create("gap_fill")
 
-    def process_add(self, job_id: str, request: AddStockRequest) -> None:
+    def process_add(
+        self,
+        job_id: str,
+        request: AddStockRequest,
+        job_store: JobStore | MemoryJobStore | None = None,
+    ) -> dict:
+        """Fetch and store the requested range, filling only missing gaps.
+
+        Returns the final job payload so callers need not read it back.
+        """
+        if job_store is None:
+            job_store = self.job_store
         selected_range: EpochRange = self.default_range()
         exchange = "NSE_INDEX" if request.is_index else None
         try:
-            self.job_store.update(job_id, status="running")
+            job_store.update(job_id, status="running")
             self.repository.ensure_ticker(request.ticker)
             if request.range is not None:
                 selected_range = request.range
             if request.start_date and request.end_date:
-                start_epoch = int(
-                    datetime.combine(
-                        request.start_date, datetime.min.time()
-                    ).timestamp()
-                )
-                end_epoch = int(
-                    datetime.combine(request.end_date, datetime.max.time()).timestamp()
-                )
+                start_epoch = date_to_epoch(request.start_date)
+                end_epoch = date_to_epoch(request.end_date, end_of_day=True)
                 selected_range = EpochRange(
                     start_epoch=start_epoch, end_epoch=end_epoch
                 )
 
-            self.job_store.update(
+            job_store.update(
                 job_id,
                 selected_range=selected_range.model_dump(),
                 current_ticker=request.ticker,
                 current_timeframe=request.timeframe,
             )
 
-            has_existing_data = (
-                self.repository.get_last_epoch(request.ticker, request.timeframe)
-                is not None
+            coverage = self.repository.get_range_coverage(
+                request.ticker, request.timeframe
             )
 
-            if not has_existing_data:
-                try:
-                    candles = self.provider.fetch_ohlcv(
-                        ticker=request.ticker,
-                        timeframe=request.timeframe,
-                        start_epoch=selected_range.start_epoch,
-                        end_epoch=selected_range.end_epoch,
-                        exchange=exchange,
-                    )
-                except Exception as exc:
-                    logger.exception("Provider fetch failed")
-                    raise ProviderError("Provider fetch failed") from exc
-
-                self.job_store.update(
-                    job_id,
-                    fetched_count=len(candles),
-                    message="initial fetch",
-                )
-
-                inserted = self.repository.upsert_ohlcv_batch(
+            if coverage is None:
+                fetched_count, inserted = self._stream_ohlcv_into_store(
                     ticker=request.ticker,
                     timeframe=request.timeframe,
-                    candles=candles,
+                    start_epoch=selected_range.start_epoch,
+                    end_epoch=selected_range.end_epoch,
+                    exchange=exchange,
+                )
+                job_store.update(
+                    job_id,
+                    fetched_count=fetched_count,
+                    message="initial fetch",
                 )
                 if inserted == 0:
-                    self.job_store.update(
+                    return job_store.update(
                         job_id,
                         status="failed",
                         error="no candles returned for requested range",
                     )
-                    return
 
-                self.job_store.update(
+                return job_store.update(
                     job_id,
                     status="completed",
                     inserted=inserted,
                     gaps_filled=0,
                     message="full range inserted",
                 )
-                return
 
-            interval = TIMEFRAME_TO_SECONDS[request.timeframe]
-            existing_epochs = self.repository.get_existing_epochs(
-                ticker=request.ticker,
-                timeframe=request.timeframe,
-                start_epoch=selected_range.start_epoch,
-                end_epoch=selected_range.end_epoch,
-            )
-
-            gaps = detect_missing_ranges(
-                start_epoch=selected_range.start_epoch,
-                end_epoch=selected_range.end_epoch,
-                existing_epochs=existing_epochs,
-                interval_seconds=interval,
+            gaps = self._add_gaps(
+                request.ticker, request.timeframe, selected_range, coverage
             )
-
-            if request.timeframe in {"1d", "1w", "1M"} and len(gaps) > 1:
-                gaps = [(selected_range.start_epoch, selected_range.end_epoch)]
-            elif gaps:
-                gaps = self._chunk_gaps(gaps, request.timeframe)
-
-            self.job_store.update(
+            job_store.update(
                 job_id,
                 gap_count=len(gaps),
                 message="gap scan complete" if gaps else "no gaps found",
@@ -224,47 +662,36 @@ class WarehouseService:
 
             inserted = 0
             if gaps:
-                for gap_start, gap_end in gaps:
-                    try:
-                        candles = self.provider.fetch_ohlcv(
-                            ticker=request.ticker,
-                            timeframe=request.timeframe,
-                            start_epoch=gap_start,
-                            end_epoch=gap_end,
-                            exchange=exchange,
-                        )
-                    except Exception as exc:
-                        logger.exception("Provider fetch failed")
-                        raise ProviderError("Provider fetch failed") from exc
-                    self.job_store.update(
+                update = job_store.update
+                for gap_start, gap_end, fetched_count, gap_inserted in self._fill_gaps(
+                    ticker=request.ticker,
+                    timeframe=request.timeframe,
+                    gaps=gaps,
+                    exchange=exchange,
+                ):
+                    update(
                         job_id,
                         current_gap={
                             "start_epoch": gap_start,
                             "end_epoch": gap_end,
                         },
-                        fetched_count=len(candles),
-                    )
-                    inserted += self.repository.upsert_ohlcv_batch(
-                        ticker=request.ticker,
-                        timeframe=request.timeframe,
-                        candles=candles,
+                        fetched_count=fetched_count,
                     )
+                    inserted += gap_inserted
                 if inserted == 0:
-                    self.job_store.update(
+                    return job_store.update(
                         job_id,
                         status="failed",
                         error="no candles returned for requested gaps",
                     )
-                    return
-                self.job_store.update(
+                return job_store.update(
                     job_id,
                     status="completed",
                     inserted=inserted,
                     gaps_filled=len(gaps),
                 )
-                return
 
-            self.job_store.update(
+            return job_store.update(
                 job_id,
                 status="completed",
                 inserted=0,
@@ -279,7 +706,7 @@ class WarehouseService:
                 start_epoch=selected_range.start_epoch,
                 end_epoch=selected_range.end_epoch,
             )
-            self.job_store.update(job_id, status="failed", error=str(exc))
+            return job_store.update(job_id, status="failed", error=str(exc))
         except Exception as exc:
             logger.exception("Add job failed")
             self.repository.create_failed_ingestion(
@@ -289,52 +716,164 @@ class WarehouseService:
                 start_epoch=selected_range.start_epoch,
                 end_epoch=selected_range.end_epoch,
             )
-            self.job_store.update(job_id, status="failed", error="unexpected error")
+            return job_store.update(
+                job_id, status="failed", error="unexpected error"
+            )
+
+    def _add_gaps(
+        self,
+        ticker: str,
+        timeframe: str,
+        selected_range: EpochRange,
+        coverage: tuple[int, int] | None = None,
+    ) -> list[tuple[int, int]]:
+        """Return the ranges an add request must fetch for a stored pair.
+
+        `coverage` is the pair's `(first, last)` stored epoch; a range lying
+        wholly outside it has no stored candles, so the scan is skipped.
+        """
+        interval = TIMEFRAME_TO_SECONDS[timeframe]
+        disjoint = coverage is not None and (
+            selected_range.end_epoch < coverage[0]
+            or selected_range.start_epoch > coverage[1]
+        )
+        if timeframe in COARSE_TIMEFRAMES:
+            return self._coarse_add_gaps(
+                ticker, timeframe, selected_range, None if disjoint else coverage
+            )
+        if disjoint:
+            gaps = missing_ranges_outside(
+                selected_range.start_epoch, selected_range.end_epoch, [], interval
+            )
+        else:
+            gaps = self.repository.get_missing_ranges(
+                ticker=ticker,
+                timeframe=timeframe,
+                start_epoch=selected_range.start_epoch,
+                end_epoch=selected_range.end_epoch,
+                interval_seconds=interval,
+            )
+        if not gaps:
+            return []
+        # Nearby gaps become one request; re-fetching the few stored
+        # candles between them is cheaper than a round-trip.
+        gaps = coalesce_ranges(gaps, interval * GAP_MERGE_SLOTS)
+        return self._chunk_gaps(gaps, timeframe)
+
+    def _coarse_add_gaps(
+        self,
+        ticker: str,
+        timeframe: str,
+        selected_range: EpochRange,
+        coverage: tuple[int, int] | None,
+    ) -> list[tuple[int, int]]:
+        """Return the ranges a daily or wider add must fetch.
+
+        These ranges are cheap to re-fetch whole, so a count comparison
+        against the stored coverage replaces the per-epoch gap scan. Daily
+        ranges may miss up to `DAILY_HOLIDAY_SHARE` of their weekday slots
+        inside the coverage, since market holidays have no candles.
+        """
+        start, end = selected_range.start_epoch, selected_range.end_epoch
+        if coverage is None:
+            return [(start, end)]
+        interval = TIMEFRAME_TO_SECONDS[timeframe]
+        # Slots a whole interval before the first stored candle, or after
+        # the last one, cannot be candles already held.
+        before = expected_slot_count(start, coverage[0] - interval, interval)
+        after = expected_slot_count(coverage[1] + interval, end, interval)
+        if before or after:
+            return [(start, end)]
+        inner_start, inner_end = max(start, coverage[0]), min(end, coverage[1])
+        expected = expected_slot_count(inner_start, inner_end, interval)
+        allowance = 0
+        if timeframe == "1d":
+            allowance = int(expected * DAILY_HOLIDAY_SHARE)
+        stored = self.repository.get_ohlcv_count(
+            ticker=ticker,
+            timeframe=timeframe,
+            start_epoch=inner_start,
+            end_epoch=inner_end,
+        )
+        if stored + allowance < expected:
+            return [(start, end)]
+        return []
+
+    def _fill_gaps(
+        self,
+        ticker: str,
+        timeframe: str,
+        gaps: list[tuple[int, int]],
+        exchange: str | None = None,
+    ) -> Iterator[tuple[int, int, int, int]]:
+        """Fetch and store each gap, yielding `(start, end, fetched, inserted)`.
+
+        Several gaps are fetched concurrently on up to `max_fetch_workers`
+        threads (still paced by the provider limiter) and written in order
+        from the calling thread. A lone gap, or a single worker, streams
+        page by page instead.
+        """
+        if len(gaps) < 2 or self.max_fetch_workers < 2:
+            for gap_start, gap_end in gaps:
+                fetched, inserted = self._stream_ohlcv_into_store(
+                    ticker=ticker,
+                    timeframe=timeframe,
+                    start_epoch=gap_start,
+                    end_epoch=gap_end,
+                    exchange=exchange,
+                )
+                yield gap_start, gap_end, fetched, inserted
+            return
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_fetch_workers, len(gaps)),
+            thread_name_prefix="dw-add-fetch",
+        )
+        try:
+            futures = [
+                (
+                    gap_start,
+                    gap_end,
+                    executor.submit(
+                        self._fetch_range,
+                        ticker=ticker,
+                        timeframe=timeframe,
+                        start_epoch=gap_start,
+                        end_epoch=gap_end,
+                        exchange=exchange,
+                    ),
+                )
+                for gap_start, gap_end in gaps
+            ]
+            for gap_start, gap_end, future in futures:
+                candles = future.result()
+                inserted = (
+                    self.repository.upsert_ohlcv_batch(
+                        ticker=ticker, timeframe=timeframe, candles=candles
+                    )
+                    if candles
+                    else 0
+                )
+                yield gap_start, gap_end, len(candles), inserted
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
     def _chunk_gaps(
         self, gaps: list[tuple[int, int]], timeframe: str
     ) -> list[tuple[int, int]]:
         if not gaps:
             return []
-        chunk_days = {
-            "1m": 30,
-            "5m": 30,
-            "15m": 30,
-            "1h": 120,
-            "4h": 120,
-        }.get(timeframe)
-        if not chunk_days:
+        max_span = GAP_CHUNK_SECONDS.get(timeframe)
+        if not max_span:
             return gaps
-        max_span = chunk_days * 24 * 60 * 60
-        chunked: list[tuple[int, int]] = []
-        for start, end in gaps:
-            current = start
-            while current <= end:
-                chunk_end = min(current + max_span - 1, end)
-                chunked.append((current, chunk_end))
-                current = chunk_end + 1
-        return chunked
+        return chunk_ranges(gaps, max_span)
 
     def _intersect_ranges(
         self,
         primary: list[tuple[int, int]],
         secondary: list[tuple[int, int]],
     ) -> list[tuple[int, int]]:
-        intersections: list[tuple[int, int]] = []
-        i = 0
-        j = 0
-        while i < len(primary) and j < len(secondary):
-            start_a, end_a = primary[i]
-            start_b, end_b = secondary[j]
-            start = max(start_a, start_b)
-            end = min(end_a, end_b)
-            if start <= end:
-                intersections.append((start, end))
-            if end_a < end_b:
-                i += 1
-            else:
-                j += 1
-        return intersections
+        return intersect_ranges(primary, secondary)
 
     def _subtract_ranges(
         self,
@@ -343,28 +882,7 @@ class WarehouseService:
     ) -> list[tuple[int, int]]:
         if not source or not exclusions:
             return source
-        remaining: list[tuple[int, int]] = []
-        exclusion_index = 0
-        for start, end in source:
-            current_start = start
-            while (
-                exclusion_index < len(exclusions)
-                and exclusions[exclusion_index][1] < current_start
-            ):
-                exclusion_index += 1
-            scan_index = exclusion_index
-            while scan_index < len(exclusions) and exclusions[scan_index][0] <= end:
-                exclude_start, exclude_end = exclusions[scan_index]
-                if exclude_start > current_start:
-                    remaining.append((current_start, min(end, exclude_start - 1)))
-                if exclude_end >= end:
-                    current_start = end + 1
-                    break
-                current_start = exclude_end + 1
-                scan_index += 1
-            if current_start <= end:
-                remaining.append((current_start, end))
-        return remaining
+        return subtract_ranges(source, exclusions)
 
     def process_update(self, job_id: str, request: UpdateStockRequest) -> None:
         try:
@@ -374,7 +892,8 @@ class WarehouseService:
                 request.ticker, request.timeframe
             )
             if last_epoch is None:
-                add_request = AddStockRequest(
+                # UpdateStockRequest already validated these fields.
+                add_request = AddStockRequest.model_construct(
                     ticker=request.ticker,
                     timeframe=request.timeframe,
                     is_index=request.is_index,
@@ -386,7 +905,7 @@ class WarehouseService:
             start_epoch = last_epoch + interval
             end_epoch = self.clock()
             try:
-                candles = self.provider.fetch_ohlcv(
+                candles = self._fetch_ohlcv(
                     ticker=request.ticker,
                     timeframe=request.timeframe,
                     start_epoch=start_epoch,
@@ -428,16 +947,13 @@ class WarehouseService:
                     current_ticker=ticker,
                     current_timeframe=request.timeframe,
                     processed_count=index - 1,
-                    progress_pct=min(100, int(round(((index - 1) / total) * 100)))
-                    if total
-                    else 0,
+                    progress_pct=_progress_pct(index - 1, total),
                 )
                 update_request = UpdateStockRequest(
                     ticker=ticker, timeframe=request.timeframe
                 )
                 update_job = self.job_store.create("update")
                 self.process_update(update_job["job_id"], update_request)
-                time.sleep(0.2)
 
             self.job_store.update(
                 job_id,
@@ -453,6 +969,7 @@ class WarehouseService:
             self.job_store.update(job_id, status="failed", error="unexpected error")
 
     def process_bulk_add(self, job_id: str, request: BulkAddRequest) -> None:
+        progress = JobProgressBuffer(self.job_store, job_id, total=len(request.rows))
         try:
             total = len(request.rows)
             self.job_store.update(
@@ -462,88 +979,149 @@ class WarehouseService:
                 processed_count=0,
                 progress_pct=0,
             )
-            successes = 0
-            failures: list[dict] = []
-
-            for index, row in enumerate(request.rows, start=1):
-                progress_pct = (
-                    min(100, int(round(((index - 1) / total) * 100))) if total else 0
-                )
-                self.job_store.update(
-                    job_id,
-                    current_ticker=row.ticker,
-                    current_timeframe=row.timeframe,
-                    total_count=total,
-                    processed_count=index - 1,
-                    progress_pct=progress_pct,
-                )
-                try:
-                    add_request = AddStockRequest(
-                        ticker=row.ticker,
-                        timeframe=row.timeframe,
-                        range=row.range,
-                    )
-                    nested_job = self.job_store.create("bulk_item")
-                    self.process_add(nested_job["job_id"], add_request)
-                    successes += 1
-                except Exception as exc:
-                    failures.append({"row": index - 1, "error": str(exc)})
-                progress_pct = (
-                    min(100, int(round((index / total) * 100))) if total else 100
-                )
-                self.job_store.update(
-                    job_id,
-                    current_ticker=row.ticker,
-                    current_timeframe=row.timeframe,
-                    total_count=total,
-                    processed_count=index,
-                    progress_pct=progress_pct,
-                )
-
+            successes, failure_count = self._bulk_add_rows(job_id, request, progress)
+            progress.flush()
             self.job_store.update(
                 job_id,
                 status="completed",
                 success_count=successes,
-                failure_count=len(failures),
-                failures=failures,
+                failure_count=failure_count,
             )
         except (RepositoryError, ProviderError) as exc:
             logger.exception("Bulk add job failed")
+            progress.flush()
             self.job_store.update(job_id, status="failed", error=str(exc))
         except Exception as exc:
             logger.exception("Bulk add job failed")
+            progress.flush()
             self.job_store.update(job_id, status="failed", error="unexpected error")
 
-    def process_bulk_csv(self, job_id: str, rows: list[dict]) -> None:
+    def _bulk_add_rows(
+        self, job_id: str, request: BulkAddRequest, progress: JobProgressBuffer
+    ) -> tuple[int, int]:
+        """Run bulk add rows with provider fetches overlapped across rows.
+
+        Each row is planned (ticker, stored candles, gaps) and written on
+        this thread, like `process_bulk_csv`, while its fetches run on up to
+        `max_fetch_workers` threads. Fetched candles are buffered and written
+        in bounded multi-ticker transactions. Row outcomes match
+        `process_add`. Returns `(successes, failures)`.
+        """
+        successes = 0
+        # Failures are written in two batches once the rows are done.
+        row_failures: list[tuple[int, str]] = []
+        ingestion_failures: list[tuple[str, str, str, int | None, int | None]] = []
+
+        def _fail(row: _BulkAddRow, error: str, record: bool) -> None:
+            index, add_request, selected_range, _ = row
+            if record:
+                ingestion_failures.append(
+                    (
+                        add_request.ticker,
+                        add_request.timeframe,
+                        error,
+                        selected_range.start_epoch,
+                        selected_range.end_epoch,
+                    )
+                )
+            row_failures.append((index - 1, error))
+
+        def _record(row: _BulkAddRow) -> None:
+            index, add_request, _, _ = row
+            progress.record(
+                current_ticker=add_request.ticker,
+                current_timeframe=add_request.timeframe,
+                processed_count=index,
+            )
+
+        def _on_complete(row: _BulkAddRow, fetched: list[list[OHLCVCandle]]) -> None:
+            nonlocal successes
+            if fetched and not any(fetched):
+                _fail(row, row[3], record=False)
+            else:
+                successes += 1
+            _record(row)
+
+        def _on_error(row: _BulkAddRow, exc: Exception) -> None:
+            if isinstance(exc, (RepositoryError, ProviderError)):
+                _fail(row, str(exc), record=True)
+            else:
+                logger.error("Bulk add row failed", exc_info=exc)
+                _fail(row, "unexpected error", record=True)
+            _record(row)
+
+        pipeline: _BulkIngestPipeline[_BulkAddRow] = _BulkIngestPipeline(
+            self.repository,
+            self._fetch_range,
+            on_complete=_on_complete,
+            on_error=_on_error,
+            max_workers=self.max_fetch_workers,
+            flush_rows=BULK_FLUSH_ROWS,
+            thread_name_prefix="dw-bulk-add-fetch",
+        )
         try:
-            self.job_store.update(job_id, status="running")
-            failures: list[dict] = []
-            requests: list[AddStockRequest] = []
+            for index, row in enumerate(request.rows, start=1):
+                # BulkAddRow already ran the same field validators.
+                add_request = AddStockRequest.model_construct(
+                    ticker=row.ticker,
+                    timeframe=row.timeframe,
+                    range=row.range,
+                )
+                pair = (add_request.ticker, add_request.timeframe)
+                pipeline.settle(*pair)
 
-            for index, row in enumerate(rows):
+                selected_range = add_request.range or self.default_range()
                 try:
-                    for key in ("range", "start_date", "end_date"):
-                        if (
-                            key in row
-                            and isinstance(row[key], str)
-                            and not row[key].strip()
-                        ):
-                            row[key] = None
-                    if (
-                        "range" in row
-                        and isinstance(row["range"], str)
-                        and row["range"].strip()
-                    ):
-                        row["range"] = json.loads(row["range"])
-                    add_request = AddStockRequest.model_validate(row)
-                    requests.append(add_request)
-                except Exception as exc:
-                    failures.append({"row": index, "error": str(exc)})
+                    self.repository.ensure_ticker(add_request.ticker)
+                    coverage = self.repository.get_range_coverage(*pair)
+                    if coverage is None:
+                        ranges = self._chunk_gaps(
+                            [(selected_range.start_epoch, selected_range.end_epoch)],
+                            add_request.timeframe,
+                        )
+                        empty_error = "no candles returned for requested range"
+                    else:
+                        ranges = self._add_gaps(*pair, selected_range, coverage)
+                        empty_error = "no candles returned for requested gaps"
+                except RepositoryError as exc:
+                    pipeline.finish()
+                    failed = (index, add_request, selected_range, "")
+                    _fail(failed, str(exc), record=True)
+                    _record(failed)
+                    continue
+
+                pipeline.submit(
+                    (index, add_request, selected_range, empty_error), *pair, ranges
+                )
+            pipeline.finish()
+        finally:
+            pipeline.close()
+            # Row failures go first; they are the job's own record.
+            if row_failures:
+                self.repository.append_job_failures(job_id, row_failures)
+            if ingestion_failures:
+                self.repository.create_failed_ingestions_bulk(ingestion_failures)
+        return successes, len(row_failures)
 
-            if failures:
-                raise ValueError("Bulk CSV contains invalid rows")
+    def process_bulk_csv(self, job_id: str, rows: list[dict]) -> None:
+        progress = JobProgressBuffer(self.job_store, job_id)
+        try:
+            self.job_store.update(job_id, status="running")
+            try:
+                requests = _ADD_REQUEST_LIST.validate_python(rows)
+            except ValidationError as exc:
+                failures = [(error["loc"][0], error["msg"]) for error in exc.errors()]
+                self.repository.append_job_failures(job_id, failures)
+                self.job_store.update(
+                    job_id,
+                    status="failed",
+                    error="Bulk CSV contains invalid rows",
+                    failure_count=len(failures),
+                )
+                return
 
             total = len(requests)
+            progress.total = total
             self.job_store.update(
                 job_id,
                 status="running",
@@ -551,143 +1129,125 @@ class WarehouseService:
                 processed_count=0,
                 progress_pct=0,
             )
-            with self.repository.connection:
-                for index, add_request in enumerate(requests, start=1):
-                    progress_pct = (
-                        min(100, int(round(((index - 1) / total) * 100)))
-                        if total
-                        else 0
-                    )
-                    self.job_store.update(
-                        job_id,
-                        current_ticker=add_request.ticker,
-                        current_timeframe=add_request.timeframe,
-                        total_count=total,
-                        processed_count=index - 1,
-                        progress_pct=progress_pct,
+            # Provider fetches run on a worker pool outside any write
+            # transaction. Planning (DB reads) and writes stay on this thread
+            # because the repository shares a single SQLite connection.
+            def _on_complete(
+                row: tuple[int, AddStockRequest], fetched: list[list[OHLCVCandle]]
+            ) -> None:
+                index, add_request = row
+                progress.record(
+                    current_ticker=add_request.ticker,
+                    current_timeframe=add_request.timeframe,
+                    processed_count=index,
+                )
+
+            pipeline: _BulkIngestPipeline[tuple[int, AddStockRequest]] = (
+                _BulkIngestPipeline(
+                    self.repository,
+                    # Failures surface as ProviderError; the job logs them once.
+                    partial(self._fetch_range, log_errors=False),
+                    on_complete=_on_complete,
+                    max_workers=self.max_fetch_workers,
+                    flush_rows=BULK_FLUSH_ROWS,
+                    thread_name_prefix="dw-bulk-fetch",
+                )
+            )
+            try:
+                # Reads take a pooled connection only briefly: a flush needs
+                # a writer connection too, so holding a reader across one
+                # would deadlock a pool with a single free slot.
+                with self.repository.reader() as reader:
+                    coverages = reader.get_range_coverage_bulk(
+                        (request.ticker, request.timeframe) for request in requests
                     )
+                # One default window for the whole file, so rows without
+                # dates agree on "now" however long the job runs.
+                default_range = self.default_range()
+                intervals = {
+                    timeframe: TIMEFRAME_TO_SECONDS[timeframe]
+                    for timeframe in {request.timeframe for request in requests}
+                }
+                for index, add_request in enumerate(requests, start=1):
+                    ticker = add_request.ticker
+                    timeframe = add_request.timeframe
+                    pair = (ticker, timeframe)
+                    if pipeline.settle(*pair):
+                        with self.repository.reader() as reader:
+                            coverages[pair] = reader.get_range_coverage(*pair)
+
                     selected_range = add_request.range
                     if add_request.start_date and add_request.end_date:
-                        start_epoch = int(
-                            datetime.combine(
-                                add_request.start_date, datetime.min.time()
-                            ).timestamp()
-                        )
-                        end_epoch = int(
-                            datetime.combine(
-                                add_request.end_date, datetime.max.time()
-                            ).timestamp()
-                        )
+                        start_epoch = date_to_epoch(add_request.start_date)
+                        end_epoch = date_to_epoch(add_request.end_date, end_of_day=True)
                         selected_range = EpochRange(
                             start_epoch=start_epoch, end_epoch=end_epoch
                         )
                     if selected_range is None:
-                        selected_range = self.default_range()
+                        selected_range = default_range
 
-                    has_existing_data = (
-                        self.repository.get_last_epoch(
-                            add_request.ticker, add_request.timeframe
-                        )
-                        is not None
-                    )
-                    if not has_existing_data:
-                        candles = self.provider.fetch_ohlcv(
-                            ticker=add_request.ticker,
-                            timeframe=add_request.timeframe,
-                            start_epoch=selected_range.start_epoch,
-                            end_epoch=selected_range.end_epoch,
-                            exchange="NSE_INDEX" if add_request.is_index else None,
-                        )
-                        self.repository.upsert_ohlcv_batch(
-                            ticker=add_request.ticker,
-                            timeframe=add_request.timeframe,
-                            candles=candles,
-                            use_transaction=False,
-                        )
-                        progress_pct = (
-                            min(100, int(round((index / total) * 100)))
-                            if total
-                            else 100
-                        )
-                        self.job_store.update(
-                            job_id,
-                            current_ticker=add_request.ticker,
-                            current_timeframe=add_request.timeframe,
-                            total_count=total,
-                            processed_count=index,
-                            progress_pct=progress_pct,
+                    coverage = coverages.get(pair)
+                    if coverage is not None and (
+                        selected_range.start_epoch <= coverage[1]
+                        and selected_range.end_epoch >= coverage[0]
+                    ):
+                        interval = intervals[timeframe]
+                        with self.repository.reader() as reader:
+                            fetch_ranges = reader.get_missing_ranges(
+                                ticker=ticker,
+                                timeframe=timeframe,
+                                start_epoch=selected_range.start_epoch,
+                                end_epoch=selected_range.end_epoch,
+                                interval_seconds=interval,
+                            )
+                        # As in `_add_gaps`: nearby holes become one fetch.
+                        fetch_ranges = coalesce_ranges(
+                            fetch_ranges, interval * GAP_MERGE_SLOTS
                         )
-                        continue
-
-                    interval = TIMEFRAME_TO_SECONDS[add_request.timeframe]
-                    existing_epochs = self.repository.get_existing_epochs(
-                        ticker=add_request.ticker,
-                        timeframe=add_request.timeframe,
-                        start_epoch=selected_range.start_epoch,
-                        end_epoch=selected_range.end_epoch,
+                    else:
+                        fetch_ranges = [
+                            (selected_range.start_epoch, selected_range.end_epoch)
+                        ]
+
+                    # Bounded chunks keep each fetched list small, so a long
+                    # intraday range never sits in memory whole.
+                    pipeline.submit(
+                        (index, add_request),
+                        ticker,
+                        timeframe,
+                        self._chunk_gaps(fetch_ranges, timeframe),
+                        exchange="NSE_INDEX" if add_request.is_index else None,
                     )
 
-                    gaps = detect_missing_ranges(
-                        start_epoch=selected_range.start_epoch,
-                        end_epoch=selected_range.end_epoch,
-                        existing_epochs=existing_epochs,
-                        interval_seconds=interval,
-                    )
-
-                    if gaps:
-                        for gap_start, gap_end in gaps:
-                            candles = self.provider.fetch_ohlcv(
-                                ticker=add_request.ticker,
-                                timeframe=add_request.timeframe,
-                                start_epoch=gap_start,
-                                end_epoch=gap_end,
-                                exchange="NSE_INDEX" if add_request.is_index else None,
-                            )
-                            self.repository.upsert_ohlcv_batch(
-                                ticker=add_request.ticker,
-                                timeframe=add_request.timeframe,
-                                candles=candles,
-                                use_transaction=False,
-                            )
-                    progress_pct = (
-                        min(100, int(round((index / total) * 100))) if total else 100
-                    )
-                    self.job_store.update(
-                        job_id,
-                        current_ticker=add_request.ticker,
-                        current_timeframe=add_request.timeframe,
-                        total_count=total,
-                        processed_count=index,
-                        progress_pct=progress_pct,
-                    )
+                pipeline.drain()
+            finally:
+                pipeline.close()
+            pipeline.flush()
 
+            progress.flush()
             self.job_store.update(
                 job_id,
                 status="completed",
                 success_count=len(requests),
                 failure_count=0,
-                failures=[],
             )
         except (RepositoryError, ProviderError) as exc:
             logger.exception("Bulk CSV job failed")
+            progress.flush()
             self.job_store.update(job_id, status="failed", error=str(exc))
         except Exception as exc:
             logger.exception("Bulk CSV job failed")
+            progress.flush()
             self.job_store.update(job_id, status="failed", error="unexpected error")
 
     def process_gap_fill(self, job_id: str, request: GapFillRequest) -> None:
+        progress = JobProgressBuffer(self.job_store, job_id)
         try:
             tickers = self.repository.list_tickers()
             selected_range = request.range
             if request.start_date and request.end_date:
-                start_epoch = int(
-                    datetime.combine(
-                        request.start_date, datetime.min.time()
-                    ).timestamp()
-                )
-                end_epoch = int(
-                    datetime.combine(request.end_date, datetime.max.time()).timestamp()
-                )
+                start_epoch = date_to_epoch(request.start_date)
+                end_epoch = date_to_epoch(request.end_date, end_of_day=True)
                 selected_range = EpochRange(
                     start_epoch=start_epoch, end_epoch=end_epoch
                 )
@@ -705,98 +1265,145 @@ class WarehouseService:
                 current_timeframe=request.timeframe,
             )
 
-            interval_seconds = TIMEFRAME_TO_SECONDS[request.timeframe]
-            gap_cache: dict[str, list[tuple[int, int]]] = {}
-            common_gaps: list[tuple[int, int]] | None = None
-
-            for ticker in tickers:
-                try:
-                    existing_epochs = self.repository.get_existing_epochs(
-                        ticker=ticker,
-                        timeframe=request.timeframe,
-                        start_epoch=selected_range.start_epoch,
-                        end_epoch=selected_range.end_epoch,
-                    )
-                except RepositoryError:
-                    existing_epochs = []
-
-                gaps = detect_missing_ranges(
+            timeframe = request.timeframe
+            interval_seconds = TIMEFRAME_TO_SECONDS[timeframe]
+            fetch = partial(self._fetch_range, log_errors=False)
+            upsert = self.repository.upsert_ohlcv_batch
+            update = self.job_store.update
+            record = progress.record
+            try:
+                gap_cache = self.repository.get_missing_ranges_multi(
+                    tickers=tickers,
+                    timeframe=timeframe,
                     start_epoch=selected_range.start_epoch,
                     end_epoch=selected_range.end_epoch,
-                    existing_epochs=existing_epochs,
                     interval_seconds=interval_seconds,
                 )
-                gap_cache[ticker] = gaps
-                if common_gaps is None:
-                    common_gaps = list(gaps)
-                else:
-                    common_gaps = self._intersect_ranges(common_gaps, gaps)
+            except RepositoryError:
+                whole_range = missing_ranges_outside(
+                    selected_range.start_epoch,
+                    selected_range.end_epoch,
+                    [],
+                    interval_seconds,
+                )
+                gap_cache = {ticker: list(whole_range) for ticker in tickers}
 
-            common_gaps = common_gaps or []
-            self.job_store.update(
+            common_gaps = common_ranges(list(gap_cache.values()))
+            update(
                 job_id,
                 common_gap_count=len(common_gaps),
                 message="common gaps excluded" if common_gaps else "no common gaps",
             )
 
-            for index, ticker in enumerate(tickers, start=1):
-                self.job_store.update(
-                    job_id,
-                    current_ticker=ticker,
-                    current_timeframe=request.timeframe,
-                    processed_count=index - 1,
-                    progress_pct=min(100, int(round(((index - 1) / total) * 100)))
-                    if total
-                    else 0,
+            # Gap fetches for several tickers run on a worker pool (paced by
+            # the shared provider limiter); this thread stays the only writer
+            # and completes tickers in order.
+            in_flight: deque[tuple[str, list[tuple[int, int, Future]]]] = deque()
+            completed = 0
+            fetched_total = 0
+            # A failed gap is counted and skipped; tracebacks are sampled
+            # per ticker so a burst of rate-limit errors stays cheap.
+            errors_by_ticker: Counter[str] = Counter()
+            last_logged: dict[str, float] = {}
+
+            def _complete_next() -> None:
+                nonlocal completed, fetched_total
+                ticker, fetches = in_flight.popleft()
+                # Candles for every gap of this ticker are buffered and
+                # written together; keying by epoch drops overlapping rows.
+                buffer: dict[int, OHLCVCandle] = {}
+                for gap_start, gap_end, future in fetches:
+                    try:
+                        candles = future.result()
+                    except ProviderError as exc:
+                        errors_by_ticker[ticker] += 1
+                        now = time.monotonic()
+                        last = last_logged.get(ticker, float("-inf"))
+                        if now - last >= ERROR_LOG_INTERVAL:
+                            last_logged[ticker] = now
+                            logger.error(
+                                "Gap fetch failed for %s (%d so far)",
+                                ticker,
+                                errors_by_ticker[ticker],
+                                exc_info=exc,
+                            )
+                        record(
+                            error_count=sum(errors_by_ticker.values()),
+                            errors_by_ticker=dict(errors_by_ticker),
+                        )
+                        continue
+                    for candle in candles:
+                        buffer[candle.epoch] = candle
+                    if len(buffer) >= BULK_FLUSH_ROWS:
+                        upsert(ticker, timeframe, list(buffer.values()))
+                        buffer.clear()
+                    fetched_total += len(candles)
+                    record(
+                        current_gap={
+                            "start_epoch": gap_start,
+                            "end_epoch": gap_end,
+                        },
+                        fetched_count=fetched_total,
+                    )
+                if buffer:
+                    upsert(ticker, timeframe, list(buffer.values()))
+                completed += 1
+                record(
+                    processed_count=completed,
+                    progress_pct=_progress_pct(completed, total),
                 )
 
-                gaps = gap_cache.get(ticker, [])
-                excluded = (
-                    self._intersect_ranges(gaps, common_gaps) if common_gaps else []
-                )
-                specific_gaps = (
-                    self._subtract_ranges(gaps, common_gaps) if common_gaps else gaps
-                )
-                if specific_gaps:
-                    specific_gaps = self._chunk_gaps(specific_gaps, request.timeframe)
+            executor = ThreadPoolExecutor(
+                max_workers=self.max_fetch_workers,
+                thread_name_prefix="dw-gap-fetch",
+            )
+            try:
+                for ticker in tickers:
+                    record(current_ticker=ticker, current_timeframe=timeframe)
 
-                self.job_store.update(
-                    job_id,
-                    gap_count=len(specific_gaps),
-                    excluded_common_gap_count=len(excluded),
-                    message="gap scan complete" if specific_gaps else "no gaps found",
-                )
+                    gaps = gap_cache.get(ticker, [])
+                    excluded = (
+                        self._intersect_ranges(gaps, common_gaps) if common_gaps else []
+                    )
+                    specific_gaps = (
+                        self._subtract_ranges(gaps, common_gaps) if common_gaps else gaps
+                    )
+                    if specific_gaps:
+                        specific_gaps = self._chunk_gaps(specific_gaps, timeframe)
+
+                    record(
+                        gap_count=len(specific_gaps),
+                        excluded_common_gap_count=len(excluded),
+                        message=(
+                            "gap scan complete" if specific_gaps else "no gaps found"
+                        ),
+                    )
 
-                if specific_gaps:
-                    for gap_start, gap_end in specific_gaps:
-                        try:
-                            candles = self.provider.fetch_ohlcv(
+                    fetches = [
+                        (
+                            gap_start,
+                            gap_end,
+                            executor.submit(
+                                fetch,
                                 ticker=ticker,
-                                timeframe=request.timeframe,
+                                timeframe=timeframe,
                                 start_epoch=gap_start,
                                 end_epoch=gap_end,
-                            )
-                        except Exception as exc:
-                            logger.exception("Provider fetch failed")
-                            raise ProviderError("Provider fetch failed") from exc
-                        self.job_store.update(
-                            job_id,
-                            current_gap={
-                                "start_epoch": gap_start,
-                                "end_epoch": gap_end,
-                            },
-                            fetched_count=len(candles),
+                            ),
                         )
-                        if candles:
-                            self.repository.upsert_ohlcv_batch(
-                                ticker=ticker,
-                                timeframe=request.timeframe,
-                                candles=candles,
-                            )
-                        time.sleep(0.4)
-                time.sleep(0.2)
-
-            self.job_store.update(
+                        for gap_start, gap_end in specific_gaps
+                    ]
+                    in_flight.append((ticker, fetches))
+                    while len(in_flight) > self.max_fetch_workers:
+                        _complete_next()
+
+                while in_flight:
+                    _complete_next()
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+            progress.flush()
+            update(
                 job_id,
                 status="completed",
                 processed_count=total,
@@ -804,9 +1411,11 @@ class WarehouseService:
             )
         except (RepositoryError, ProviderError) as exc:
             logger.exception("Gap fill job failed")
+            progress.flush()
             self.job_store.update(job_id, status="failed", error=str(exc))
         except Exception:
             logger.exception("Gap fill job failed")
+            progress.flush()
             self.job_store.update(job_id, status="failed", error="unexpected error")
 
     def get_stock_data(self, request: GetStockRequest) -> dict:
@@ -821,37 +1430,53 @@ class WarehouseService:
         request: GetStockRequest,
         limit: int,
         offset: int,
+        columnar: bool = False,
+        before_epoch: int | None = None,
     ) -> dict:
+        """Return one page of candles, newest first.
+
+        With `columnar=True` candles come back as one list per field
+        (`{"epoch": [...], "open": [...], ...}`) instead of a dict per row.
+        `next_cursor` is the epoch to pass as `before_epoch` for the next
+        (older) page, or None once the range is exhausted.
+        """
         selected_range = request.range or self.default_range()
-        self._hydrate_missing_data(
-            ticker=request.ticker,
-            timeframe=request.timeframe,
-            selected_range=selected_range,
-        )
-        candles = self.repository.get_ohlcv_page(
+        read_page = partial(
+            self.repository.get_ohlcv_page_with_count,
             ticker=request.ticker,
             timeframe=request.timeframe,
             start_epoch=selected_range.start_epoch,
             end_epoch=selected_range.end_epoch,
             limit=limit,
             offset=offset,
+            columnar=columnar,
+            before_epoch=before_epoch,
         )
-        total = self.repository.get_ohlcv_count(
+        candles, total = read_page()
+        if total == 0 and self._hydrate_missing_data(
             ticker=request.ticker,
             timeframe=request.timeframe,
-            start_epoch=selected_range.start_epoch,
-            end_epoch=selected_range.end_epoch,
-        )
+            selected_range=selected_range,
+            current_count=0,
+        ):
+            candles, total = read_page()
         meta = self.repository.get_ticker_timeframe_meta(
             ticker=request.ticker,
             timeframe=request.timeframe,
         )
-        ist = ZoneInfo("Asia/Kolkata")
-        for candle in candles:
-            timestamp = datetime.fromtimestamp(
-                candle["epoch"], tz=timezone.utc
-            ).astimezone(ist)
-            candle["timestamp_ist"] = timestamp.isoformat()
+        # The repository supplies timestamp_ist from the generated column;
+        # format it here only for databases that predate the column.
+        if columnar:
+            epochs = candles["epoch"]
+            if "timestamp_ist" not in candles:
+                candles["timestamp_ist"] = epochs_to_ist_iso(epochs)
+        else:
+            epochs = [candle["epoch"] for candle in candles]
+            if candles and "timestamp_ist" not in candles[0]:
+                timestamps = epochs_to_ist_iso(epochs)
+                for candle, timestamp in zip(candles, timestamps):
+                    candle["timestamp_ist"] = timestamp
+        next_cursor = epochs[-1] if len(epochs) == limit else None
         return {
             "ticker": request.ticker,
             "timeframe": request.timeframe,
@@ -861,8 +1486,112 @@ class WarehouseService:
             "meta": meta,
             "limit": limit,
             "offset": offset,
+            "next_cursor": next_cursor,
         }
 
+    def get_stock_data_multi(
+        self,
+        request: GetStockRequest,
+        page_limit: int,
+        page_offset: int,
+        chart_limit: int = 500,
+        fallback_to_stored: bool = False,
+    ) -> tuple[dict, dict]:
+        """Return a table page and a chart window for the same range.
+
+        The chart window is the newest `chart_limit` candles in columnar form
+        (one list per field, newest first). A page that falls inside it is
+        sliced from it rather than queried again, so the common case costs
+        one page read, one count and one meta lookup.
+
+        With `fallback_to_stored`, an empty page is retried once over the
+        pair's stored range from the meta the first read already returned.
+        """
+        page, chart = self._page_and_chart(
+            request, page_limit, page_offset, chart_limit
+        )
+        meta = page.get("meta") or {}
+        start_epoch = meta.get("current_range_start_epoch")
+        end_epoch = meta.get("current_range_end_epoch")
+        if fallback_to_stored and not page["candles"] and start_epoch and end_epoch:
+            stored_range = EpochRange(
+                start_epoch=int(start_epoch), end_epoch=int(end_epoch)
+            )
+            page, chart = self._page_and_chart(
+                request.model_copy(update={"range": stored_range}),
+                page_limit,
+                page_offset,
+                chart_limit,
+            )
+        return page, chart
+
+    def _page_and_chart(
+        self,
+        request: GetStockRequest,
+        page_limit: int,
+        page_offset: int,
+        chart_limit: int,
+    ) -> tuple[dict, dict]:
+        chart = self.get_stock_data_page(
+            request=request, limit=chart_limit, offset=0, columnar=True
+        )
+        if page_offset + page_limit > chart_limit:
+            page = self.get_stock_data_page(
+                request=request, limit=page_limit, offset=page_offset
+            )
+            return page, chart
+        window = slice(page_offset, page_offset + page_limit)
+        columns = {name: values[window] for name, values in chart["candles"].items()}
+        # Only the page's rows are materialized as dicts.
+        candles = [dict(zip(columns, row)) for row in zip(*columns.values())]
+        page = {
+            **chart,
+            "candles": candles,
+            "limit": page_limit,
+            "offset": page_offset,
+            "next_cursor": (
+                candles[-1]["epoch"] if len(candles) == page_limit else None
+            ),
+        }
+        return page, chart
+
+    def get_stock_data_page_etag(
+        self,
+        request: GetStockRequest,
+        limit: int,
+        offset: int,
+        columnar: bool = False,
+        before_epoch: int | None = None,
+    ) -> str | None:
+        """Return a validator for the page `get_stock_data_page` would build.
+
+        The tag covers the page parameters and the pair's `data_version`,
+        which every candle write or delete bumps, so callers can answer a
+        matching `If-None-Match` without reading or formatting candles.
+        Returns None when the requested range holds no candles, since reading
+        that page first tries to hydrate it from the provider.
+        """
+        data_version = self.repository.get_data_version(
+            ticker=request.ticker,
+            timeframe=request.timeframe,
+        )
+        if data_version is None:
+            return None
+        selected_range = request.range or self.default_range()
+        if not self.repository.ohlcv_exists_in_range(
+            ticker=request.ticker,
+            timeframe=request.timeframe,
+            start_epoch=selected_range.start_epoch,
+            end_epoch=selected_range.end_epoch,
+        ):
+            return None
+        key = (
+            f"{request.ticker}|{request.timeframe}|{selected_range.start_epoch}|"
+            f"{selected_range.end_epoch}|{limit}|{offset}|{int(columnar)}|"
+            f"{before_epoch}|{data_version}"
+        )
+        return f'"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}"'
+
     def get_ohlcv_range(
         self,
         ticker: str,
@@ -881,28 +1610,71 @@ class WarehouseService:
             end_epoch=selected_range.end_epoch,
         )
 
+    def get_ohlcv_range_array(
+        self,
+        ticker: str,
+        timeframe: str,
+        selected_range: EpochRange,
+    ) -> np.ndarray:
+        """Like `get_ohlcv_range`, but as a NumPy structured array.
+
+        Fields are `epoch`, `open`, `high`, `low`, `close` and `volume`, so
+        derived series (resampling, VWAP, timestamps) can be computed with
+        vectorized NumPy operations over the whole history.
+        """
+        self._hydrate_missing_data(
+            ticker=ticker,
+            timeframe=timeframe,
+            selected_range=selected_range,
+        )
+        return self.repository.get_ohlcv_array(
+            ticker=ticker,
+            timeframe=timeframe,
+            start_epoch=selected_range.start_epoch,
+            end_epoch=selected_range.end_epoch,
+        )
+
     def _hydrate_missing_data(
         self,
         ticker: str,
         timeframe: str,
         selected_range: EpochRange,
-    ) -> None:
-        try:
-            current_count = self.repository.get_ohlcv_count(
-                ticker=ticker,
-                timeframe=timeframe,
-                start_epoch=selected_range.start_epoch,
-                end_epoch=selected_range.end_epoch,
-            )
-        except RepositoryError as exc:
-            logger.exception("Ticker lookup failed")
-            raise RepositoryError("Ticker lookup failed") from exc
+        current_count: int | None = None,
+    ) -> bool:
+        """Fetch and store the range from the provider if nothing is stored.
+
+        Callers that already know the stored count pass it as
+        `current_count` to skip the lookup. Returns True when candles were
+        written.
+        """
+        key = (
+            ticker,
+            timeframe,
+            selected_range.start_epoch,
+            selected_range.end_epoch,
+        )
+        if current_count is None:
+            if self._is_hydrated(key):
+                return False
+            try:
+                populated = self.repository.ohlcv_exists_in_range(
+                    ticker=ticker,
+                    timeframe=timeframe,
+                    start_epoch=selected_range.start_epoch,
+                    end_epoch=selected_range.end_epoch,
+                )
+            except RepositoryError as exc:
+                logger.exception("Ticker lookup failed")
+                raise RepositoryError("Ticker lookup failed") from exc
+        else:
+            populated = current_count > 0
 
-        if current_count > 0:
-            return
+        if populated:
+            self._mark_hydrated(key)
+            return False
 
         try:
-            candles = self.provider.fetch_ohlcv(
+            candles = self._fetch_ohlcv(
                 ticker=ticker,
                 timeframe=timeframe,
                 start_epoch=selected_range.start_epoch,
@@ -910,16 +1682,46 @@ class WarehouseService:
             )
         except Exception:
             logger.exception("Auto-fetch failed for %s %s", ticker, timeframe)
-            return
+            return False
 
         if not candles:
-            return
+            return False
 
         self.repository.upsert_ohlcv_batch(
             ticker=ticker,
             timeframe=timeframe,
             candles=candles,
         )
+        self._mark_hydrated(key)
+        return True
+
+    def _is_hydrated(self, key: tuple[str, str, int, int]) -> bool:
+        with self._hydrated_lock:
+            expires_at = self._hydrated.get(key)
+            if expires_at is None:
+                return False
+            if expires_at < time.monotonic():
+                del self._hydrated[key]
+                return False
+            self._hydrated.move_to_end(key)
+            return True
+
+    def _mark_hydrated(self, key: tuple[str, str, int, int]) -> None:
+        with self._hydrated_lock:
+            self._hydrated[key] = time.monotonic() + HYDRATED_TTL_SECONDS
+            self._hydrated.move_to_end(key)
+            while len(self._hydrated) > HYDRATED_CACHE_SIZE:
+                self._hydrated.popitem(last=False)
+
+    def _forget_hydrated(self, ticker: str, timeframe: str | None) -> None:
+        """Drop markers for a ticker (optionally one timeframe) after deletes."""
+        with self._hydrated_lock:
+            for key in [
+                key
+                for key in self._hydrated
+                if key[0] == ticker and timeframe in (None, key[1])
+            ]:
+                del self._hydrated[key]
 
     def process_delete(self, job_id: str, request: DeleteStockRequest) -> None:
         try:
@@ -932,6 +1734,7 @@ class WarehouseService:
                 start_epoch=start_epoch,
                 end_epoch=end_epoch,
             )
+            self._forget_hydrated(request.ticker, request.timeframe)
             self.job_store.update(job_id, status="completed", deleted=deleted)
         except RepositoryError as exc:
             logger.exception("Delete job failed")
@@ -960,6 +1763,17 @@ class WarehouseService:
     def count_jobs(self, status: str | None = None, job_type: str | None = None) -> int:
         return self.repository.count_jobs(status, job_type)
 
+    def list_job_failures(
+        self,
+        job_id: str,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[dict]:
+        return self.repository.list_job_failures(job_id, limit=limit, offset=offset)
+
+    def count_job_failures(self, job_id: str) -> int:
+        return self.repository.count_job_failures(job_id)
+
     def list_tickers(self) -> list[str]:
         return self.repository.list_tickers()
 
@@ -967,15 +1781,13 @@ class WarehouseService:
         return self.repository.list_timeframes_for_ticker(ticker)
 
     def list_tickers_with_timeframes(self) -> list[dict]:
-        payload: list[dict] = []
-        for ticker in self.repository.list_tickers():
-            payload.append(
-                {
-                    "ticker": ticker,
-                    "timeframes": self.repository.list_timeframes_for_ticker(ticker),
-                }
-            )
-        return payload
+        return list(self.iter_tickers_with_timeframes())
+
+    def iter_tickers_with_timeframes(self) -> Iterator[dict]:
+        return (
+            {"ticker": ticker, "timeframes": timeframes}
+            for ticker, timeframes in self.repository.iter_ticker_timeframes()
+        )
 
     def list_ticker_metadata(self) -> list[dict]:
         return self.repository.list_ticker_metadata()
@@ -1012,31 +1824,41 @@ class WarehouseService:
     def count_failed_ingestions(self, status: str = "failed") -> int:
         return self.repository.count_failed_ingestions(status=status)
 
-    def retry_failed_ingestion(
+    def enqueue_retry_failed(self, failed_id: int) -> dict:
+        """Create the job for retrying a failed ingestion."""
+        return self.job_store.create("retry_failed")
+
+    def process_retry_failed(
         self,
+        job_id: str,
         failed_id: int,
         ticker: str,
         timeframe: str,
         start_epoch: int,
         end_epoch: int,
-    ) -> dict:
-        """Retry a previously failed ingestion with new parameters."""
-        job = self.job_store.create("retry_failed")
-        self.repository.increment_failed_ingestion_retry(failed_id)
+    ) -> None:
+        """Retry a previously failed ingestion with new parameters.
 
+        The attempt is counted, and the failure resolved on success, in one
+        update once the retry has finished.
+        """
         try:
             request = AddStockRequest(
                 ticker=ticker,
                 timeframe=cast(Timeframe, timeframe),
                 range=EpochRange(start_epoch=start_epoch, end_epoch=end_epoch),
             )
-            self.process_add(job["job_id"], request)
-            # Mark as resolved if successful
-            self.repository.mark_failed_ingestion_resolved(failed_id)
-        except Exception:
-            pass  # process_add updates job status internally
-
-        return self.job_store.get(job["job_id"]) or job
+        except ValidationError:
+            logger.exception("Retry job failed")
+            self.job_store.update(
+                job_id, status="failed", error="invalid retry parameters"
+            )
+            self.repository.finalize_failed_retry(failed_id, success=False)
+            return
+        job = self.process_add(job_id, request)
+        self.repository.finalize_failed_retry(
+            failed_id, success=job.get("status") == "completed"
+        )
 
 
 class OpenAlgoProvider(Protocol):
@@ -1050,6 +1872,3 @@ class OpenAlgoProvider(Protocol):
     ) -> list[OHLCVCandle]: ...
 
     def search_symbols(self, query: str, exchange: str | None = None) -> list[dict]: ...
-
-
-logger = logging.getLogger(__name__)
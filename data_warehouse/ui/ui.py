@@ -1,32 +1,96 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from pathlib import Path
+
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.templating import Jinja2Templates
-from pathlib import Path
-from datetime import datetime, timezone
-from zoneinfo import ZoneInfo
 
 from ..api.deps import get_service
 from ..core.errors import RepositoryError
+from ..core.serialization import dumps_bytes
+from ..core.time_utils import (
+    IST_OFFSET,
+    IST_OFFSET_SECONDS,
+    date_to_epoch,
+    epochs_to_ist_iso,
+)
 from ..schemas.requests import EpochRange, GetStockRequest, Timeframe
 
 router = APIRouter()
 templates = Jinja2Templates(directory=Path(__file__).parent / "templates")
+# Compiled templates stay in Jinja's cache; without this every render stats the
+# source file to check for edits. Set DW_TEMPLATE_RELOAD=1 while editing them.
+templates.env.auto_reload = os.getenv("DW_TEMPLATE_RELOAD") == "1"
+
+
+def _civil_from_days(days: int) -> tuple[int, int, int]:
+    """Return (year, month, day) for days since 1970-01-01 (Hinnant's algorithm)."""
+    days += 719468
+    era = days // 146097
+    doe = days - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 if mp < 10 else mp - 9
+    return yoe + era * 400 + (month <= 2), month, day
 
 
 def _format_epoch(value: int | None) -> str:
+    # Runs once per rendered timestamp; plain integer math avoids building a
+    # datetime and calling strftime for every cell.
     if not value:
         return "-"
-    return (
-        datetime.fromtimestamp(value, tz=timezone.utc)
-        .astimezone(ZoneInfo("Asia/Kolkata"))
-        .strftime("%Y-%m-%d %H:%M")
-    )
+    days, seconds = divmod(int(value) + IST_OFFSET_SECONDS, 86400)
+    hour, seconds = divmod(seconds, 3600)
+    year, month, day = _civil_from_days(days)
+    return f"{year:04d}-{month:02d}-{day:02d} {hour:02d}:{seconds // 60:02d}"
 
 
 templates.env.filters["datetimeformat"] = _format_epoch
 
+RENDER_CACHE_SIZE = 64
+_rendered: OrderedDict[tuple[str, bytes], str] = OrderedDict()
+_rendered_lock = threading.Lock()
+
+
+def _render_cached(request: Request, name: str, context: dict) -> Response:
+    """Render a template once per distinct context.
+
+    Polled views mostly re-render unchanged data, so the HTML is kept in a
+    small LRU keyed by a digest of the serialized context. The digest is also
+    the response's ETag; a client that already holds it gets a bodiless 304.
+    The context must be JSON-serializable and must not need the request.
+    """
+    digest = hashlib.blake2b(dumps_bytes(context), digest_size=16).digest()
+    etag = f'W/"{digest.hex()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    key = (name, digest)
+    with _rendered_lock:
+        html = _rendered.get(key)
+        if html is not None:
+            _rendered.move_to_end(key)
+    if html is None:
+        html = templates.get_template(name).render(context)
+        with _rendered_lock:
+            _rendered[key] = html
+            while len(_rendered) > RENDER_CACHE_SIZE:
+                _rendered.popitem(last=False)
+    return HTMLResponse(html, headers={"ETag": etag})
+
+
+def _ist_column(rows: list[dict], key: str) -> list[tuple[str, dict]]:
+    """Pair each row that has a `key` epoch with its IST ISO-8601 string."""
+    present = [row for row in rows if row.get(key)]
+    return list(zip(epochs_to_ist_iso([row[key] for row in present]), present))
+
 
 @router.get("/data-warehouse", response_class=HTMLResponse)
 def dashboard(request: Request):
@@ -36,27 +100,25 @@ def dashboard(request: Request):
         stats = service.get_storage_stats()
     except RepositoryError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
-    ist = ZoneInfo("Asia/Kolkata")
     min_epoch = stats.get("min_epoch")
     max_epoch = stats.get("max_epoch")
     stats_display = {
         "ticker_count": stats.get("ticker_count", 0),
         "candle_count": stats.get("candle_count", 0),
         "timeframe_count": stats.get("timeframe_count", 0),
-        "min_ist": datetime.fromtimestamp(min_epoch, tz=timezone.utc)
-        .astimezone(ist)
-        .strftime("%Y-%m-%d")
+        "min_ist": datetime.fromtimestamp(min_epoch, tz=IST_OFFSET).strftime(
+            "%Y-%m-%d"
+        )
         if min_epoch
         else "-",
-        "max_ist": datetime.fromtimestamp(max_epoch, tz=timezone.utc)
-        .astimezone(ist)
-        .strftime("%Y-%m-%d")
+        "max_ist": datetime.fromtimestamp(max_epoch, tz=IST_OFFSET).strftime(
+            "%Y-%m-%d"
+        )
         if max_epoch
         else "-",
     }
-    return templates.TemplateResponse(
-        "dashboard.html",
-        {"request": request, "tickers": tickers, "stats": stats_display},
+    return _render_cached(
+        request, "dashboard.html", {"tickers": tickers, "stats": stats_display}
     )
 
 
@@ -90,10 +152,10 @@ def jobs_fragment(
         raise HTTPException(status_code=500, detail=str(exc)) from exc
     total_pages = max((total + limit - 1) // limit, 1)
     active = [job for job in jobs if job.get("status") in {"queued", "running"}]
-    return templates.TemplateResponse(
+    return _render_cached(
+        request,
         "fragments/jobs.html",
         {
-            "request": request,
             "jobs": jobs,
             "active": active,
             "page": page,
@@ -150,12 +212,12 @@ def ticker_view(request: Request, ticker: str, timeframe: Timeframe = "1d"):
     range_value = None
     if start_epoch and end_epoch:
         if "-" in start_epoch and "-" in end_epoch:
-            start_date = datetime.strptime(start_epoch, "%Y-%m-%d").date()
-            end_date = datetime.strptime(end_epoch, "%Y-%m-%d").date()
-            start_ts = int(
-                datetime.combine(start_date, datetime.min.time()).timestamp()
-            )
-            end_ts = int(datetime.combine(end_date, datetime.max.time()).timestamp())
+            # YYYY-MM-DD from the date inputs; splitting avoids strptime's
+            # per-call format parsing.
+            start_date = date(*map(int, start_epoch.split("-", 2)))
+            end_date = date(*map(int, end_epoch.split("-", 2)))
+            start_ts = date_to_epoch(start_date)
+            end_ts = date_to_epoch(end_date, end_of_day=True)
             range_value = EpochRange(start_epoch=start_ts, end_epoch=end_ts)
         else:
             range_value = EpochRange(
@@ -165,67 +227,40 @@ def ticker_view(request: Request, ticker: str, timeframe: Timeframe = "1d"):
         ticker=ticker, timeframe=timeframe, range=range_value
     )
     try:
-        payload = service.get_stock_data_page(
+        payload, chart_payload = service.get_stock_data_multi(
             request=request_payload,
-            limit=limit,
-            offset=offset,
+            page_limit=limit,
+            page_offset=offset,
+            fallback_to_stored=True,
         )
-        chart_payload = service.get_stock_data_page(
-            request=request_payload,
-            limit=500,
-            offset=0,
-        )
-        if not payload.get("candles") and payload.get("meta"):
-            meta = payload["meta"]
-            if meta.get("current_range_start_epoch") and meta.get(
-                "current_range_end_epoch"
-            ):
-                fallback_range = EpochRange(
-                    start_epoch=int(meta["current_range_start_epoch"]),
-                    end_epoch=int(meta["current_range_end_epoch"]),
-                )
-                fallback_request = GetStockRequest(
-                    ticker=ticker, timeframe=timeframe, range=fallback_range
-                )
-                payload = service.get_stock_data_page(
-                    request=fallback_request,
-                    limit=limit,
-                    offset=offset,
-                )
-                chart_payload = service.get_stock_data_page(
-                    request=fallback_request,
-                    limit=500,
-                    offset=0,
-                )
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except RepositoryError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
-    chart_candles = sorted(
-        chart_payload.get("candles", []), key=lambda item: item["epoch"]
-    )
-    recent_candles = list(reversed(chart_candles))[:6]
-    ist = ZoneInfo("Asia/Kolkata")
+    # The chart window arrives newest first, one list per field; reversing
+    # each list orders it for the chart without sorting.
+    chart_columns = chart_payload["candles"]
+    chart_candles = {
+        name: chart_columns[name][::-1]
+        for name in ("epoch", "open", "high", "low", "close")
+    }
+    recent_candles = [
+        {"timestamp_ist": timestamp, "close": close}
+        for timestamp, close in zip(
+            chart_columns["timestamp_ist"][:6], chart_columns["close"][:6]
+        )
+    ]
     meta = payload.get("meta") or {}
-    last_updated = meta.get("last_updated_epoch")
-    range_start = meta.get("current_range_start_epoch")
-    range_end = meta.get("current_range_end_epoch")
+    meta_epochs = {
+        "last_updated_ist": meta.get("last_updated_epoch"),
+        "range_start_ist": meta.get("current_range_start_epoch"),
+        "range_end_ist": meta.get("current_range_end_epoch"),
+    }
     meta_display = {
-        "last_updated_ist": datetime.fromtimestamp(last_updated, tz=timezone.utc)
-        .astimezone(ist)
-        .isoformat()
-        if last_updated
-        else None,
-        "range_start_ist": datetime.fromtimestamp(range_start, tz=timezone.utc)
-        .astimezone(ist)
-        .isoformat()
-        if range_start
-        else None,
-        "range_end_ist": datetime.fromtimestamp(range_end, tz=timezone.utc)
-        .astimezone(ist)
-        .isoformat()
-        if range_end
-        else None,
+        key: datetime.fromtimestamp(epoch, tz=IST_OFFSET).isoformat()
+        if epoch
+        else None
+        for key, epoch in meta_epochs.items()
     }
     return templates.TemplateResponse(
         "ticker_view.html",
@@ -261,28 +296,13 @@ def failed_ingestions_view(request: Request):
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
     total_pages = max((total + limit - 1) // limit, 1)
-    ist = ZoneInfo("Asia/Kolkata")
-    for failure in failures:
-        if failure.get("attempted_at"):
-            failure["attempted_at_ist"] = (
-                datetime.fromtimestamp(failure["attempted_at"], tz=timezone.utc)
-                .astimezone(ist)
-                .strftime("%Y-%m-%d %H:%M:%S")
-            )
-        if failure.get("requested_start_epoch"):
-            failure["start_date"] = (
-                datetime.fromtimestamp(
-                    failure["requested_start_epoch"], tz=timezone.utc
-                )
-                .astimezone(ist)
-                .strftime("%Y-%m-%d")
-            )
-        if failure.get("requested_end_epoch"):
-            failure["end_date"] = (
-                datetime.fromtimestamp(failure["requested_end_epoch"], tz=timezone.utc)
-                .astimezone(ist)
-                .strftime("%Y-%m-%d")
-            )
+    # Format each timestamp column for the whole page in one vectorized pass.
+    for text, failure in _ist_column(failures, "attempted_at"):
+        failure["attempted_at_ist"] = f"{text[:10]} {text[11:19]}"
+    for text, failure in _ist_column(failures, "requested_start_epoch"):
+        failure["start_date"] = text[:10]
+    for text, failure in _ist_column(failures, "requested_end_epoch"):
+        failure["end_date"] = text[:10]
 
     return templates.TemplateResponse(
         "failed_ingestions.html",
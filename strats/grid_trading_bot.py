@@ -139,36 +139,30 @@ class GridTradingBot(TradingBot):
         Returns:
             Tuple of (buy_levels, sell_levels)
         """
-        buy_levels = []
-        sell_levels = []
+        # Level offsets 1..grid_levels; prices move away from the center as the
+        # offset grows, so buys come out highest first and sells lowest first.
+        steps = np.arange(1, self.grid_levels + 1)
 
         if self.grid_type == 'arithmetic':
             # Fixed price intervals
             spacing = center_price * (self.grid_spacing_pct / 100)
-
-            for i in range(1, self.grid_levels + 1):
-                buy_price = center_price - (spacing * i)
-                sell_price = center_price + (spacing * i)
-
-                if buy_price > 0:  # Ensure positive prices
-                    buy_levels.append(round(buy_price, 2))
-                sell_levels.append(round(sell_price, 2))
+            buy_prices = center_price - (spacing * steps)
+            sell_prices = center_price + (spacing * steps)
+            buy_prices = buy_prices[buy_prices > 0]  # Ensure positive prices
 
         elif self.grid_type == 'geometric':
             # Percentage-based intervals
             ratio = 1 + (self.grid_spacing_pct / 100)
+            buy_prices = center_price / (ratio ** steps)
+            sell_prices = center_price * (ratio ** steps)
 
-            for i in range(1, self.grid_levels + 1):
-                buy_price = center_price / (ratio ** i)
-                sell_price = center_price * (ratio ** i)
-
-                buy_levels.append(round(buy_price, 2))
-                sell_levels.append(round(sell_price, 2))
-
-        # Sort levels
-        buy_levels.sort(reverse=True)  # Highest buy price first
-        sell_levels.sort()  # Lowest sell price first
+        else:
+            return [], []
 
+        # Python's round is exact on decimal halves where np.round is not, so
+        # levels stay identical to prices rounded elsewhere in the bot.
+        buy_levels = [round(price, 2) for price in buy_prices.tolist()]
+        sell_levels = [round(price, 2) for price in sell_prices.tolist()]
         return buy_levels, sell_levels
 
     def setup_grid(self, center_price: Optional[float] = None) -> bool:
@@ -808,21 +802,35 @@ class GridTradingBot(TradingBot):
         current_price = self.get_current_price() or 0
         unrealized_pnl = self.calculate_unrealized_pnl(current_price)
 
-        # Calculate realized P&L (make copies to avoid modifying original data)
+        # Calculate realized P&L. Split fills by side in one pass, keeping
+        # remaining buy quantities in a separate list so the fills themselves
+        # are never modified.
         realized_pnl = 0.0
-        buy_orders = [o.copy() for o in self.filled_orders if o['type'] == 'BUY']
-        sell_orders = [o.copy() for o in self.filled_orders if o['type'] == 'SELL']
-
-        # Simple P&L calculation using FIFO (can be improved with more sophisticated matching)
+        buy_prices = []
+        buy_quantities = []
+        sell_orders = []
+        for order in self.filled_orders:
+            if order['type'] == 'BUY':
+                buy_prices.append(order['fill_price'])
+                buy_quantities.append(order['quantity'])
+            elif order['type'] == 'SELL':
+                sell_orders.append(order)
+
+        # Simple P&L calculation using FIFO (can be improved with more sophisticated matching).
+        # Buys are consumed strictly in order, so each sell resumes from the
+        # first buy with quantity left instead of rescanning exhausted ones.
+        next_buy = 0
         for sell in sell_orders:
             remaining_sell_qty = sell['quantity']
-            for buy in buy_orders:
-                if buy['quantity'] > 0 and remaining_sell_qty > 0:
-                    traded_qty = min(remaining_sell_qty, buy['quantity'])
-                    pnl = (sell['fill_price'] - buy['fill_price']) * traded_qty
-                    realized_pnl += pnl
-                    buy['quantity'] -= traded_qty
-                    remaining_sell_qty -= traded_qty
+            while remaining_sell_qty > 0 and next_buy < len(buy_quantities):
+                if buy_quantities[next_buy] <= 0:
+                    next_buy += 1
+                    continue
+                traded_qty = min(remaining_sell_qty, buy_quantities[next_buy])
+                pnl = (sell['fill_price'] - buy_prices[next_buy]) * traded_qty
+                realized_pnl += pnl
+                buy_quantities[next_buy] -= traded_qty
+                remaining_sell_qty -= traded_qty
 
         # Handle case where grid bounds might be None (not initialized yet)
         if self.grid_lower_bound is not None and self.grid_upper_bound is not None:
@@ -1010,20 +1018,39 @@ class GridTradingBot(TradingBot):
         if bounds_status != 'within':
             self.handle_breakout(current_price, bounds_status)
 
-    def _find_order_at_price(self, level_price: float, order_book: Dict) -> Optional[str]:
+    def _price_index(self, order_book: Dict) -> Tuple[np.ndarray, List[str]]:
+        """
+        Sort an order book's prices once so grid level lookups can bisect.
+
+        Keys are floats while running but strings after load_state, so they
+        are parsed here once instead of on every lookup.
+
+        Args:
+            order_book: The dictionary of orders to index (e.g., self.buy_orders).
+
+        Returns:
+            Tuple of (sorted prices, order IDs in the same order)
+        """
+        prices = np.fromiter((float(price) for price in order_book), dtype=np.float64, count=len(order_book))
+        order = np.argsort(prices, kind='stable')
+        order_ids = list(order_book.values())
+        return prices[order], [order_ids[i] for i in order]
+
+    def _find_order_at_price(self, level_price: float, price_index: Tuple[np.ndarray, List[str]]) -> Optional[str]:
         """
         Find an order ID for a given price level with a small tolerance.
         
         Args:
             level_price: The price of the grid level.
-            order_book: The dictionary of orders to search (e.g., self.buy_orders).
+            price_index: Sorted prices and order IDs from _price_index.
         
         Returns:
             The order ID if found, otherwise None.
         """
-        for price_str, oid in order_book.items():
-            if abs(float(price_str) - level_price) < 0.01:
-                return oid
+        prices, order_ids = price_index
+        i = int(np.searchsorted(prices, level_price - 0.01, side='right'))
+        if i < len(prices) and prices[i] - level_price < 0.01:
+            return order_ids[i]
         return None
 
     def get_trading_data_for_export(self) -> Dict:
@@ -1059,14 +1086,16 @@ class GridTradingBot(TradingBot):
         # Calculate grid levels with detailed info
         grid_levels = []
         if self.grid_center_price and self.grid_upper_bound and self.grid_lower_bound:
+            buy_index = self._price_index(self.buy_orders)
+            sell_index = self._price_index(self.sell_orders)
             if self.grid_type == 'arithmetic':
                 spacing = (self.grid_upper_bound - self.grid_lower_bound) / (2 * self.grid_levels)
                 for i in range(-self.grid_levels, self.grid_levels + 1):
                     level_price = self.grid_center_price + (i * spacing)
                     level_type = 'CENTER' if i == 0 else ('BUY' if i < 0 else 'SELL')
                     
-                    order_book = self.buy_orders if level_type == 'BUY' else self.sell_orders
-                    order_id = self._find_order_at_price(level_price, order_book) if level_type != 'CENTER' else None
+                    price_index = buy_index if level_type == 'BUY' else sell_index
+                    order_id = self._find_order_at_price(level_price, price_index) if level_type != 'CENTER' else None
                     has_order = order_id is not None
                     grid_levels.append({
                         'price': level_price,
@@ -1082,8 +1111,8 @@ class GridTradingBot(TradingBot):
                     level_price = self.grid_center_price * multiplier
                     level_type = 'CENTER' if i == 0 else ('BUY' if i < 0 else 'SELL')
                     
-                    order_book = self.buy_orders if level_type == 'BUY' else self.sell_orders
-                    order_id = self._find_order_at_price(level_price, order_book) if level_type != 'CENTER' else None
+                    price_index = buy_index if level_type == 'BUY' else sell_index
+                    order_id = self._find_order_at_price(level_price, price_index) if level_type != 'CENTER' else None
                     has_order = order_id is not None
                     grid_levels.append({
                         'price': level_price,
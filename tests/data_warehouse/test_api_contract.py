@@ -1,6 +1,14 @@
+import sqlite3
+
 from fastapi.testclient import TestClient
 
 from data_warehouse.api.api import create_app
+from data_warehouse.api.deps import get_service
+from data_warehouse.db.db import SCHEMA_SQL
+from data_warehouse.db.repository import WarehouseRepository
+from data_warehouse.schemas.ohlcv_data import OHLCVCandle
+from data_warehouse.schemas.requests import GetStockRequest
+from data_warehouse.services.warehouse_service import JobStore, WarehouseService
 
 
 def test_add_stock_returns_accepted_with_job_metadata():
@@ -112,3 +120,80 @@ def test_search_symbols_returns_results_payload():
         json={"query": "nifty", "is_index": True},
     )
     assert index_response.status_code == 200
+
+
+def test_job_failures_returns_paged_payload():
+    app = create_app()
+    client = TestClient(app)
+
+    response = client.get("/api/data-warehouse/jobs/unknown-job/failures")
+
+    assert response.status_code == 200
+    assert response.json() == {"failures": [], "total": 0}
+
+
+def test_list_tickers_streams_json_array():
+    app = create_app()
+    client = TestClient(app)
+
+    response = client.get("/api/data-warehouse/tickers")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    assert isinstance(data, list)
+    for item in data:
+        assert set(item) == {"ticker", "timeframes"}
+
+
+def test_get_stock_retries_hydration_despite_stale_etag():
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(SCHEMA_SQL)
+    repository = WarehouseRepository(connection)
+    stored = OHLCVCandle(
+        epoch=1690000000, open=1.0, high=1.0, low=1.0, close=1.0, volume=1
+    )
+    fresh = OHLCVCandle(
+        epoch=1700000000, open=2.0, high=2.0, low=2.0, close=2.0, volume=2
+    )
+    repository.upsert_ohlcv_batch("RELIANCE", "1d", [stored])
+
+    class RecoveringClient:
+        candles: list[OHLCVCandle] = []
+
+        def fetch_ohlcv(self, **kwargs) -> list[OHLCVCandle]:
+            return list(self.candles)
+
+    provider = RecoveringClient()
+    service = WarehouseService(
+        repository=repository, provider=provider, job_store=JobStore(repository)
+    )
+    app = create_app()
+    app.dependency_overrides[get_service] = lambda: service
+    client = TestClient(app)
+    body = {
+        "ticker": "RELIANCE",
+        "timeframe": "1d",
+        "range": {"start_epoch": 1700000000, "end_epoch": 1700000000},
+    }
+    request = GetStockRequest.model_validate(body)
+
+    empty = client.post("/api/data-warehouse/stocks/get", json=body)
+    assert empty.status_code == 200
+    assert empty.json()["candles"] == []
+    # An empty range may still hydrate, so it is never answered with 304.
+    assert "ETag" not in empty.headers
+    assert service.get_stock_data_page_etag(request, limit=500, offset=0) is None
+
+    provider.candles = [fresh]
+    response = client.post(
+        "/api/data-warehouse/stocks/get",
+        json=body,
+        headers={"If-None-Match": '"cached"'},
+    )
+    assert response.status_code == 200
+    assert [candle["epoch"] for candle in response.json()["candles"]] == [1700000000]
+    assert response.headers["ETag"] == service.get_stock_data_page_etag(
+        request, limit=500, offset=0
+    )
@@ -0,0 +1,108 @@
+import sqlite3
+
+import pytest
+
+from data_warehouse.core.errors import RepositoryError
+from data_warehouse.db.db import SCHEMA_SQL
+from data_warehouse.db.repository import WarehouseRepository
+from data_warehouse.schemas.ohlcv_data import OHLCVCandle
+from data_warehouse.services.bulk_ingest import _BulkIngestPipeline
+
+
+@pytest.fixture()
+def repository() -> WarehouseRepository:
+    connection = sqlite3.connect(":memory:")
+    connection.row_factory = sqlite3.Row
+    connection.executescript(SCHEMA_SQL)
+    return WarehouseRepository(connection)
+
+
+def _fetch(
+    ticker: str, timeframe: str, start_epoch: int, end_epoch: int
+) -> list[OHLCVCandle]:
+    return [
+        OHLCVCandle(epoch=epoch, open=1.0, high=1.0, low=1.0, close=1.0, volume=1)
+        for epoch in range(start_epoch, end_epoch + 1, 86400)
+    ]
+
+
+def test_pipeline_completes_rows_in_order_and_writes_in_batches(
+    repository: WarehouseRepository,
+) -> None:
+    completed: list[tuple[int, int]] = []
+    pipeline: _BulkIngestPipeline[int] = _BulkIngestPipeline(
+        repository,
+        _fetch,
+        on_complete=lambda row, fetched: completed.append(
+            (row, sum(len(candles) for candles in fetched))
+        ),
+        max_workers=2,
+        flush_rows=3,
+    )
+    try:
+        for row, ticker in enumerate(("INFY", "TCS", "WIPRO")):
+            pipeline.submit(row, ticker, "1d", [(0, 86400), (172800, 172800)])
+        pipeline.finish()
+    finally:
+        pipeline.close()
+
+    assert completed == [(0, 3), (1, 3), (2, 3)]
+    for ticker in ("INFY", "TCS", "WIPRO"):
+        assert repository.get_ohlcv_count(ticker, "1d", 0, 172800) == 3
+
+
+def test_pipeline_settles_repeated_pairs_and_routes_errors(
+    repository: WarehouseRepository,
+) -> None:
+    def failing_fetch(**kwargs) -> list[OHLCVCandle]:
+        raise RuntimeError("provider down")
+
+    errors: list[tuple[str, str]] = []
+    pipeline: _BulkIngestPipeline[str] = _BulkIngestPipeline(
+        repository,
+        failing_fetch,
+        on_complete=lambda row, fetched: None,
+        on_error=lambda row, exc: errors.append((row, str(exc))),
+    )
+    try:
+        assert not pipeline.settle("INFY", "1d")
+        pipeline.submit("first", "INFY", "1d", [(0, 0)])
+        assert not pipeline.settle("TCS", "1d")
+        assert pipeline.settle("INFY", "1d")
+        assert errors == [("first", "provider down")]
+    finally:
+        pipeline.close()
+
+
+def test_pipeline_reports_rows_only_after_their_candles_are_written(
+    repository: WarehouseRepository,
+) -> None:
+    def fetch(ticker: str, **kwargs) -> list[OHLCVCandle]:
+        return [] if ticker == "EMPTY" else _fetch(ticker, **kwargs)
+
+    def failing_upsert(batches) -> int:
+        raise RepositoryError("Failed to upsert candles")
+
+    repository.upsert_ohlcv_multi = failing_upsert  # type: ignore[method-assign]
+    completed: list[str] = []
+    errors: list[tuple[str, str]] = []
+    pipeline: _BulkIngestPipeline[str] = _BulkIngestPipeline(
+        repository,
+        fetch,
+        on_complete=lambda row, fetched: completed.append(row),
+        on_error=lambda row, exc: errors.append((row, str(exc))),
+        flush_rows=100,
+    )
+    try:
+        for ticker in ("INFY", "EMPTY", "TCS"):
+            pipeline.submit(ticker, ticker, "1d", [(0, 86400)])
+        assert completed == [] and errors == []
+        pipeline.finish()
+    finally:
+        pipeline.close()
+
+    assert completed == ["EMPTY"]
+    assert errors == [
+        ("INFY", "Failed to upsert candles"),
+        ("TCS", "Failed to upsert candles"),
+    ]
@@ -1,6 +1,16 @@
 from datetime import datetime, timezone
 
-from data_warehouse.core.gap_detection import detect_missing_ranges
+from data_warehouse.core.gap_detection import (
+    chunk_ranges,
+    coalesce_ranges,
+    common_ranges,
+    detect_missing_ranges,
+    expected_slot_count,
+    intersect_ranges,
+    missing_range_array,
+    missing_ranges_outside,
+    subtract_ranges,
+)
 
 
 def test_detect_missing_ranges_with_internal_gap():
@@ -48,3 +58,97 @@ def test_detect_missing_ranges_skips_weekend_slots() -> None:
     )
 
     assert missing == [(monday, monday)]
+
+
+def test_chunk_ranges_splits_long_spans():
+    assert chunk_ranges([(0, 9), (20, 22)], max_span=4) == [
+        (0, 3),
+        (4, 7),
+        (8, 9),
+        (20, 22),
+    ]
+    assert chunk_ranges([(0, 3), (20, 22)], max_span=4) == [(0, 3), (20, 22)]
+
+
+def test_intersect_ranges_returns_all_overlaps():
+    primary = [(0, 10), (20, 30)]
+    secondary = [(5, 7), (9, 22), (29, 40)]
+
+    assert intersect_ranges(primary, secondary) == [
+        (5, 7),
+        (9, 10),
+        (20, 22),
+        (29, 30),
+    ]
+    assert intersect_ranges(primary, []) == []
+
+
+def test_subtract_ranges_removes_exclusions():
+    source = [(0, 10), (20, 30)]
+    exclusions = [(3, 4), (8, 21), (30, 35)]
+
+    assert subtract_ranges(source, exclusions) == [(0, 2), (5, 7), (22, 29)]
+    assert subtract_ranges(source, []) == source
+
+
+def test_common_ranges_keeps_only_fully_covered_spans():
+    range_lists = [
+        [(0, 10), (20, 30)],
+        [(5, 25)],
+        [(0, 7), (9, 40)],
+    ]
+
+    assert common_ranges(range_lists) == [(5, 7), (9, 10), (20, 25)]
+    assert common_ranges([[(0, 10)], []]) == []
+    assert common_ranges([]) == []
+
+
+def test_missing_range_array_skips_weekends():
+    # Friday 2024-01-05 through Tuesday 2024-01-09, daily candles.
+    friday = int(datetime(2024, 1, 5, tzinfo=timezone.utc).timestamp())
+    tuesday = friday + 4 * 86400
+
+    gaps = missing_range_array(
+        start_epoch=friday,
+        end_epoch=tuesday,
+        existing_epochs=[friday + 3 * 86400],
+        interval_seconds=86400,
+    )
+
+    assert gaps.shape == (2, 2)
+    assert gaps.tolist() == [[friday, friday], [tuesday, tuesday]]
+
+
+def test_expected_slot_count_ignores_weekends():
+    friday = int(datetime(2024, 1, 5, tzinfo=timezone.utc).timestamp())
+
+    assert expected_slot_count(friday, friday + 6 * 86400, 86400) == 5
+    assert expected_slot_count(friday, friday - 1, 86400) == 0
+
+
+def test_coalesce_ranges_merges_nearby_gaps() -> None:
+    ranges = [(300, 360), (0, 60), (120, 180), (1000, 1060)]
+
+    assert coalesce_ranges(ranges, tolerance=120) == [(0, 360), (1000, 1060)]
+    assert coalesce_ranges(ranges, tolerance=60) == [
+        (0, 180),
+        (300, 360),
+        (1000, 1060),
+    ]
+    assert coalesce_ranges(ranges, tolerance=59) == [
+        (0, 60),
+        (120, 180),
+        (300, 360),
+        (1000, 1060),
+    ]
+    assert coalesce_ranges([], tolerance=60) == []
+
+
+def test_missing_ranges_outside_matches_epoch_based_detection() -> None:
+    existing = [0, 60, 180, 240, 300, 600]
+    runs = [(0, 60), (180, 300), (600, 600)]
+
+    assert missing_ranges_outside(0, 660, runs, 60) == detect_missing_ranges(
+        start_epoch=0, end_epoch=660, existing_epochs=existing, interval_seconds=60
+    )
+    assert missing_ranges_outside(0, 120, [], 60) == [(0, 120)]
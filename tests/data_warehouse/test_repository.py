@@ -2,7 +2,14 @@ import sqlite3
 
 import pytest
 
-from data_warehouse.db.db import SCHEMA_SQL
+from data_warehouse.core.time_utils import epochs_to_ist_iso
+from data_warehouse.db.db import (
+    SCHEMA_SQL,
+    ConnectionPool,
+    ensure_timestamp_column,
+    get_connection,
+    init_db,
+)
 from data_warehouse.db.repository import WarehouseRepository
 from data_warehouse.schemas.ohlcv_data import OHLCVCandle
 
@@ -136,3 +143,362 @@ def test_job_persistence_roundtrip(repository: WarehouseRepository) -> None:
     assert job["job_id"] == "job-1"
     assert job["status"] == "completed"
     assert job["inserted"] == 5
+
+
+def test_merge_job_updates_payload_in_place(repository: WarehouseRepository) -> None:
+    repository.create_job("job-1", "add", "queued")
+    repository.update_job("job-1", "running", {"inserted": 5, "error": "x"})
+
+    job = repository.merge_job(
+        "job-1", None, {"error": None, "current": {"ticker": "TCS"}}
+    )
+
+    assert job == repository.get_job("job-1")
+    assert job is not None
+    assert job["status"] == "running"
+    assert job["inserted"] == 5
+    assert job["error"] is None
+    assert job["current"] == {"ticker": "TCS"}
+    assert repository.merge_job("missing", "failed", {}) is None
+
+
+def test_patch_job_sets_only_given_fields(repository: WarehouseRepository) -> None:
+    repository.create_job("job-1", "bulk_add", "queued")
+    repository.update_job("job-1", "running", {"inserted": 5, "ticker": "TCS"})
+    fields = {f"field_{index}": index for index in range(100)}
+
+    repository.patch_job("job-1", "completed", {**fields, "ticker": "INFY"})
+
+    job = repository.get_job("job-1")
+    assert job is not None
+    assert job["status"] == "completed"
+    assert job["inserted"] == 5
+    assert job["ticker"] == "INFY"
+    assert job["field_99"] == 99
+
+
+def test_upsert_ohlcv_multi_pages_across_tickers(
+    repository: WarehouseRepository,
+) -> None:
+    candles = [
+        OHLCVCandle(
+            epoch=1700000000 + offset * 86400,
+            open=100.0,
+            high=110.0,
+            low=90.0,
+            close=105.0,
+            volume=1000,
+        )
+        for offset in range(5)
+    ]
+
+    inserted = repository.upsert_ohlcv_multi(
+        [("RELIANCE", "1d", candles), ("TCS", "1d", candles[:2])],
+        page_size=2,
+    )
+
+    assert inserted == 7
+    assert repository.get_ohlcv_count("RELIANCE", "1d", 0, 2**31) == 5
+    assert repository.get_ohlcv_count("TCS", "1d", 0, 2**31) == 2
+
+
+def test_get_missing_ranges_multi_groups_by_ticker(
+    repository: WarehouseRepository,
+) -> None:
+    def candle(epoch: int) -> OHLCVCandle:
+        return OHLCVCandle(
+            epoch=epoch, open=1.0, high=1.0, low=1.0, close=1.0, volume=1
+        )
+
+    # 1970-01-05 was a Monday.
+    monday = 4 * 86400
+    repository.upsert_ohlcv_batch(
+        "RELIANCE", "1m", [candle(monday), candle(monday + 60)]
+    )
+    repository.upsert_ohlcv_batch(
+        "TCS", "1m", [candle(monday + 120), candle(monday + 600)]
+    )
+    repository.upsert_ohlcv_batch("TCS", "5m", [candle(monday)])
+
+    gaps = repository.get_missing_ranges_multi(
+        ["RELIANCE", "TCS", "INFY"], "1m", monday, monday + 240, 60
+    )
+
+    assert gaps == {
+        "RELIANCE": [(monday + 120, monday + 240)],
+        "TCS": [(monday, monday + 60), (monday + 180, monday + 240)],
+        "INFY": [(monday, monday + 240)],
+    }
+
+
+def test_get_missing_ranges_returns_gaps_between_stored_runs(
+    repository: WarehouseRepository,
+) -> None:
+    def candle(epoch: int) -> OHLCVCandle:
+        return OHLCVCandle(
+            epoch=epoch, open=1.0, high=1.0, low=1.0, close=1.0, volume=1
+        )
+
+    # 1970-01-05 was a Monday; the off-grid 1050 never counts as stored.
+    monday = 4 * 86400
+    stored = [monday + offset for offset in (0, 60, 180, 240, 1050)]
+    repository.upsert_ohlcv_batch("RELIANCE", "1m", [candle(e) for e in stored])
+
+    gaps = repository.get_missing_ranges(
+        "RELIANCE", "1m", monday, monday + 360, interval_seconds=60
+    )
+
+    assert gaps == [(monday + 120, monday + 120), (monday + 300, monday + 360)]
+    assert repository.get_missing_ranges("INFY", "1m", monday, monday + 60, 60) == [
+        (monday, monday + 60)
+    ]
+
+
+def test_get_range_coverage_bulk_maps_each_pair(
+    repository: WarehouseRepository,
+) -> None:
+    def candle(epoch: int) -> OHLCVCandle:
+        return OHLCVCandle(
+            epoch=epoch, open=1.0, high=1.0, low=1.0, close=1.0, volume=1
+        )
+
+    repository.upsert_ohlcv_batch("RELIANCE", "1d", [candle(100), candle(200)])
+    repository.upsert_ohlcv_batch("TCS", "1h", [candle(160)])
+
+    coverage = repository.get_range_coverage_bulk(
+        [("RELIANCE", "1d"), ("TCS", "1h"), ("TCS", "1d"), ("INFY", "1d")]
+    )
+
+    assert coverage == {
+        ("RELIANCE", "1d"): (100, 200),
+        ("TCS", "1h"): (160, 160),
+        ("TCS", "1d"): None,
+        ("INFY", "1d"): None,
+    }
+    assert repository.get_range_coverage("RELIANCE", "1d") == (100, 200)
+
+
+def test_get_connection_applies_bulk_write_pragmas(tmp_path) -> None:
+    connection = get_connection(str(tmp_path / "pragmas.db"))
+    try:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # 1 == NORMAL, 2 == MEMORY
+        assert connection.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert connection.execute("PRAGMA temp_store").fetchone()[0] == 2
+        assert connection.execute("PRAGMA cache_size").fetchone()[0] == -65536
+    finally:
+        connection.close()
+
+
+def test_pooled_writer_and_reader_share_the_database(tmp_path) -> None:
+    db_path = str(tmp_path / "pool.db")
+    init_db(db_path)
+    pool = ConnectionPool(db_path, max_size=2)
+    repository = WarehouseRepository(get_connection(db_path), pool=pool)
+    candle = OHLCVCandle(
+        epoch=1700000000, open=1.0, high=1.0, low=1.0, close=1.0, volume=1
+    )
+    try:
+        with repository.writer() as writer:
+            assert writer.connection is not repository.connection
+            writer.upsert_ohlcv_multi([("RELIANCE", "1d", [candle])])
+        with repository.reader() as reader:
+            assert reader.get_last_epoch("RELIANCE", "1d") == 1700000000
+        assert repository.get_last_epoch("RELIANCE", "1d") == 1700000000
+    finally:
+        pool.close()
+
+
+def test_job_listings_page_in_index_order(repository: WarehouseRepository) -> None:
+    for where in ("", "WHERE status = 'running'", "WHERE job_type = 'add'"):
+        plan = repository.connection.execute(
+            f"EXPLAIN QUERY PLAN SELECT job_id FROM jobs {where} "
+            "ORDER BY created_at DESC LIMIT 10"
+        ).fetchall()
+        assert not any("TEMP B-TREE" in row[3] for row in plan)
+
+
+def test_job_failures_are_appended_and_paged(repository: WarehouseRepository) -> None:
+    repository.create_job("job-1", "bulk_add", "running")
+    repository.append_job_failures("job-1", [(3, "bad range"), (0, "bad ticker")])
+    repository.append_job_failure("job-1", 7, "provider error")
+
+    assert repository.count_job_failures("job-1") == 3
+    assert repository.list_job_failures("job-1", limit=2, offset=1) == [
+        {"row": 3, "error": "bad range"},
+        {"row": 7, "error": "provider error"},
+    ]
+    assert repository.list_job_failures("job-2") == []
+
+
+def test_get_ohlcv_page_with_count_reports_range_total(
+    repository: WarehouseRepository,
+) -> None:
+    repository.upsert_ohlcv_batch(
+        "RELIANCE",
+        "1d",
+        [
+            OHLCVCandle(
+                epoch=1700000000 + offset * 86400,
+                open=100.0,
+                high=110.0,
+                low=90.0,
+                close=105.0,
+                volume=1000,
+            )
+            for offset in range(5)
+        ],
+    )
+    end_epoch = 1700000000 + 4 * 86400
+
+    page, total = repository.get_ohlcv_page_with_count(
+        "RELIANCE", "1d", 1700000000, end_epoch, limit=2, offset=1
+    )
+    assert total == 5
+    assert [row["epoch"] for row in page] == [
+        1700000000 + 3 * 86400,
+        1700000000 + 2 * 86400,
+    ]
+
+    past_end, total = repository.get_ohlcv_page_with_count(
+        "RELIANCE", "1d", 1700000000, end_epoch, limit=2, offset=10
+    )
+    assert past_end == []
+    assert total == 5
+
+    missing, total = repository.get_ohlcv_page_with_count(
+        "UNKNOWN", "1d", 1700000000, end_epoch, limit=2, offset=0, columnar=True
+    )
+    assert missing["epoch"] == []
+    assert total == 0
+
+
+def test_list_all_ticker_timeframes_groups_in_one_query(
+    repository: WarehouseRepository,
+) -> None:
+    candle = OHLCVCandle(
+        epoch=1700000000,
+        open=100.0,
+        high=110.0,
+        low=90.0,
+        close=105.0,
+        volume=1000,
+    )
+    repository.upsert_ohlcv_batch("TCS", "1h", [candle])
+    repository.upsert_ohlcv_batch("TCS", "1d", [candle])
+    repository.upsert_ohlcv_batch("INFY", "1d", [candle])
+    repository.ensure_ticker("EMPTY")
+
+    assert repository.list_all_ticker_timeframes() == {
+        "EMPTY": [],
+        "INFY": ["1d"],
+        "TCS": ["1d", "1h"],
+    }
+
+
+def test_generated_timestamp_column_matches_python_formatting() -> None:
+    connection = sqlite3.connect(":memory:")
+    connection.row_factory = sqlite3.Row
+    connection.executescript(SCHEMA_SQL)
+    assert ensure_timestamp_column(connection)
+    assert ensure_timestamp_column(connection)
+    repository = WarehouseRepository(connection)
+    epochs = [1700000000, 1710480600, 1720000123]
+    repository.upsert_ohlcv_batch(
+        "RELIANCE",
+        "1m",
+        [
+            OHLCVCandle(
+                epoch=epoch,
+                open=100.0,
+                high=110.0,
+                low=90.0,
+                close=105.0,
+                volume=1000,
+            )
+            for epoch in epochs
+        ],
+    )
+
+    page, _ = repository.get_ohlcv_page_with_count(
+        "RELIANCE", "1m", epochs[0], epochs[-1], limit=10, offset=0
+    )
+    columns, _ = repository.get_ohlcv_page_with_count(
+        "RELIANCE", "1m", epochs[0], epochs[-1], limit=10, offset=0, columnar=True
+    )
+
+    expected = epochs_to_ist_iso(sorted(epochs, reverse=True))
+    assert [row["timestamp_ist"] for row in page] == expected
+    assert columns["timestamp_ist"] == expected
+
+
+def test_ohlcv_exists_in_range(repository: WarehouseRepository) -> None:
+    candle = OHLCVCandle(
+        epoch=1700000000,
+        open=100.0,
+        high=110.0,
+        low=90.0,
+        close=105.0,
+        volume=1000,
+    )
+    repository.upsert_ohlcv_batch("RELIANCE", "1d", [candle])
+
+    assert repository.ohlcv_exists_in_range("RELIANCE", "1d", 1699999999, 1700000001)
+    assert not repository.ohlcv_exists_in_range("RELIANCE", "1h", 0, 2**31)
+    assert not repository.ohlcv_exists_in_range("RELIANCE", "1d", 0, 1699999999)
+    assert not repository.ohlcv_exists_in_range("UNKNOWN", "1d", 0, 2**31)
+
+
+def test_get_ohlcv_array_matches_row_reads(repository: WarehouseRepository) -> None:
+    candles = [
+        OHLCVCandle(
+            epoch=1700000000 + offset * 60,
+            open=100.0 + offset,
+            high=110.5,
+            low=90.25,
+            close=105.0,
+            volume=1000 + offset,
+        )
+        for offset in range(4)
+    ]
+    repository.upsert_ohlcv_batch("RELIANCE", "1m", candles)
+
+    array = repository.get_ohlcv_array("RELIANCE", "1m", 0, 2**31)
+    rows = repository.get_ohlcv("RELIANCE", "1m", 0, 2**31)
+
+    assert array.dtype.names == ("epoch", "open", "high", "low", "close", "volume")
+    assert [dict(zip(array.dtype.names, item.tolist())) for item in array] == rows
+    assert repository.get_ohlcv_array("UNKNOWN", "1m", 0, 2**31).size == 0
+
+
+def test_create_failed_ingestions_bulk_records_every_row(
+    repository: WarehouseRepository,
+) -> None:
+    repository.create_failed_ingestions_bulk(
+        [
+            ("RELIANCE", "1d", "timeout", 100, 200),
+            ("TCS", "1h", "no candles", None, None),
+        ]
+    )
+
+    failures = repository.list_failed_ingestions()
+    assert sorted(
+        (row["ticker"], row["timeframe"], row["error_reason"]) for row in failures
+    ) == [("RELIANCE", "1d", "timeout"), ("TCS", "1h", "no candles")]
+    assert repository.count_failed_ingestions() == 2
+
+
+def test_finalize_failed_retry_counts_and_resolves(
+    repository: WarehouseRepository,
+) -> None:
+    repository.create_failed_ingestion("RELIANCE", "1d", "timeout")
+    failed_id = repository.list_failed_ingestions()[0]["id"]
+
+    repository.finalize_failed_retry(failed_id, success=False)
+    [failure] = repository.list_failed_ingestions(status="failed")
+    assert failure["retry_count"] == 1
+
+    repository.finalize_failed_retry(failed_id, success=True)
+    assert repository.list_failed_ingestions(status="failed") == []
+    [resolved] = repository.list_failed_ingestions(status="resolved")
+    assert resolved["retry_count"] == 2
@@ -5,6 +5,7 @@ from data_warehouse.schemas.requests import (
     AddStockRequest,
     BulkAddRequest,
     BulkAddRow,
+    CsvAddStockRequest,
     EpochRange,
 )
 from data_warehouse.schemas.ohlcv_data import OHLCVCandle
@@ -45,3 +46,29 @@ def test_bulk_request_accepts_multiple_rows():
         ]
     )
     assert len(payload.rows) == 2
+
+
+def test_csv_add_request_parses_csv_style_fields():
+    request = CsvAddStockRequest.model_validate(
+        {
+            "ticker": "reliance",
+            "range": '{"start_epoch": 1, "end_epoch": 2}',
+            "start_date": "",
+            "end_date": " ",
+        }
+    )
+
+    assert request.range == EpochRange(start_epoch=1, end_epoch=2)
+    assert request.start_date is None
+    assert request.end_date is None
+    blank = CsvAddStockRequest.model_validate({"ticker": "x", "range": ""})
+    assert blank.range is None
+
+
+def test_add_request_rejects_string_range():
+    with pytest.raises(ValidationError):
+        AddStockRequest.model_validate(
+            {"ticker": "RELIANCE", "range": '{"start_epoch": 1, "end_epoch": 2}'}
+        )
+    with pytest.raises(ValidationError):
+        AddStockRequest.model_validate({"ticker": "RELIANCE", "start_date": ""})
@@ -0,0 +1,24 @@
+import json
+
+import numpy as np
+import pytest
+
+from data_warehouse.core.serialization import dumps_bytes, loads
+
+
+def test_dumps_bytes_encodes_plain_and_numpy_values() -> None:
+    payload = {"ticker": "RELIANCE", "total": 2, "candles": [{"close": 105.5}]}
+
+    assert json.loads(dumps_bytes(payload)) == payload
+    assert json.loads(dumps_bytes({"epoch": np.array([1, 2], dtype=np.int64)})) == {
+        "epoch": [1, 2]
+    }
+
+
+def test_loads_parses_json_and_rejects_malformed_text() -> None:
+    assert loads('{"start_epoch": 1, "end_epoch": 2}') == {
+        "start_epoch": 1,
+        "end_epoch": 2,
+    }
+    with pytest.raises(ValueError):
+        loads("not json")
@@ -1,23 +1,38 @@
 import sqlite3
+import threading
+import time
 from datetime import datetime, timezone
+from typing import Callable
 
 import pytest
 
+from data_warehouse.core.errors import RepositoryError
 from data_warehouse.core.gap_detection import TIMEFRAME_TO_SECONDS
-from data_warehouse.db.db import SCHEMA_SQL
+from data_warehouse.db.db import (
+    SCHEMA_SQL,
+    ConnectionPool,
+    get_connection,
+    init_db,
+)
 from data_warehouse.db.repository import WarehouseRepository
 from data_warehouse.schemas.ohlcv_data import OHLCVCandle
 from data_warehouse.schemas.requests import (
     AddStockRequest,
     BulkAddRequest,
     BulkAddRow,
+    DeleteStockRequest,
     EpochRange,
     GetStockRequest,
     GapFillRequest,
     Timeframe,
     UpdateStockRequest,
 )
-from data_warehouse.services.warehouse_service import JobStore, WarehouseService
+from data_warehouse.services.warehouse_service import (
+    JobProgressBuffer,
+    JobStore,
+    MemoryJobStore,
+    WarehouseService,
+)
 
 
 class FakeOpenAlgoClient:
@@ -54,6 +69,18 @@ class FakeOpenAlgoClient:
         ]
 
 
+class BarrierClient(FakeOpenAlgoClient):
+    """Fake client whose fetches wait until `parties` of them run at once."""
+
+    def __init__(self, candles: list[OHLCVCandle], parties: int = 2):
+        super().__init__(candles)
+        self.barrier = threading.Barrier(parties, timeout=5)
+
+    def fetch_ohlcv(self, *args, **kwargs) -> list[OHLCVCandle]:
+        self.barrier.wait()
+        return super().fetch_ohlcv(*args, **kwargs)
+
+
 @pytest.fixture()
 def repository() -> WarehouseRepository:
     connection = sqlite3.connect(":memory:")
@@ -78,6 +105,22 @@ def build_service(
     )
 
 
+def candle_factory(base: int, interval: int) -> Callable[[int], OHLCVCandle]:
+    """Return a builder for identical candles `offset` intervals after `base`."""
+
+    def candle(offset: int) -> OHLCVCandle:
+        return OHLCVCandle(
+            epoch=base + offset * interval,
+            open=100.0,
+            high=110.0,
+            low=90.0,
+            close=105.0,
+            volume=1000,
+        )
+
+    return candle
+
+
 def test_process_add_short_circuits_when_present(
     repository: WarehouseRepository, job_store: JobStore
 ) -> None:
@@ -356,6 +399,84 @@ def test_process_bulk_add_tracks_failures(
     assert data["failure_count"] == 0
 
 
+def test_process_bulk_add_coalesces_progress_writes(
+    repository: WarehouseRepository, job_store: JobStore, monkeypatch
+) -> None:
+    candle = OHLCVCandle(
+        epoch=1700000000,
+        open=100.0,
+        high=110.0,
+        low=90.0,
+        close=105.0,
+        volume=1000,
+    )
+    service = build_service(repository, job_store, [candle])
+    job = job_store.create("bulk_add")
+    writes: list[dict] = []
+    update = job_store.update
+
+    def recording_update(job_id: str, **kwargs) -> dict:
+        writes.append(kwargs)
+        return update(job_id, **kwargs)
+
+    monkeypatch.setattr(job_store, "update", recording_update)
+    rows = [
+        BulkAddRow(
+            ticker=f"TICK{index}",
+            timeframe="1d",
+            range=EpochRange(start_epoch=1700000000, end_epoch=1700000000),
+        )
+        for index in range(10)
+    ]
+
+    service.process_bulk_add(job["job_id"], BulkAddRequest(rows=rows))
+
+    # One "running" write, one coalesced progress write and the final status.
+    assert len(writes) == 3
+    data = job_store.get(job["job_id"])
+    assert data is not None
+    assert data["status"] == "completed"
+    assert data["processed_count"] == 10
+    assert data["progress_pct"] == 100
+
+
+def test_process_bulk_add_writes_rows_in_one_transaction(
+    repository: WarehouseRepository, job_store: JobStore, monkeypatch
+) -> None:
+    candle = OHLCVCandle(
+        epoch=1700000000,
+        open=100.0,
+        high=110.0,
+        low=90.0,
+        close=105.0,
+        volume=1000,
+    )
+    service = build_service(repository, job_store, [candle])
+    job = job_store.create("bulk_add")
+    flushes: list[int] = []
+    upsert_multi = repository.upsert_ohlcv_multi
+
+    def recording_upsert_multi(batches, **kwargs) -> int:
+        batches = list(batches)
+        flushes.append(len(batches))
+        return upsert_multi(batches, **kwargs)
+
+    monkeypatch.setattr(repository, "upsert_ohlcv_multi", recording_upsert_multi)
+    rows = [
+        BulkAddRow(
+            ticker=f"TICK{index}",
+            timeframe="1d",
+            range=EpochRange(start_epoch=1700000000, end_epoch=1700000000),
+        )
+        for index in range(4)
+    ]
+
+    service.process_bulk_add(job["job_id"], BulkAddRequest(rows=rows))
+
+    assert flushes == [4]
+    assert repository.get_ohlcv_count("TICK3", "1d", 0, 2**31) == 1
+
+
 def test_get_stock_data_page_fetches_and_persists_when_ticker_missing(
     repository: WarehouseRepository, job_store: JobStore
 ) -> None:
@@ -434,6 +555,247 @@ def test_get_stock_data_page_fetches_when_timeframe_data_missing(
     assert len(payload["candles"]) == 1
 
 
+def test_get_stock_data_page_columnar_matches_rows(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    candles = [
+        OHLCVCandle(
+            epoch=1700000000 + offset * 86400,
+            open=100.0 + offset,
+            high=110.0,
+            low=90.0,
+            close=105.0,
+            volume=1000 + offset,
+        )
+        for offset in range(3)
+    ]
+    repository.upsert_ohlcv_batch("RELIANCE", "1d", candles)
+    service = WarehouseService(
+        repository=repository,
+        provider=FakeOpenAlgoClient([]),
+        job_store=job_store,
+    )
+    request = GetStockRequest(
+        ticker="RELIANCE",
+        timeframe="1d",
+        range=EpochRange(start_epoch=1700000000, end_epoch=1700172800),
+    )
+
+    rows = service.get_stock_data_page(request=request, limit=50, offset=0)
+    columns = service.get_stock_data_page(
+        request=request, limit=50, offset=0, columnar=True
+    )
+
+    assert columns["total"] == rows["total"] == 3
+    for field, values in columns["candles"].items():
+        assert values == [candle[field] for candle in rows["candles"]]
+
+
+def test_get_stock_data_page_follows_epoch_cursor(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    epochs = [1700000000 + offset * 86400 for offset in range(5)]
+    repository.upsert_ohlcv_batch(
+        "RELIANCE",
+        "1d",
+        [
+            OHLCVCandle(
+                epoch=epoch,
+                open=100.0,
+                high=110.0,
+                low=90.0,
+                close=105.0,
+                volume=1000,
+            )
+            for epoch in epochs
+        ],
+    )
+    service = build_service(repository, job_store, [])
+    request = GetStockRequest(
+        ticker="RELIANCE",
+        timeframe="1d",
+        range=EpochRange(start_epoch=epochs[0], end_epoch=epochs[-1]),
+    )
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        payload = service.get_stock_data_page(
+            request=request, limit=2, offset=0, before_epoch=cursor
+        )
+        assert payload["total"] == 5
+        seen.extend(candle["epoch"] for candle in payload["candles"])
+        cursor = payload["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sorted(epochs, reverse=True)
+
+
+def test_get_stock_data_page_etag_changes_only_when_data_changes(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    candle = OHLCVCandle(
+        epoch=1700000000,
+        open=100.0,
+        high=110.0,
+        low=90.0,
+        close=105.0,
+        volume=1000,
+    )
+    service = build_service(repository, job_store, [])
+    request = GetStockRequest(
+        ticker="RELIANCE",
+        timeframe="1d",
+        range=EpochRange(start_epoch=1700000000, end_epoch=1700086400),
+    )
+    assert service.get_stock_data_page_etag(request, limit=50, offset=0) is None
+
+    repository.upsert_ohlcv_batch("RELIANCE", "1d", [candle])
+    etag = service.get_stock_data_page_etag(request, limit=50, offset=0)
+    assert etag == service.get_stock_data_page_etag(request, limit=50, offset=0)
+    assert etag != service.get_stock_data_page_etag(request, limit=50, offset=50)
+
+    repository.upsert_ohlcv_batch("RELIANCE", "1d", [candle])
+    rewritten = service.get_stock_data_page_etag(request, limit=50, offset=0)
+    assert rewritten != etag
+
+    repository.delete_ohlcv("RELIANCE", None, 1700000000, 1700000000)
+    assert service.get_stock_data_page_etag(request, limit=50, offset=0) != rewritten
+
+
+def test_get_stock_data_multi_slices_page_from_chart_window(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    epochs = [1700000000 + offset * 86400 for offset in range(8)]
+    repository.upsert_ohlcv_batch(
+        "RELIANCE",
+        "1d",
+        [
+            OHLCVCandle(
+                epoch=epoch,
+                open=100.0,
+                high=110.0,
+                low=90.0,
+                close=105.0,
+                volume=1000,
+            )
+            for epoch in epochs
+        ],
+    )
+    service = build_service(repository, job_store, [])
+    request = GetStockRequest(
+        ticker="RELIANCE",
+        timeframe="1d",
+        range=EpochRange(start_epoch=epochs[0], end_epoch=epochs[-1]),
+    )
+    expected = service.get_stock_data_page(request=request, limit=3, offset=3)
+    page_reads = []
+    read_page = repository.get_ohlcv_page_with_count
+
+    def counting_read(*args, **kwargs):
+        page_reads.append(kwargs["limit"])
+        return read_page(*args, **kwargs)
+
+    repository.get_ohlcv_page_with_count = counting_read  # type: ignore[method-assign]
+
+    page, chart = service.get_stock_data_multi(
+        request, page_limit=3, page_offset=3, chart_limit=6
+    )
+    assert page == expected
+    assert chart["candles"]["epoch"] == epochs[:1:-1]
+    assert page_reads == [6]
+
+    page, _ = service.get_stock_data_multi(
+        request, page_limit=3, page_offset=6, chart_limit=6
+    )
+    assert [candle["epoch"] for candle in page["candles"]] == epochs[1::-1]
+    assert page_reads == [6, 6, 3]
+
+
+def test_get_stock_data_multi_falls_back_to_stored_range(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    candle = OHLCVCandle(
+        epoch=1700000000,
+        open=100.0,
+        high=110.0,
+        low=90.0,
+        close=105.0,
+        volume=1000,
+    )
+    repository.upsert_ohlcv_batch("RELIANCE", "1d", [candle])
+    service = build_service(repository, job_store, [])
+    request = GetStockRequest(
+        ticker="RELIANCE",
+        timeframe="1d",
+        range=EpochRange(start_epoch=1710000000, end_epoch=1710086400),
+    )
+
+    page, _ = service.get_stock_data_multi(request, page_limit=10, page_offset=0)
+    assert page["candles"] == []
+
+    page, chart = service.get_stock_data_multi(
+        request, page_limit=10, page_offset=0, fallback_to_stored=True
+    )
+    assert page["range"] == {"start_epoch": 1700000000, "end_epoch": 1700000000}
+    assert chart["candles"]["epoch"] == [1700000000]
+
+
+def test_default_range_is_reused_until_the_clock_moves(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    now = [1700000000]
+    service = WarehouseService(
+        repository=repository,
+        provider=FakeOpenAlgoClient([]),
+        job_store=job_store,
+        clock=lambda: now[0],
+    )
+
+    first = service.default_range()
+    assert service.default_range() is first
+    assert first.end_epoch - first.start_epoch == 365 * 24 * 60 * 60
+
+    now[0] += 1
+    assert service.default_range().end_epoch == 1700000001
+
+
+def test_get_ohlcv_range_remembers_populated_ranges(
+    repository: WarehouseRepository, job_store: JobStore, monkeypatch
+) -> None:
+    candle = OHLCVCandle(
+        epoch=1700000000,
+        open=100.0,
+        high=110.0,
+        low=90.0,
+        close=105.0,
+        volume=1000,
+    )
+    repository.upsert_ohlcv_batch("RELIANCE", "1d", [candle])
+    service = build_service(repository, job_store, [candle])
+    selected_range = EpochRange(start_epoch=1700000000, end_epoch=1700000000)
+    counts: list[str] = []
+    original_exists = repository.ohlcv_exists_in_range
+
+    def counting(ticker, *args, **kwargs):
+        counts.append(ticker)
+        return original_exists(ticker, *args, **kwargs)
+
+    monkeypatch.setattr(repository, "ohlcv_exists_in_range", counting)
+
+    for _ in range(3):
+        assert service.get_ohlcv_range("RELIANCE", "1d", selected_range)
+    assert counts == ["RELIANCE"]
+
+    job = job_store.create("delete")
+    service.process_delete(
+        job["job_id"], DeleteStockRequest(ticker="RELIANCE", timeframe="1d")
+    )
+    assert service.get_ohlcv_range("RELIANCE", "1d", selected_range)
+    assert counts == ["RELIANCE", "RELIANCE"]
+
+
 def test_gap_fill_excludes_common_gaps(
     repository: WarehouseRepository, job_store: JobStore
 ) -> None:
@@ -496,3 +858,1020 @@ def test_gap_fill_excludes_common_gaps(
     assert provider.calls == [expected_call, expected_call]
     assert repository.get_ohlcv("AAA", "1d", epochs[1], epochs[1])
     assert repository.get_ohlcv("CCC", "1d", epochs[1], epochs[1])
+
+
+def test_gap_fill_writes_each_ticker_once(
+    repository: WarehouseRepository, job_store: JobStore, monkeypatch
+) -> None:
+    interval = TIMEFRAME_TO_SECONDS["1d"]
+    base = int(datetime(2026, 2, 16, tzinfo=timezone.utc).timestamp())
+    candle = candle_factory(base, interval)
+
+    repository.upsert_ohlcv_batch("AAA", "1d", [candle(0), candle(2), candle(4)])
+    repository.upsert_ohlcv_batch("BBB", "1d", [candle(0), candle(1), candle(3)])
+    provider = FakeOpenAlgoClient([candle(offset) for offset in range(5)])
+    service = WarehouseService(
+        repository=repository,
+        provider=provider,
+        job_store=job_store,
+    )
+    writes: list[tuple[str, list[int]]] = []
+    original_upsert = repository.upsert_ohlcv_batch
+
+    def recording_upsert(ticker, timeframe, candles, *args, **kwargs):
+        writes.append((ticker, [item.epoch for item in candles]))
+        return original_upsert(ticker, timeframe, candles, *args, **kwargs)
+
+    monkeypatch.setattr(repository, "upsert_ohlcv_batch", recording_upsert)
+
+    job = job_store.create("gap_fill")
+    service.process_gap_fill(
+        job["job_id"],
+        GapFillRequest(
+            timeframe="1d",
+            range=EpochRange(start_epoch=base, end_epoch=base + 4 * interval),
+        ),
+    )
+
+    assert len(provider.calls) == 4
+    assert writes == [
+        ("AAA", [base + interval, base + 3 * interval]),
+        ("BBB", [base + 2 * interval, base + 4 * interval]),
+    ]
+    assert repository.get_ohlcv_count("AAA", "1d", base, base + 4 * interval) == 5
+
+
+def test_gap_fill_fetches_tickers_concurrently(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    interval = TIMEFRAME_TO_SECONDS["1d"]
+    base = int(datetime(2026, 2, 16, tzinfo=timezone.utc).timestamp())
+    candle = candle_factory(base, interval)
+
+    repository.upsert_ohlcv_batch("AAA", "1d", [candle(0), candle(2)])
+    repository.upsert_ohlcv_batch("BBB", "1d", [candle(0), candle(1)])
+    # Both tickers must be fetching at once to get past the barrier.
+    provider = BarrierClient([candle(offset) for offset in range(3)])
+    service = WarehouseService(
+        repository=repository,
+        provider=provider,
+        job_store=job_store,
+        max_fetch_workers=2,
+    )
+
+    job = job_store.create("gap_fill")
+    service.process_gap_fill(
+        job["job_id"],
+        GapFillRequest(
+            timeframe="1d",
+            range=EpochRange(start_epoch=base, end_epoch=base + 2 * interval),
+        ),
+    )
+
+    snapshot = job_store.get(job["job_id"])
+    assert snapshot["status"] == "completed"
+    assert snapshot["processed_count"] == 2
+    for ticker in ("AAA", "BBB"):
+        assert repository.get_ohlcv_count(ticker, "1d", base, base + 2 * interval) == 3
+
+
+def test_gap_fill_counts_failed_gaps_and_samples_tracebacks(
+    repository: WarehouseRepository, job_store: JobStore, caplog
+) -> None:
+    interval = TIMEFRAME_TO_SECONDS["1m"]
+    base = int(datetime(2026, 2, 16, 4, tzinfo=timezone.utc).timestamp())
+    candle = candle_factory(base, interval)
+
+    class FlakyClient(FakeOpenAlgoClient):
+        def fetch_ohlcv(self, ticker, timeframe, start_epoch, end_epoch, exchange=None):
+            if ticker == "AAA":
+                raise RuntimeError("rate limited")
+            return super().fetch_ohlcv(
+                ticker, timeframe, start_epoch, end_epoch, exchange
+            )
+
+    repository.upsert_ohlcv_batch("AAA", "1m", [candle(0), candle(2), candle(4)])
+    repository.upsert_ohlcv_batch(
+        "BBB", "1m", [candle(0), candle(1), candle(3), candle(4)]
+    )
+    service = WarehouseService(
+        repository=repository,
+        provider=FlakyClient([candle(offset) for offset in range(5)]),
+        job_store=job_store,
+    )
+
+    job = job_store.create("gap_fill")
+    with caplog.at_level("ERROR"):
+        service.process_gap_fill(
+            job["job_id"],
+            GapFillRequest(
+                timeframe="1m",
+                range=EpochRange(start_epoch=base, end_epoch=base + 4 * interval),
+            ),
+        )
+
+    snapshot = job_store.get(job["job_id"])
+    assert snapshot["status"] == "completed"
+    assert snapshot["error_count"] == 2
+    assert snapshot["errors_by_ticker"] == {"AAA": 2}
+    assert [record.exc_info is not None for record in caplog.records] == [True]
+    assert repository.get_ohlcv_count("BBB", "1m", base, base + 4 * interval) == 5
+
+
+def test_process_add_fetches_gaps_concurrently(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    interval = TIMEFRAME_TO_SECONDS["1m"]
+    base = int(datetime(2026, 2, 16, 4, tzinfo=timezone.utc).timestamp())
+    candle = candle_factory(base, interval)
+
+    # Gaps at offsets 1 and 100 are too far apart to be coalesced.
+    stored = [offset for offset in range(102) if offset not in (1, 100)]
+    repository.upsert_ohlcv_batch("RELIANCE", "1m", [candle(i) for i in stored])
+    service = WarehouseService(
+        repository=repository,
+        # Both gaps must be in flight at once to get past the barrier.
+        provider=BarrierClient([candle(offset) for offset in range(102)]),
+        job_store=job_store,
+        max_fetch_workers=2,
+    )
+    job = job_store.create("add")
+    end_epoch = base + 101 * interval
+
+    result = service.process_add(
+        job["job_id"],
+        AddStockRequest(
+            ticker="RELIANCE",
+            timeframe="1m",
+            range=EpochRange(start_epoch=base, end_epoch=end_epoch),
+        ),
+    )
+
+    assert result["status"] == "completed"
+    assert result["gaps_filled"] == 2
+    assert result["inserted"] == 2
+    assert repository.get_ohlcv_count("RELIANCE", "1m", base, end_epoch) == 102
+
+
+def test_provider_limiter_paces_every_fetch(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    class CountingLimiter:
+        def __init__(self) -> None:
+            self.acquired = 0
+
+        def acquire(self, tokens: float = 1.0) -> float:
+            self.acquired += 1
+            return 0.0
+
+    limiter = CountingLimiter()
+    provider = FakeOpenAlgoClient([])
+    service = WarehouseService(
+        repository=repository,
+        provider=provider,
+        job_store=job_store,
+        provider_limiter=limiter,  # type: ignore[arg-type]
+    )
+
+    service.get_stock_data_page(
+        request=GetStockRequest(
+            ticker="RELIANCE",
+            timeframe="1d",
+            range=EpochRange(start_epoch=1700000000, end_epoch=1700000000),
+        ),
+        limit=50,
+        offset=0,
+    )
+
+    assert limiter.acquired == len(provider.calls) == 1
+
+
+def test_gap_fill_paces_with_limiter_instead_of_sleeping(
+    repository: WarehouseRepository, job_store: JobStore, monkeypatch
+) -> None:
+    class CountingLimiter:
+        def __init__(self) -> None:
+            self.acquired = 0
+
+        def acquire(self, tokens: float = 1.0) -> float:
+            self.acquired += 1
+            return 0.0
+
+    sleeps: list[float] = []
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+    interval = TIMEFRAME_TO_SECONDS["1d"]
+    base = int(datetime(2026, 2, 16, tzinfo=timezone.utc).timestamp())
+    for ticker in ("AAA", "BBB"):
+        repository.upsert_ohlcv_batch(
+            ticker,
+            "1d",
+            [
+                OHLCVCandle(
+                    epoch=base + offset * interval,
+                    open=100.0,
+                    high=110.0,
+                    low=90.0,
+                    close=105.0,
+                    volume=1000,
+                )
+                for offset in (0, 4 if ticker == "AAA" else 2)
+            ],
+        )
+    limiter = CountingLimiter()
+    provider = FakeOpenAlgoClient([])
+    service = WarehouseService(
+        repository=repository,
+        provider=provider,
+        job_store=job_store,
+        provider_limiter=limiter,  # type: ignore[arg-type]
+    )
+
+    job = job_store.create("gap_fill")
+    service.process_gap_fill(
+        job["job_id"],
+        GapFillRequest(
+            timeframe="1d",
+            range=EpochRange(start_epoch=base, end_epoch=base + 4 * interval),
+        ),
+    )
+
+    assert job_store.get(job["job_id"])["status"] == "completed"
+    assert provider.calls
+    assert limiter.acquired == len(provider.calls)
+    assert sleeps == []
+
+
+def test_process_bulk_csv_fetches_concurrently_and_persists_all_rows(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    candles = [
+        OHLCVCandle(
+            epoch=1700000000 + offset * 86400,
+            open=100.0,
+            high=110.0,
+            low=90.0,
+            close=105.0,
+            volume=1000,
+        )
+        for offset in range(3)
+    ]
+    provider = FakeOpenAlgoClient(candles)
+    service = WarehouseService(
+        repository=repository,
+        provider=provider,
+        job_store=job_store,
+        max_fetch_workers=4,
+    )
+    job = job_store.create("bulk_csv")
+    full_range = '{"start_epoch": 1700000000, "end_epoch": 1700172800}'
+    rows = [
+        {"ticker": "RELIANCE", "timeframe": "1d", "range": full_range},
+        {"ticker": "TCS", "timeframe": "1d", "range": full_range},
+        {"ticker": "RELIANCE", "timeframe": "1d", "range": full_range},
+    ]
+
+    service.process_bulk_csv(job["job_id"], rows)
+
+    data = job_store.get(job["job_id"])
+    assert data is not None
+    assert data["status"] == "completed"
+    assert data["processed_count"] == 3
+    for ticker in ("RELIANCE", "TCS"):
+        assert len(repository.get_ohlcv(ticker, "1d", 1700000000, 1700172800)) == 3
+    # The repeated RELIANCE row sees the first row's candles and fetches nothing.
+    assert len(provider.calls) == 2
+
+
+def test_process_bulk_csv_with_single_connection_pool_does_not_deadlock(
+    tmp_path,
+) -> None:
+    db_path = str(tmp_path / "pool.db")
+    init_db(db_path)
+    pool = ConnectionPool(db_path, max_size=1)
+    repository = WarehouseRepository(get_connection(db_path), pool=pool)
+    job_store = JobStore(repository)
+    candles = [
+        OHLCVCandle(
+            epoch=1700000000 + offset * 86400,
+            open=100.0,
+            high=110.0,
+            low=90.0,
+            close=105.0,
+            volume=1000,
+        )
+        for offset in range(3)
+    ]
+    service = build_service(repository, job_store, candles)
+    job = job_store.create("bulk_csv")
+    full_range = '{"start_epoch": 1700000000, "end_epoch": 1700172800}'
+    rows = [
+        {"ticker": "RELIANCE", "timeframe": "1d", "range": full_range},
+        {"ticker": "RELIANCE", "timeframe": "1d", "range": full_range},
+    ]
+
+    # The repeated pair flushes through the pool's only connection.
+    worker = threading.Thread(
+        target=service.process_bulk_csv, args=(job["job_id"], rows), daemon=True
+    )
+    try:
+        worker.start()
+        worker.join(timeout=10)
+        assert not worker.is_alive()
+        data = job_store.get(job["job_id"])
+        assert data is not None
+        assert data["status"] == "completed"
+        assert len(repository.get_ohlcv("RELIANCE", "1d", 1700000000, 1700172800)) == 3
+    finally:
+        if not worker.is_alive():
+            pool.close()
+
+
+def test_process_bulk_csv_reports_provider_failures(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    class FailingClient(FakeOpenAlgoClient):
+        def fetch_ohlcv(self, *args, **kwargs) -> list[OHLCVCandle]:
+            raise RuntimeError("rate limited")
+
+    service = WarehouseService(
+        repository=repository, provider=FailingClient([]), job_store=job_store
+    )
+    job = job_store.create("bulk_csv")
+    rows = [
+        {
+            "ticker": "RELIANCE",
+            "timeframe": "1d",
+            "range": '{"start_epoch": 1700000000, "end_epoch": 1700172800}',
+        }
+    ]
+
+    service.process_bulk_csv(job["job_id"], rows)
+
+    data = job_store.get(job["job_id"])
+    assert data is not None
+    assert data["status"] == "failed"
+    assert data["error"] == "Provider fetch failed"
+
+
+def test_process_bulk_csv_fetches_long_intraday_ranges_in_chunks(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    provider = FakeOpenAlgoClient([])
+    service = WarehouseService(
+        repository=repository, provider=provider, job_store=job_store
+    )
+    job = job_store.create("bulk_csv")
+    start = 1700000000
+    end = start + 45 * 86400
+    rows = [
+        {
+            "ticker": "RELIANCE",
+            "timeframe": "1m",
+            "range": f'{{"start_epoch": {start}, "end_epoch": {end}}}',
+        }
+    ]
+
+    service.process_bulk_csv(job["job_id"], rows)
+
+    assert job_store.get(job["job_id"])["status"] == "completed"
+    assert provider.calls == [
+        (start, start + 30 * 86400 - 1),
+        (start + 30 * 86400, end),
+    ]
+
+
+def test_process_bulk_csv_fetches_nearby_gaps_together(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    monday = 1700438400
+    repository.upsert_ohlcv_batch(
+        "RELIANCE",
+        "1m",
+        [
+            OHLCVCandle(
+                epoch=monday + slot * 60,
+                open=100.0,
+                high=110.0,
+                low=90.0,
+                close=105.0,
+                volume=1000,
+            )
+            for slot in range(11)
+            if slot not in (2, 5, 8)
+        ],
+    )
+    provider = FakeOpenAlgoClient([])
+    service = WarehouseService(
+        repository=repository, provider=provider, job_store=job_store
+    )
+    job = job_store.create("bulk_csv")
+    rows = [
+        {
+            "ticker": "RELIANCE",
+            "timeframe": "1m",
+            "range": f'{{"start_epoch": {monday}, "end_epoch": {monday + 600}}}',
+        }
+    ]
+
+    service.process_bulk_csv(job["job_id"], rows)
+
+    assert provider.calls == [(monday + 120, monday + 480)]
+
+
+def test_job_store_updates_without_rereading(repository: WarehouseRepository) -> None:
+    reads: list[str] = []
+    original_get_job = repository.get_job
+
+    def counting_get_job(job_id: str) -> dict | None:
+        reads.append(job_id)
+        return original_get_job(job_id)
+
+    repository.get_job = counting_get_job  # type: ignore[method-assign]
+    store = JobStore(repository)
+
+    job = store.create("add")
+    store.update(job["job_id"], status="running", processed_count=1)
+    updated = store.update(job["job_id"], processed_count=2)
+
+    assert reads == []
+    assert updated["status"] == "running"
+    assert updated["processed_count"] == 2
+    stored = original_get_job(job["job_id"])
+    assert stored is not None
+    assert stored["status"] == "running"
+    assert stored["processed_count"] == 2
+
+
+def test_job_store_get_serves_recent_jobs_from_cache(
+    repository: WarehouseRepository,
+) -> None:
+    reads: list[str] = []
+    original_get_job = repository.get_job
+
+    def counting_get_job(job_id: str) -> dict | None:
+        reads.append(job_id)
+        return original_get_job(job_id)
+
+    repository.get_job = counting_get_job  # type: ignore[method-assign]
+    store = JobStore(repository, read_ttl=3600)
+    job = store.create("add")
+    store.update(job["job_id"], status="running")
+
+    polled = [store.get(job["job_id"]) for _ in range(3)]
+    assert reads == []
+    assert all(item is not None and item["status"] == "running" for item in polled)
+
+    expired = JobStore(repository, read_ttl=0)
+    assert expired.get(job["job_id"]) is not None
+    assert expired.get(job["job_id"]) is not None
+    assert reads == [job["job_id"]] * 2
+
+
+def test_job_store_background_writer_flushes_terminal_status(tmp_path) -> None:
+    db_path = str(tmp_path / "jobs.db")
+    init_db(db_path)
+    repository = WarehouseRepository(get_connection(db_path))
+    store = JobStore(
+        repository, writer_repository=WarehouseRepository(get_connection(db_path))
+    )
+    try:
+        job = store.create("bulk_csv")
+        for processed in range(1, 50):
+            store.update(job["job_id"], status="running", processed_count=processed)
+        store.update(job["job_id"], status="completed", processed_count=50)
+
+        stored = repository.get_job(job["job_id"])
+        assert stored is not None
+        assert stored["status"] == "completed"
+        assert stored["processed_count"] == 50
+    finally:
+        store.close()
+
+
+def test_job_store_background_writer_retries_failed_batches(tmp_path) -> None:
+    db_path = str(tmp_path / "jobs.db")
+    init_db(db_path)
+    repository = WarehouseRepository(get_connection(db_path))
+    writer = WarehouseRepository(get_connection(db_path))
+    original_update_jobs_batch = writer.update_jobs_batch
+    failures = [2]
+
+    def flaky_update_jobs_batch(entries) -> None:
+        if failures[0]:
+            failures[0] -= 1
+            raise RepositoryError("Failed to update jobs")
+        original_update_jobs_batch(entries)
+
+    writer.update_jobs_batch = flaky_update_jobs_batch  # type: ignore[method-assign]
+    store = JobStore(repository, writer_repository=writer)
+    try:
+        job = store.create("bulk_csv")
+        # The batch and its one-by-one retry both fail.
+        store.update(job["job_id"], status="running", processed_count=1)
+        store.flush()
+        stored = repository.get_job(job["job_id"])
+        assert stored is not None and stored["status"] == "queued"
+
+        # An identical update is written rather than skipped.
+        store.update(job["job_id"], status="running", processed_count=1)
+        store.flush()
+        stored = repository.get_job(job["job_id"])
+        assert stored is not None and stored["status"] == "running"
+
+        failures[0] = 1
+        store.update(job["job_id"], status="completed", processed_count=2)
+        stored = repository.get_job(job["job_id"])
+        assert stored is not None
+        assert stored["status"] == "completed"
+        assert stored["processed_count"] == 2
+    finally:
+        store.close()
+
+
+def test_job_store_resends_whole_payload_after_failed_write(
+    repository: WarehouseRepository, caplog: pytest.LogCaptureFixture
+) -> None:
+    original_patch_job = repository.patch_job
+    failures = [RepositoryError("Failed to update job")]
+
+    def flaky_patch_job(job_id: str, status: str, fields: dict) -> None:
+        if failures:
+            raise failures.pop()
+        original_patch_job(job_id, status, fields)
+
+    repository.patch_job = flaky_patch_job  # type: ignore[method-assign]
+    store = JobStore(repository)
+    job = store.create("add")
+    store.update(job["job_id"], status="running")
+
+    with caplog.at_level("ERROR"):
+        updated = store.update(job["job_id"], processed_count=1)
+    assert updated["processed_count"] == 1
+    assert "Failed to update job" in caplog.text
+    cached = store.get(job["job_id"])
+    assert cached is not None and cached["processed_count"] == 1
+
+    store.update(job["job_id"], status="completed")
+    stored = repository.get_job(job["job_id"])
+    assert stored is not None
+    assert stored["status"] == "completed"
+    assert stored["processed_count"] == 1
+
+
+def test_process_bulk_add_records_failed_rows_without_child_jobs(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    service = build_service(repository, job_store, [])
+    job = job_store.create("bulk_add")
+    request = BulkAddRequest(
+        rows=[
+            BulkAddRow(
+                ticker="RELIANCE",
+                timeframe="1d",
+                range=EpochRange(start_epoch=1700000000, end_epoch=1700000000),
+            )
+        ]
+    )
+
+    service.process_bulk_add(job["job_id"], request)
+
+    data = job_store.get(job["job_id"])
+    assert data is not None
+    assert data["status"] == "completed"
+    assert data["failure_count"] == 1
+    assert "failures" not in data
+    assert repository.list_job_failures(job["job_id"]) == [
+        {"row": 0, "error": "no candles returned for requested range"}
+    ]
+    assert repository.count_jobs(job_type="bulk_item") == 0
+
+
+def test_process_bulk_add_records_repeated_failing_pairs(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    class FailingClient(FakeOpenAlgoClient):
+        def fetch_ohlcv(self, *args, **kwargs) -> list[OHLCVCandle]:
+            raise RuntimeError("provider down")
+
+    service = WarehouseService(
+        repository=repository, provider=FailingClient([]), job_store=job_store
+    )
+    job = job_store.create("bulk_add")
+    row = BulkAddRow(
+        ticker="AAA",
+        timeframe="1d",
+        range=EpochRange(start_epoch=1700000000, end_epoch=1700000000),
+    )
+
+    service.process_bulk_add(job["job_id"], BulkAddRequest(rows=[row, row]))
+
+    data = job_store.get(job["job_id"])
+    assert data is not None
+    assert data["status"] == "completed"
+    assert data["failure_count"] == 2
+    assert repository.list_job_failures(job["job_id"]) == [
+        {"row": 0, "error": "Provider fetch failed"},
+        {"row": 1, "error": "Provider fetch failed"},
+    ]
+    assert len(repository.list_failed_ingestions()) == 1
+
+
+def test_process_bulk_add_fails_rows_whose_write_fails(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    def failing_upsert(batches) -> int:
+        raise RepositoryError("Failed to upsert candles")
+
+    candle = OHLCVCandle(
+        epoch=1700000000, open=1.0, high=1.0, low=1.0, close=1.0, volume=1
+    )
+    service = build_service(repository, job_store, [candle])
+    repository.upsert_ohlcv_multi = failing_upsert  # type: ignore[method-assign]
+    job = job_store.create("bulk_add")
+    rows = [
+        BulkAddRow(
+            ticker=ticker,
+            timeframe="1d",
+            range=EpochRange(start_epoch=1700000000, end_epoch=1700000000),
+        )
+        for ticker in ("AAA", "BBB")
+    ]
+
+    service.process_bulk_add(job["job_id"], BulkAddRequest(rows=rows))
+
+    data = job_store.get(job["job_id"])
+    assert data is not None
+    assert data["status"] == "completed"
+    assert data["success_count"] == 0
+    assert data["failure_count"] == 2
+    assert repository.list_job_failures(job["job_id"]) == [
+        {"row": 0, "error": "Failed to upsert candles"},
+        {"row": 1, "error": "Failed to upsert candles"},
+    ]
+
+
+def test_process_bulk_add_overlaps_row_fetches_with_workers(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    candles = [
+        OHLCVCandle(
+            epoch=1700000000 + offset * 86400,
+            open=100.0,
+            high=110.0,
+            low=90.0,
+            close=105.0,
+            volume=1000,
+        )
+        for offset in range(3)
+    ]
+    provider = FakeOpenAlgoClient(candles)
+    service = WarehouseService(
+        repository=repository,
+        provider=provider,
+        job_store=job_store,
+        max_fetch_workers=4,
+    )
+    job = job_store.create("bulk_add")
+    full_range = EpochRange(start_epoch=1700000000, end_epoch=1700172800)
+    empty_range = EpochRange(start_epoch=1600000000, end_epoch=1600086400)
+    rows = [
+        BulkAddRow(ticker="RELIANCE", timeframe="1d", range=full_range),
+        BulkAddRow(ticker="TCS", timeframe="1d", range=empty_range),
+        BulkAddRow(ticker="RELIANCE", timeframe="1d", range=full_range),
+        BulkAddRow(ticker="INFY", timeframe="1d", range=full_range),
+    ]
+
+    service.process_bulk_add(job["job_id"], BulkAddRequest(rows=rows))
+
+    data = job_store.get(job["job_id"])
+    assert data is not None
+    assert data["status"] == "completed"
+    assert data["success_count"] == 3
+    assert data["failure_count"] == 1
+    assert data["processed_count"] == 4
+    assert repository.list_job_failures(job["job_id"]) == [
+        {"row": 1, "error": "no candles returned for requested range"}
+    ]
+    for ticker in ("RELIANCE", "INFY"):
+        assert len(repository.get_ohlcv(ticker, "1d", 1700000000, 1700172800)) == 3
+    # The repeated RELIANCE row sees the stored candles and fetches nothing.
+    assert len(provider.calls) == 3
+
+
+def test_process_add_streams_provider_pages(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    class PagingClient(FakeOpenAlgoClient):
+        def __init__(self, candles: list[OHLCVCandle]):
+            super().__init__(candles)
+            self.page_sizes: list[int] = []
+
+        def iter_ohlcv(self, page_size: int = 5000, **kwargs):
+            candles = self.fetch_ohlcv(**kwargs)
+            for offset in range(0, len(candles), 2):
+                page = candles[offset : offset + 2]
+                self.page_sizes.append(len(page))
+                yield page
+
+    candles = [
+        OHLCVCandle(
+            epoch=1700000000 + offset * 86400,
+            open=100.0,
+            high=110.0,
+            low=90.0,
+            close=105.0,
+            volume=1000,
+        )
+        for offset in range(5)
+    ]
+    provider = PagingClient(candles)
+    service = WarehouseService(
+        repository=repository, provider=provider, job_store=job_store
+    )
+    job = job_store.create("add")
+
+    service.process_add(
+        job["job_id"],
+        AddStockRequest(
+            ticker="RELIANCE",
+            timeframe="1d",
+            range=EpochRange(start_epoch=1700000000, end_epoch=1700345600),
+        ),
+    )
+
+    data = job_store.get(job["job_id"])
+    assert data is not None
+    assert data["status"] == "completed"
+    assert data["inserted"] == 5
+    assert data["fetched_count"] == 5
+    assert provider.page_sizes == [2, 2, 1]
+
+
+def test_job_store_skips_unchanged_updates(repository: WarehouseRepository) -> None:
+    writes: list[str] = []
+    original_update_job_raw = repository.update_job_raw
+
+    def counting_update_job_raw(job_id: str, status: str, data: str) -> None:
+        writes.append(status)
+        original_update_job_raw(job_id, status, data)
+
+    original_patch_job = repository.patch_job
+
+    def counting_patch_job(job_id: str, status: str, fields: dict) -> None:
+        writes.append(status)
+        original_patch_job(job_id, status, fields)
+
+    repository.update_job_raw = counting_update_job_raw  # type: ignore[method-assign]
+    repository.patch_job = counting_patch_job  # type: ignore[method-assign]
+    store = JobStore(repository)
+
+    job = store.create("add")
+    store.update(job["job_id"], status="running", progress_pct=10)
+    store.update(job["job_id"], status="running", progress_pct=10)
+    store.update(job["job_id"], progress_pct=10)
+    store.update(job["job_id"], progress_pct=20)
+
+    assert writes == ["running", "running"]
+
+
+def test_process_bulk_csv_reports_invalid_rows(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    service = build_service(repository, job_store, [])
+    job = job_store.create("bulk_csv")
+    rows = [
+        {"ticker": "RELIANCE", "timeframe": "1d", "range": "", "start_date": ""},
+        {"ticker": "TCS", "timeframe": "2d", "range": ""},
+        {"ticker": "INFY", "timeframe": "1d", "range": "not json"},
+    ]
+
+    service.process_bulk_csv(job["job_id"], rows)
+
+    data = job_store.get(job["job_id"])
+    assert data is not None
+    assert data["status"] == "failed"
+    assert data["error"] == "Bulk CSV contains invalid rows"
+    assert data["failure_count"] == 2
+    failures = repository.list_job_failures(job["job_id"])
+    assert [failure["row"] for failure in failures] == [1, 2]
+
+
+def test_process_add_daily_skips_epoch_scan(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    def fail_scan(*args, **kwargs):
+        raise AssertionError("daily adds should not load stored epochs")
+
+    repository.upsert_ohlcv_batch(
+        "RELIANCE",
+        "1d",
+        [
+            OHLCVCandle(
+                epoch=1700000000,
+                open=100.0,
+                high=110.0,
+                low=90.0,
+                close=105.0,
+                volume=1000,
+            )
+        ],
+    )
+    repository.get_existing_epochs = fail_scan  # type: ignore[method-assign]
+    service = build_service(repository, job_store, [])
+    job = job_store.create("add")
+
+    service.process_add(
+        job["job_id"],
+        AddStockRequest(
+            ticker="RELIANCE",
+            timeframe="1d",
+            range=EpochRange(start_epoch=1700000000, end_epoch=1700000000),
+        ),
+    )
+
+    data = job_store.get(job["job_id"])
+    assert data is not None
+    assert data["message"] == "already present"
+
+
+def test_process_add_daily_tolerates_holidays_in_stored_range(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    monday = 1700438400
+    days = [monday + day * 86400 for day in (0, 1, 3, 4, 7, 8, 9, 10, 11)]
+    repository.upsert_ohlcv_batch(
+        "RELIANCE",
+        "1d",
+        [
+            OHLCVCandle(
+                epoch=epoch, open=100.0, high=110.0, low=90.0, close=105.0, volume=1
+            )
+            for epoch in days
+        ],
+    )
+    service = build_service(repository, job_store, [])
+    provider = service.provider
+    job = job_store.create("add")
+
+    service.process_add(
+        job["job_id"],
+        AddStockRequest(
+            ticker="RELIANCE",
+            timeframe="1d",
+            range=EpochRange(start_epoch=days[0], end_epoch=days[-1]),
+        ),
+    )
+
+    assert provider.calls == []
+    data = job_store.get(job["job_id"])
+    assert data is not None
+    assert data["message"] == "already present"
+
+
+def test_process_add_skips_gap_scan_outside_stored_coverage(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    def fail_scan(*args, **kwargs):
+        raise AssertionError("ranges outside stored data need no gap scan")
+
+    monday = 1700438400
+    start = monday + 3600
+    fetched = [
+        OHLCVCandle(
+            epoch=start + minute * 60,
+            open=100.0,
+            high=110.0,
+            low=90.0,
+            close=105.0,
+            volume=1000,
+        )
+        for minute in range(5)
+    ]
+    stored = fetched[0].model_copy(update={"epoch": monday})
+    repository.upsert_ohlcv_batch("RELIANCE", "1m", [stored])
+    repository.get_missing_ranges = fail_scan  # type: ignore[method-assign]
+    service = build_service(repository, job_store, fetched)
+    job = job_store.create("add")
+
+    service.process_add(
+        job["job_id"],
+        AddStockRequest(
+            ticker="RELIANCE",
+            timeframe="1m",
+            range=EpochRange(start_epoch=start, end_epoch=start + 240),
+        ),
+    )
+
+    data = job_store.get(job["job_id"])
+    assert data is not None
+    assert data["status"] == "completed"
+    assert data["inserted"] == 5
+
+
+def test_job_progress_buffer_coalesces_until_flush() -> None:
+    class RecordingStore(MemoryJobStore):
+        def __init__(self) -> None:
+            super().__init__()
+            self.writes: list[dict] = []
+
+        def update(self, job_id: str, **kwargs) -> dict:
+            self.writes.append(kwargs)
+            return super().update(job_id, **kwargs)
+
+    store = RecordingStore()
+    progress = JobProgressBuffer(store, "job", max_pending=3, max_interval=3600)
+
+    progress.record(current_gap={"start_epoch": 1, "end_epoch": 2}, fetched_count=1)
+    progress.record(current_gap={"start_epoch": 3, "end_epoch": 4}, fetched_count=2)
+    assert store.writes == []
+
+    progress.record(processed_count=1)
+    assert store.writes == [
+        {
+            "current_gap": {"start_epoch": 3, "end_epoch": 4},
+            "fetched_count": 2,
+            "processed_count": 1,
+        }
+    ]
+
+    progress.record(fetched_count=5)
+    progress.flush()
+    progress.flush()
+    assert store.writes[1:] == [{"fetched_count": 5}]
+
+
+def test_job_progress_buffer_derives_percentage_at_flush() -> None:
+    store = MemoryJobStore()
+    progress = JobProgressBuffer(store, "job", max_pending=100, total=3)
+
+    progress.record(current_ticker="AAA", processed_count=1)
+    progress.record(current_ticker="BBB", processed_count=2)
+    progress.flush()
+
+    assert store.get("job") == {
+        "job_id": "job",
+        "current_ticker": "BBB",
+        "processed_count": 2,
+        "progress_pct": 66,
+    }
+
+
+def test_retry_failed_ingestion_runs_as_background_job(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    candle = OHLCVCandle(
+        epoch=1700000000,
+        open=100.0,
+        high=110.0,
+        low=90.0,
+        close=105.0,
+        volume=1000,
+    )
+    provider = FakeOpenAlgoClient([candle])
+    service = WarehouseService(
+        repository=repository,
+        provider=provider,
+        job_store=job_store,
+    )
+    repository.create_failed_ingestion("RELIANCE", "1d", "timeout")
+    failed_id = repository.list_failed_ingestions()[0]["id"]
+
+    job = service.enqueue_retry_failed(failed_id)
+    assert job["status"] == "queued"
+    assert provider.calls == []
+
+    service.process_retry_failed(
+        job["job_id"], failed_id, "RELIANCE", "1d", 1700000000, 1700000000
+    )
+
+    assert job_store.get(job["job_id"])["status"] == "completed"
+    assert repository.list_failed_ingestions(status="failed") == []
+    assert repository.list_failed_ingestions(status="resolved")[0]["retry_count"] == 1
+
+
+def test_process_add_returns_final_job_payload(
+    repository: WarehouseRepository, job_store: JobStore
+) -> None:
+    candle = OHLCVCandle(
+        epoch=1700000000,
+        open=100.0,
+        high=110.0,
+        low=90.0,
+        close=105.0,
+        volume=1000,
+    )
+    service = build_service(repository, job_store, [candle])
+    job = job_store.create("add")
+
+    result = service.process_add(
+        job["job_id"],
+        AddStockRequest(
+            ticker="RELIANCE",
+            timeframe="1d",
+            range=EpochRange(start_epoch=1700000000, end_epoch=1700000000),
+        ),
+    )
+
+    assert result["status"] == "completed"
+    assert result["inserted"] == 1
+    assert result == job_store.get(job["job_id"])
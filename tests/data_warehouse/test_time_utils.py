@@ -0,0 +1,36 @@
+from datetime import date, datetime, timezone
+
+from data_warehouse.core.time_utils import (
+    IST,
+    IST_OFFSET,
+    date_to_epoch,
+    epochs_to_ist_iso,
+)
+
+
+def test_date_to_epoch_matches_local_day_bounds() -> None:
+    day = date(2024, 3, 15)
+
+    assert date_to_epoch(day) == int(
+        datetime.combine(day, datetime.min.time()).timestamp()
+    )
+    assert date_to_epoch(day, end_of_day=True) == int(
+        datetime.combine(day, datetime.max.time()).timestamp()
+    )
+
+
+def test_epochs_to_ist_iso_matches_isoformat() -> None:
+    epochs = [0, 1_700_000_000, 1_710_480_600]
+
+    assert epochs_to_ist_iso(epochs) == [
+        datetime.fromtimestamp(epoch, tz=timezone.utc).astimezone(IST).isoformat()
+        for epoch in epochs
+    ]
+    assert epochs_to_ist_iso([]) == []
+
+
+def test_ist_offset_matches_zone_since_1970() -> None:
+    for epoch in [0, 1_700_000_000, 1_710_480_600, 2_000_000_000]:
+        assert datetime.fromtimestamp(epoch, tz=IST_OFFSET).isoformat() == (
+            datetime.fromtimestamp(epoch, tz=timezone.utc).astimezone(IST).isoformat()
+        )